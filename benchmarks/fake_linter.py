@@ -0,0 +1,199 @@
+"""A stand-in for the linters, for benchmarking.
+
+Usage: fake_linter.py LINTER [ARGS...]
+
+This accepts the arguments that `silence-lint-error` and `fix-silenced-error` pass
+to each linter, and reports a violation on every line containing `MARKER` that
+has not been silenced, in that linter's output format. This exercises the tool
+end-to-end without the cost (or variability) of running real linters.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+
+MARKER = 'violation_'
+
+# comments that silence violations on the same line, or the line below
+INLINE_COMMENTS = ('noqa', 'type: ignore', 'lint-fixme', 'nosemgrep')
+LINE_ABOVE_COMMENTS = ('lint-fixme', 'nosemgrep')
+
+
+def _discover(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.py'):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def _find(paths: Iterable[str]) -> Iterator[tuple[str, int]]:
+    for filename in _discover(paths):
+        with open(filename) as f:
+            previous_line = ''
+            for lineno, line in enumerate(f, start=1):
+                if (
+                        MARKER in line
+                        and not any(c in line for c in INLINE_COMMENTS)
+                        and not any(c in previous_line for c in LINE_ABOVE_COMMENTS)
+                ):
+                    yield filename, lineno
+                previous_line = line
+
+
+def _fix(found: Iterable[tuple[str, int]]) -> int:
+    """Fix violations by renaming the marker."""
+    by_file: dict[str, set[int]] = {}
+    for filename, lineno in found:
+        by_file.setdefault(filename, set()).add(lineno)
+
+    fixed = 0
+    for filename, linenos in by_file.items():
+        with open(filename) as f:
+            lines = f.readlines()
+        for lineno in linenos:
+            lines[lineno - 1] = lines[lineno - 1].replace(MARKER, 'fixed_')
+            fixed += 1
+        with open(filename, 'w') as f:
+            f.writelines(lines)
+
+    return fixed
+
+
+def ruff(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=('check',))
+    parser.add_argument('--select', required=True)
+    parser.add_argument('--output-format')
+    parser.add_argument('--fix', action='store_true')
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_intermixed_args(argv)
+
+    found = list(_find(args.paths))
+    if args.fix:
+        fixed = _fix(found)
+        print(f'Found {len(found)} errors ({fixed} fixed, 0 remaining).')
+        return 0
+
+    json.dump(
+        [
+            {
+                'code': args.select,
+                'filename': os.path.abspath(filename),
+                'location': {'row': lineno, 'column': 1},
+                'end_location': {'row': lineno, 'column': 10},
+                'message': 'a violation',
+                'noqa_row': lineno,
+            }
+            for filename, lineno in found
+        ],
+        sys.stdout,
+        indent=2,
+    )
+    return 1 if found else 0
+
+
+def flake8(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--select', required=True)
+    parser.add_argument('--format', required=True)
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_intermixed_args(argv)
+
+    ret = 0
+    for filename, lineno in _find(args.paths):
+        print(args.format % {'path': filename, 'row': lineno})
+        ret = 1
+    return ret
+
+
+def mypy(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--follow-imports')
+    parser.add_argument('--enable-error-code', required=True)
+    parser.add_argument('--show-error-codes', action='store_true')
+    parser.add_argument('--no-pretty', action='store_true')
+    parser.add_argument('--no-error-summary', action='store_true')
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_intermixed_args(argv)
+
+    ret = 0
+    for filename, lineno in _find(args.paths):
+        print(f'{filename}:{lineno}: error: a violation  [{args.enable_error_code}]')
+        ret = 1
+    return ret
+
+
+def fixit(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rules', required=True)
+    parser.add_argument('command', choices=('lint', 'fix'))
+    parser.add_argument('--automatic', action='store_true')
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_intermixed_args(argv)
+
+    __, __, rule_id = args.rules.rpartition(':')
+    found = list(_find(args.paths))
+    for filename, lineno in found:
+        print(f'{filename}@{lineno}:0 {rule_id}: a violation (has autofix)')
+
+    if args.command == 'fix':
+        fixed = _fix(found)
+        print(f'🛠️  {fixed} fixes applied 🛠️', file=sys.stderr)
+        return 0
+    return 1 if found else 0
+
+
+def semgrep(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=('scan',))
+    parser.add_argument('--metrics')
+    parser.add_argument('--oss-only', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_intermixed_args(argv)
+
+    json.dump(
+        {
+            'errors': [],
+            'results': [
+                {
+                    'check_id': 'benchmark.rule',
+                    'path': filename,
+                    'start': {'line': lineno, 'col': 1},
+                    'end': {'line': lineno, 'col': 10},
+                    'extra': {'message': 'a violation', 'severity': 'WARNING'},
+                }
+                for filename, lineno in _find(args.paths)
+            ],
+        },
+        sys.stdout,
+    )
+    return 0
+
+
+LINTERS = {
+    'fixit': fixit,
+    'flake8': flake8,
+    'mypy': mypy,
+    'ruff': ruff,
+    'semgrep': semgrep,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    linter, *args = sys.argv[1:] if argv is None else argv
+    return LINTERS[linter](args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
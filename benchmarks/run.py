@@ -0,0 +1,315 @@
+"""End-to-end benchmarks for `silence-lint-error` and `fix-silenced-error`.
+
+Usage:
+    python benchmarks/run.py [--linter LINTER ...] [--files N ...]
+    python benchmarks/run.py --update-thresholds
+
+Each benchmark generates a synthetic repository, puts stand-in linters (see
+`fake_linter.py`) on `PATH`, and runs the `main()` function of each command in a
+fresh process. It measures the wall time and files per second of each phase and
+the peak RSS of the process, and fails if any result exceeds the thresholds in
+`thresholds.json`.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import resource
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import Any
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FAKE_LINTER = os.path.join(HERE, 'fake_linter.py')
+THRESHOLDS = os.path.join(HERE, 'thresholds.json')
+
+RULE_NAMES = {
+    'fixit': 'fixit.rules:CollapseIsinstanceChecks',
+    'flake8': 'F401',
+    'mypy': 'misc',
+    'ruff': 'F401',
+    'semgrep': 'benchmark.rule',
+}
+FIXABLE = ('fixit', 'ruff')
+# The phases measured for every linter, and the fixable linters, when each
+# command runs as expected.
+PHASES = ('lint', 'rewrite', 'silence')
+FIX_PHASES = ('unsilence', 'fix', 'unsilence+fix')
+# The return code of each command: `silence-lint-error` changes files, and
+# `fix-silenced-error` fixes every error.
+EXPECTED_RETURN_CODES = {'silence': 1, 'unsilence+fix': 0}
+
+# Allow results to be this much worse than when the thresholds were updated,
+# to avoid failing on noise. Very short phases are noisier still, so they are
+# given at least MIN_THRESHOLD.
+HEADROOM = 2.0
+MIN_THRESHOLD = 1.0
+
+
+def generate(
+        root: str, *, files: int, lines_per_file: int, violations_per_file: int,
+) -> None:
+    """Generate a synthetic repository, in packages of 100 modules."""
+    violation_every = lines_per_file // max(violations_per_file, 1)
+    lines = ['x = None\n']
+    for lineno in range(2, lines_per_file + 1):
+        if violations_per_file and lineno % violation_every == 0:
+            lines.append(
+                f'violation_{lineno} = isinstance(x, str) or isinstance(x, int)\n',
+            )
+        else:
+            lines.append(f'value_{lineno} = {lineno}\n')
+    src = ''.join(lines)
+
+    for i in range(files):
+        package = os.path.join(root, f'pkg_{i // 100}')
+        if i % 100 == 0:
+            os.makedirs(package)
+        with open(os.path.join(package, f'mod_{i}.py'), 'w') as f:
+            f.write(src)
+
+
+def install_fake_linters(bin_dir: str) -> None:
+    for linter in RULE_NAMES:
+        path = os.path.join(bin_dir, linter)
+        with open(path, 'w') as f:
+            f.write(
+                f'#!/bin/sh\n'
+                f'exec "{sys.executable}" "{FAKE_LINTER}" {linter} "$@"\n',
+            )
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+@contextlib.contextmanager
+def _timed(
+        cls: type[Any], method_name: str, timings: dict[str, float], phase: str,
+) -> Iterator[None]:
+    """Add the time spent in a method to the timings for a phase."""
+    method = getattr(cls, method_name)
+
+    @functools.wraps(method)
+    def timed_method(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings[phase] = timings.get(phase, 0) + time.perf_counter() - start
+
+    setattr(cls, method_name, timed_method)
+    try:
+        yield
+    finally:
+        setattr(cls, method_name, method)
+
+
+def _run_main(
+        main: Callable[[Sequence[str]], int], argv: Sequence[str],
+) -> tuple[float, int]:
+    """Run a command.
+
+    Returns:
+        The wall time of the command, and its return code.
+    """
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            start = time.perf_counter()
+            ret = main(argv)
+            return time.perf_counter() - start, ret
+
+
+def run_child(linter: str, root: str) -> dict[str, Any]:
+    """Run the commands against a synthetic repository, in this process."""
+    from silence_lint_error.cli import fix_silenced_error
+    from silence_lint_error.cli import silence_lint_error
+    from silence_lint_error.fixing import Fixer
+    from silence_lint_error.silencing import Silencer
+
+    rule_name = RULE_NAMES[linter]
+    timings: dict[str, float] = {}
+    return_codes: dict[str, int] = {}
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_timed(Silencer, 'find_violations', timings, 'lint'))
+        stack.enter_context(
+            _timed(Silencer, 'silence_violations', timings, 'rewrite'),
+        )
+        stack.enter_context(
+            _timed(Fixer, 'unsilence_violations', timings, 'unsilence'),
+        )
+        stack.enter_context(_timed(Fixer, 'apply_fixes', timings, 'fix'))
+
+        # the fake linters cannot answer the checks made before running them
+        timings['silence'], return_codes['silence'] = _run_main(
+            silence_lint_error.main, (linter, rule_name, root, '--no-preflight'),
+        )
+        if linter in FIXABLE:
+            timings['unsilence+fix'], return_codes['unsilence+fix'] = _run_main(
+                fix_silenced_error.main, (linter, rule_name, root),
+            )
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':  # Linux reports KiB, macOS reports bytes
+        peak_rss *= 1024
+
+    return {
+        'timings': timings,
+        'return_codes': return_codes,
+        'peak_rss_mb': peak_rss / 2**20,
+    }
+
+
+def run_benchmark(
+        linter: str, *, files: int, lines_per_file: int, violations_per_file: int,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, 'repo')
+        bin_dir = os.path.join(tmpdir, 'bin')
+        os.makedirs(bin_dir)
+        install_fake_linters(bin_dir)
+        generate(
+            root, files=files, lines_per_file=lines_per_file,
+            violations_per_file=violations_per_file,
+        )
+
+        env = {
+            **os.environ,
+            'PATH': os.pathsep.join((bin_dir, os.environ['PATH'])),
+            # to keep any caches out of the user's cache, and apart between runs
+            'XDG_CACHE_HOME': os.path.join(tmpdir, 'cache'),
+        }
+        proc = subprocess.run(
+            (sys.executable, __file__, '--child', linter, root),
+            env=env, capture_output=True, text=True, check=True,
+        )
+
+    result: dict[str, Any] = json.loads(proc.stdout)
+    result['files_per_second'] = {
+        phase: files / seconds if seconds else float('inf')
+        for phase, seconds in result['timings'].items()
+    }
+    return result
+
+
+def check(
+        results: dict[str, dict[str, dict[str, Any]]],
+        thresholds: dict[str, dict[str, dict[str, float]]],
+) -> list[str]:
+    """Check that each command ran as expected, and compare results with thresholds.
+
+    Returns:
+        A description of each command that returned an unexpected code or did not
+        run a phase, and of each result that exceeded its threshold.
+    """
+    failures = []
+    for linter, linter_results in results.items():
+        expected_phases = PHASES + (FIX_PHASES if linter in FIXABLE else ())
+        for files, result in linter_results.items():
+            for command, ret in result['return_codes'].items():
+                if ret != EXPECTED_RETURN_CODES[command]:
+                    failures.append(
+                        f'{linter} ({files} files): {command} returned {ret}, '
+                        f'expected {EXPECTED_RETURN_CODES[command]}',
+                    )
+            for phase in expected_phases:
+                if phase not in result['timings']:
+                    failures.append(
+                        f'{linter} ({files} files): {phase} did not run',
+                    )
+
+            limits = thresholds.get(linter, {}).get(files, {})
+            measured = {**result['timings'], 'peak_rss_mb': result['peak_rss_mb']}
+            for name, limit in limits.items():
+                if name in measured and measured[name] > limit:
+                    failures.append(
+                        f'{linter} ({files} files): {name} '
+                        f'{measured[name]:.2f} > {limit:.2f}',
+                    )
+    return failures
+
+
+def to_thresholds(
+        results: dict[str, dict[str, dict[str, Any]]],
+) -> dict[str, dict[str, dict[str, float]]]:
+    return {
+        linter: {
+            files: {
+                name: max(round(value * HEADROOM, 2), MIN_THRESHOLD)
+                for name, value in {
+                    **result['timings'], 'peak_rss_mb': result['peak_rss_mb'],
+                }.items()
+            }
+            for files, result in linter_results.items()
+        }
+        for linter, linter_results in results.items()
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--linter', action='append', choices=RULE_NAMES, dest='linters',
+        help='The linters to benchmark (default: all)',
+    )
+    parser.add_argument(
+        '--files', action='append', type=int, dest='sizes',
+        help='The number of files to generate (default: 1000)',
+    )
+    parser.add_argument('--lines-per-file', type=int, default=100)
+    parser.add_argument('--violations-per-file', type=int, default=5)
+    parser.add_argument(
+        '--update-thresholds', action='store_true',
+        help=f'Store the results (times {HEADROOM}) as the new thresholds',
+    )
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        json.dump(run_child(*args.child), sys.stdout)
+        return 0
+
+    if not shutil.which('sh'):  # pragma: no cover
+        print('ERROR: the fake linters need a POSIX shell', file=sys.stderr)
+        return 1
+
+    results: dict[str, dict[str, dict[str, Any]]] = {}
+    for linter in args.linters or RULE_NAMES:
+        for files in args.sizes or [1000]:
+            result = run_benchmark(
+                linter, files=files, lines_per_file=args.lines_per_file,
+                violations_per_file=args.violations_per_file,
+            )
+            results.setdefault(linter, {})[str(files)] = result
+            print(f'{linter} ({files} files)')
+            for phase, seconds in result['timings'].items():
+                print(
+                    f'  {phase:<14} {seconds:8.2f}s '
+                    f'{result["files_per_second"][phase]:10.0f} files/s',
+                )
+            print(f'  {"peak RSS":<14} {result["peak_rss_mb"]:8.1f}MiB')
+
+    if args.update_thresholds:
+        with open(THRESHOLDS, 'w') as f:
+            json.dump(to_thresholds(results), f, indent=2, sort_keys=True)
+            f.write('\n')
+        return 0
+
+    with open(THRESHOLDS) as f:
+        thresholds = json.load(f)
+
+    failures = check(results, thresholds)
+    for failure in failures:
+        print(f'FAILED: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
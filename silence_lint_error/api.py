@@ -0,0 +1,136 @@
+"""Silence and fix errors in sources held in memory.
+
+This is for tools which already have the sources of a repository in memory (e.g.
+from git objects) and want the changed sources back, without a checkout:
+
+    >>> from silence_lint_error import api
+    >>> api.silence('ruff', 'F401', {'pkg/mod.py': 'import os\\n'})
+    {'pkg/mod.py': 'import os  # noqa: F401\\n'}
+
+Sources are given as a mapping of relative path to source. Linters are external
+programs which read files, so the sources are written to a temporary directory
+for them to check, along with any other files in the mapping (e.g. linter config
+in `pyproject.toml`). Comments are added to and removed from the sources in
+memory; nothing is written back to the temporary directory, except for the
+sources that the linter is asked to fix.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+from collections.abc import Iterator
+from collections.abc import Mapping
+
+from silence_lint_error import files
+from silence_lint_error import sources
+from silence_lint_error.fixing import Fixer
+from silence_lint_error.registry import FIXERS
+from silence_lint_error.registry import LINTERS
+from silence_lint_error.silencing import Silencer
+
+
+@contextlib.contextmanager
+def _checkout(contents: Mapping[str, str]) -> Iterator[tuple[str, dict[str, str]]]:
+    """Write sources to a temporary directory.
+
+    Yields:
+        The directory, and a mapping of the path of each Python file in the
+        directory to its path in `contents`.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.realpath(tmpdir)
+        paths = {}
+        for path, src in contents.items():
+            relpath = os.path.normpath(path)
+            if os.path.isabs(relpath) or relpath.split(os.sep)[0] == os.pardir:
+                raise ValueError(f'{path!r} is not a relative path')
+
+            filename = os.path.join(root, relpath)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            sources.write_source(filename, src, 'utf-8')
+            if path.endswith(files.PYTHON_EXTENSIONS):
+                paths[filename] = path
+
+        yield root, paths
+
+
+def silence(
+        linter_name: str, rule_name: str, contents: Mapping[str, str],
+) -> dict[str, str]:
+    """Silence violations of a rule.
+
+    Returns:
+        The new sources of the files that were changed.
+
+    Raises:
+        ErrorRunningTool: There was an error whilst running the linter.
+        Silencer.MultipleRulesViolated: Violations of more than one rule were
+            found.
+        ValueError: A path is not relative, or leaves the repository.
+    """
+    linter = LINTERS[linter_name]()
+    with _checkout(contents) as (root, paths):
+        try:
+            findings = Silencer(linter).find_violations(
+                rule_name=rule_name, file_names=list(paths), cwd=root,
+                fingerprint=False,
+            )
+        except Silencer.NoViolationsFound:
+            return {}
+
+    memory = sources.MemoryFiles(contents)
+    silencer = Silencer(linter, files=memory)
+    for filename, file_violations in findings.violations.items():
+        silencer.silence_violations(
+            filename=paths[filename], violations=file_violations,
+        )
+
+    return memory.changed
+
+
+def fix(
+        linter_name: str, rule_name: str, contents: Mapping[str, str],
+) -> dict[str, str]:
+    """Remove comments which silence a rule, and fix its violations.
+
+    Violations which could not be fixed are silenced again, if the linter can
+    silence violations.
+
+    Returns:
+        The new sources of the files that were changed.
+
+    Raises:
+        ErrorRunningTool: There was an error whilst running the linter to find
+            violations which could not be fixed.
+        ValueError: A path is not relative, or leaves the repository.
+    """
+    memory = sources.MemoryFiles(contents)
+    fixer = Fixer(FIXERS[linter_name](), files=memory)
+    for path in contents:
+        if path.endswith(files.PYTHON_EXTENSIONS):
+            with contextlib.suppress(fixer.NoChangesMade):
+                fixer.unsilence_violations(rule_name=rule_name, filename=path)
+
+    if not memory.changed:
+        return {}
+
+    with _checkout({**contents, **memory.changed}) as (root, paths):
+        changed = {
+            filename: path for filename, path in paths.items()
+            if path in memory.changed
+        }
+        fixer.apply_fixes(rule_name=rule_name, filenames=list(changed))
+        if fixer.can_silence:
+            Fixer(fixer.linter).silence_unfixed(
+                rule_name=rule_name, filenames=list(changed),
+            )
+        new_contents = {
+            path: sources.read_source(filename)[0]
+            for filename, path in changed.items()
+        }
+
+    return {
+        path: src for path, src in new_contents.items()
+        if src != contents[path]
+    }
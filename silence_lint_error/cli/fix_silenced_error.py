@@ -1,26 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import sys
+import time
 from collections.abc import Sequence
 from typing import NamedTuple
 
+import attrs
+
+from silence_lint_error import files
+from silence_lint_error.files import Shard
 from silence_lint_error.fixing import Fixer
 from silence_lint_error.fixing import Linter
-from silence_lint_error.linters import fixit
-from silence_lint_error.linters import ruff
-
-
-LINTERS: dict[str, type[Linter]] = {
-    'fixit': fixit.Fixit,
-    'ruff': ruff.Ruff,
-}
+from silence_lint_error.progress import ProgressMeter
+from silence_lint_error.registry import FIXERS
+from silence_lint_error.silencing import ErrorRunningTool
+from silence_lint_error.silencing import Silencer
+from silence_lint_error.sources import DiskFiles
+from silence_lint_error.sources import PipelinedFiles
 
 
 class Context(NamedTuple):
     rule_name: str
     file_names: list[str]
     linter: Linter
+    show_progress: bool | None
+    output_format: str
+    silence_unfixed: bool
+    restore_unfixed: bool
 
 
 def _parse_args(argv: Sequence[str] | None) -> Context:
@@ -31,34 +39,136 @@ def _parse_args(argv: Sequence[str] | None) -> Context:
         ),
     )
     parser.add_argument(
-        'linter', choices=LINTERS,
+        'linter', choices=FIXERS,
         help='The linter to use to fix the errors',
     )
     parser.add_argument('rule_name')
     parser.add_argument('filenames', nargs='*')
+    parser.add_argument(
+        '--files-from', metavar='FILE',
+        help=(
+            'Also fix the files named in FILE (or stdin, for -), one per line, '
+            'e.g. from `git ls-files`'
+        ),
+    )
+    parser.add_argument(
+        '-0', '--null', action='store_true',
+        help=(
+            'The names in --files-from are separated by NUL characters '
+            '(e.g. from `git ls-files -z`)'
+        ),
+    )
+    parser.add_argument(
+        '--shard', metavar='I/N', type=Shard.parse,
+        help='Only fix the I-th of N deterministic partitions of the files (e.g. 1/4)',
+    )
+    parser.add_argument(
+        '--progress', action=argparse.BooleanOptionalAction,
+        help=(
+            'Show the progress of removing comments '
+            '(default: only when stderr is a terminal)'
+        ),
+    )
+    parser.add_argument(
+        '--silence-unfixed', action=argparse.BooleanOptionalAction, default=True,
+        help=(
+            'Add comments back to silence the errors which were not fixed '
+            '(default: on, if the linter can silence errors)'
+        ),
+    )
+    parser.add_argument(
+        '--restore-unfixed', action=argparse.BooleanOptionalAction, default=True,
+        help=(
+            'If the auto-fixes fail, restore the files where errors were not '
+            'fixed. --silence-unfixed takes precedence, so this only happens '
+            'with --no-silence-unfixed, or if silencing the errors fails '
+            '(default: on, if the linter can find errors)'
+        ),
+    )
+    parser.add_argument(
+        '--format', choices=('text', 'ndjson'), default='text',
+        help=(
+            'Write the name of each file changed to stdout (text), '
+            'or a JSON record for each file with the comments removed (ndjson)'
+        ),
+    )
     args = parser.parse_args(argv)
+    if args.null and not args.files_from:
+        parser.error('--null can only be given with --files-from')
+
+    filenames = args.filenames
+    if args.shard and not filenames and not args.files_from:
+        # shard the current directory, rather than an empty list of files
+        filenames = ['.']
+    file_names = files.discover(
+        itertools.chain(
+            filenames,
+            files.read_file_list(args.files_from, null_separated=args.null),
+        ) if args.files_from else filenames,
+    )
+    if args.shard:
+        file_names = args.shard.select(file_names)
 
     return Context(
         rule_name=args.rule_name,
-        file_names=args.filenames,
-        linter=LINTERS[args.linter](),
+        file_names=list(file_names),
+        linter=FIXERS[args.linter](),
+        show_progress=args.progress,
+        output_format=args.format,
+        silence_unfixed=args.silence_unfixed,
+        restore_unfixed=args.restore_unfixed,
     )
 
 
 def main(argv: Sequence[str] | None = None) -> int:
-    rule_name, file_names, linter = _parse_args(argv)
-    fixer = Fixer(linter)
+    context = _parse_args(argv)
+    rule_name, file_names, linter = context.rule_name, context.file_names, context.linter
+    show_progress, output_format = context.show_progress, context.output_format
 
     print('-> removing comments that silence errors', file=sys.stderr)
+    meter = ProgressMeter.for_stderr(
+        'removing comments', len(file_names), enabled=show_progress,
+    )
     changed_files = []
-    for filename in file_names:
-        try:
-            fixer.unsilence_violations(rule_name=rule_name, filename=filename)
-        except fixer.NoChangesMade:
-            continue
-        else:
-            print(filename)
-            changed_files.append(filename)
+    pipeline = PipelinedFiles(file_names)
+    records = recording = None
+    if output_format == 'ndjson':
+        # `records` imports `json`, which is slow to import
+        from silence_lint_error.records import RecordingFiles
+        from silence_lint_error.records import RecordWriter
+
+        records = RecordWriter(sys.stdout)
+        recording = RecordingFiles(pipeline)
+    fixer = Fixer(linter, files=recording or pipeline)
+    with pipeline:
+        for filename in file_names:
+            bytes_read = pipeline.bytes_read
+            start = time.perf_counter()
+            try:
+                fixer.unsilence_violations(rule_name=rule_name, filename=filename)
+            except fixer.NoChangesMade:
+                pass
+            else:
+                if meter:
+                    meter.clear()
+                if records and recording:
+                    records.write({
+                        'path': filename,
+                        'rules': [rule_name],
+                        'lines': recording.changed_lines(),
+                        'status': 'changed',
+                        'bytes': recording.bytes_changed(),
+                        'elapsed': round(time.perf_counter() - start, 6),
+                    })
+                else:
+                    print(filename)
+                changed_files.append(filename)
+
+            if meter:
+                meter.advance(pipeline.bytes_read - bytes_read)
+
+    if meter:
+        meter.finish()
 
     if not changed_files:
         print('no silenced errors found', file=sys.stderr)
@@ -68,8 +178,72 @@ def main(argv: Sequence[str] | None = None) -> int:
     ret, message = fixer.apply_fixes(rule_name=rule_name, filenames=changed_files)
     print(message, file=sys.stderr)
 
+    silenced = False
+    if context.silence_unfixed and fixer.can_silence:
+        silenced = _silence_unfixed(
+            Fixer(linter), rule_name=rule_name, filenames=changed_files,
+        )
+
+    if ret and context.restore_unfixed and not silenced and fixer.can_silence:
+        # the comments were removed through the pipeline, which is now closed
+        _restore_unfixed(
+            attrs.evolve(fixer, files=DiskFiles()),
+            rule_name=rule_name, filenames=changed_files,
+        )
+
     return ret
 
 
+def _silence_unfixed(
+        fixer: Fixer, *, rule_name: str, filenames: list[str],
+) -> bool:
+    print('-> silencing errors which were not fixed', file=sys.stderr)
+    try:
+        violations = fixer.silence_unfixed(rule_name=rule_name, filenames=filenames)
+    except ErrorRunningTool as e:
+        print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+        return False
+    except Silencer.MultipleRulesViolated as e:
+        print(
+            'ERROR: errors found for multiple rules:', sorted(e.rule_names),
+            file=sys.stderr,
+        )
+        return False
+
+    if violations:
+        print(
+            f'silenced errors in {len(violations)} files:',
+            *violations, sep='\n  ', file=sys.stderr,
+        )
+    else:
+        print('all errors were fixed', file=sys.stderr)
+    return True
+
+
+def _restore_unfixed(
+        fixer: Fixer, *, rule_name: str, filenames: list[str],
+) -> None:
+    print('-> restoring files where errors were not fixed', file=sys.stderr)
+    try:
+        restored = fixer.restore_unfixed(rule_name=rule_name, filenames=filenames)
+    except ErrorRunningTool as e:
+        print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+        return
+    except Silencer.MultipleRulesViolated as e:
+        print(
+            'ERROR: errors found for multiple rules:', sorted(e.rule_names),
+            file=sys.stderr,
+        )
+        return
+
+    if restored:
+        print(
+            f'restored {len(restored)} files:', *restored, sep='\n  ',
+            file=sys.stderr,
+        )
+    else:
+        print('all errors were fixed', file=sys.stderr)
+
+
 if __name__ == '__main__':
     raise SystemExit(main())
@@ -1,39 +1,85 @@
 from __future__ import annotations
 
 import argparse
+import itertools
+import os
 import sys
+import time
+from collections.abc import Iterable
+from collections.abc import Mapping
 from collections.abc import Sequence
+from typing import cast
 from typing import NamedTuple
+from typing import TYPE_CHECKING
 
-from silence_lint_error.linters import fixit
-from silence_lint_error.linters import flake8
-from silence_lint_error.linters import mypy
-from silence_lint_error.linters import ruff
-from silence_lint_error.linters import semgrep
+import attrs
+
+from silence_lint_error import files
+from silence_lint_error.configs import CannotEditConfig
+from silence_lint_error.configs import Linter as ConfiguringLinter
+from silence_lint_error.files import Shard
+from silence_lint_error.progress import ProgressMeter
+from silence_lint_error.registry import LINTERS
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Linter
 from silence_lint_error.silencing import Silencer
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.sources import decode_source
+from silence_lint_error.sources import Fingerprint
+from silence_lint_error.sources import PipelinedFiles
 
-
-LINTERS: dict[str, type[Linter]] = {
-    'fixit': fixit.Fixit,
-    'fixit-inline': fixit.FixitInline,
-    'flake8': flake8.Flake8,
-    'mypy': mypy.Mypy,
-    'ruff': ruff.Ruff,
-    'semgrep': semgrep.Semgrep,
-}
+# These modules import `json`, `subprocess` or `tokenize_rt`, which are slow to
+# import, so they are imported where they are used to keep `--help` fast.
+if TYPE_CHECKING:
+    from silence_lint_error.journal import Journal
+    from silence_lint_error.preflight import Linter as CheckingLinter
+    from silence_lint_error.pruning import Linter as PruningLinter
+    from silence_lint_error.records import RecordWriter
 
 
 class Context(NamedTuple):
     rule_name: str
     file_names: list[str]
     linter: Linter
+    journal: Journal | None
+    report_path: str | None
+    shard: Shard | None
+    output_path: str | None
+    show_progress: bool | None
+    output_format: str
+    timeout: float | None
+    verify: bool
+    per_config_root: bool
+    file_level_threshold: int | None
+    in_config: bool
+    stdin_filename: str | None
+    preflight: bool
+
+
+# How many times to check files again which changed after they were checked.
+MAX_STALE_ROUNDS = 3
+
+PROGRESS_HELP = (
+    'Show the progress of adding comments '
+    '(default: only when stderr is a terminal)'
+)
+FORMAT_HELP = (
+    'Write the name of each file processed to stdout (text), '
+    'or a JSON record for each file with the errors silenced (ndjson)'
+)
 
 
 def _parse_args(argv: Sequence[str] | None) -> Context:
     parser = argparse.ArgumentParser(
         description='Ignore linting errors by adding ignore/fixme comments.',
+        epilog=(
+            'Use `silence-lint-error merge FILE [FILE ...]` '
+            'to silence the errors written by runs with --output. '
+            'Use `silence-lint-error survey LINTER [--prefix PREFIX] [FILENAMES ...]` '
+            'to count the errors reported for each rule. '
+            'Use `silence-lint-error prune LINTER [--prefix PREFIX] [FILENAMES ...]` '
+            'to remove codes from comments which no longer silence any errors.'
+        ),
     )
     parser.add_argument(
         'linter', choices=LINTERS,
@@ -41,48 +87,813 @@ def _parse_args(argv: Sequence[str] | None) -> Context:
     )
     parser.add_argument('rule_name')
     parser.add_argument('filenames', nargs='*')
+    parser.add_argument(
+        '--files-from', metavar='FILE',
+        help=(
+            'Also check the files named in FILE (or stdin, for -), one per line, '
+            'e.g. from `git ls-files`'
+        ),
+    )
+    parser.add_argument(
+        '-0', '--null', action='store_true',
+        help=(
+            'The names in --files-from are separated by NUL characters '
+            '(e.g. from `git ls-files -z`)'
+        ),
+    )
+    parser.add_argument(
+        '--journal', metavar='FILE',
+        help=(
+            'Record progress in this file. '
+            'If the run is interrupted, '
+            'run again with the same journal to resume where it stopped.'
+        ),
+    )
+    parser.add_argument(
+        '--from-report', metavar='PATH',
+        help=(
+            'Read violations from a report of a previous run of the linter, '
+            'instead of running the linter. '
+            'Reports must be in the format used by this tool to run the linter '
+            '(e.g. JSON for ruff and semgrep) '
+            'or in SARIF format (with a .sarif extension).'
+        ),
+    )
+    parser.add_argument(
+        '--shard', metavar='I/N', type=Shard.parse,
+        help=(
+            'Only check the I-th of N deterministic partitions of the files '
+            '(e.g. 1/4). Directories are searched for Python files.'
+        ),
+    )
+    parser.add_argument(
+        '--output', metavar='FILE',
+        help=(
+            'Write the errors found to this file instead of silencing them. '
+            'Silence them later with `silence-lint-error merge`.'
+        ),
+    )
+    parser.add_argument(
+        '--timeout', metavar='SECONDS', type=float,
+        help=(
+            'Stop the linter if it runs for longer than this. '
+            'The files are split up and checked again '
+            'to find and skip the files that take too long.'
+        ),
+    )
+    parser.add_argument(
+        '--per-config-root', action='store_true',
+        help=(
+            'Run the linter separately, in parallel, for the files under each '
+            'directory with a config file for the linter (e.g. a pyproject.toml '
+            'with a [tool.ruff] section), from that directory. Directories are '
+            'searched for Python files.'
+        ),
+    )
+    parser.add_argument(
+        '--verify', action='store_true',
+        help=(
+            'Run the linter again on the files that were changed, '
+            'and silence any errors that are still reported '
+            '(in another place, if the linter supports one).'
+        ),
+    )
+    parser.add_argument(
+        '--file-level-threshold', metavar='N', type=int,
+        help=(
+            'Silence the rule for the whole file, with a single comment, '
+            'in files with more than N errors (for mypy and ruff)'
+        ),
+    )
+    parser.add_argument(
+        '--in-config', action='store_true',
+        help=(
+            "Silence the errors in the linter's config file in the current "
+            'directory (e.g. with per-file-ignores), instead of adding comments. '
+            'Directories where every file has errors are silenced as a whole '
+            '(for flake8, mypy and ruff).'
+        ),
+    )
+    parser.add_argument(
+        '--preflight', action=argparse.BooleanOptionalAction, default=True,
+        help=(
+            'Check that the linter is installed and knows the rule '
+            'before running it on any files (default: on, if the linter '
+            'supports it). Rules which pass are cached for each linter version.'
+        ),
+    )
+    parser.add_argument(
+        '--stdin-filename', metavar='PATH',
+        help=(
+            'Read the source of PATH from stdin, and write it to stdout '
+            'with the errors silenced, without reading or writing any files '
+            '(e.g. for an editor buffer which has not been saved). '
+            'For flake8, mypy and ruff.'
+        ),
+    )
+    parser.add_argument(
+        '--progress', action=argparse.BooleanOptionalAction, help=PROGRESS_HELP,
+    )
+    parser.add_argument(
+        '--format', choices=('text', 'ndjson'), default='text', help=FORMAT_HELP,
+    )
     args = parser.parse_args(argv)
 
+    if args.null and not args.files_from:
+        parser.error('--null can only be given with --files-from')
+    if args.from_report and (
+            args.filenames or args.files_from or args.shard or args.per_config_root
+    ):
+        parser.error(
+            'filenames, --files-from, --shard and --per-config-root '
+            'cannot be given with --from-report',
+        )
+    if args.output and args.verify:
+        parser.error('--verify cannot be given with --output')
+    linter_type = LINTERS[args.linter]
+    if args.file_level_threshold is not None and not hasattr(
+            linter_type, 'silence_file',
+    ):
+        parser.error(f'--file-level-threshold is not supported for {args.linter}')
+    if args.in_config:
+        if not hasattr(linter_type, 'silence_in_config'):
+            parser.error(f'--in-config is not supported for {args.linter}')
+        if args.output or args.journal or args.per_config_root:
+            parser.error(
+                '--output, --journal and --per-config-root '
+                'cannot be given with --in-config',
+            )
+    if args.stdin_filename is not None:
+        if not hasattr(linter_type, 'find_violations_in_source'):
+            parser.error(f'--stdin-filename is not supported for {args.linter}')
+        if (
+                args.filenames or args.files_from or args.from_report
+                or args.shard or args.output
+                or args.journal or args.per_config_root or args.verify
+                or args.in_config or args.format != 'text'
+        ):
+            parser.error(
+                'filenames, --files-from, --from-report, --shard, --output, --journal, '
+                '--per-config-root, --verify, --in-config and --format '
+                'cannot be given with --stdin-filename',
+            )
+
+    file_names: Iterable[str] = args.filenames
+    if args.files_from:
+        file_names = itertools.chain(
+            file_names,
+            files.read_file_list(args.files_from, null_separated=args.null),
+        )
+    if args.shard:
+        # like the linter, check the current directory if no paths are given
+        if not args.filenames and not args.files_from:
+            file_names = ['.']
+        file_names = args.shard.select(files.discover(file_names))
+    file_names = list(file_names)
+
+    journal = None
+    if args.journal:
+        from silence_lint_error.journal import Journal
+
+        journal = Journal(args.journal)
+
     return Context(
         rule_name=args.rule_name,
-        file_names=args.filenames,
-        linter=LINTERS[args.linter](),
+        file_names=file_names,
+        linter=linter_type(),
+        journal=journal,
+        report_path=args.from_report,
+        shard=args.shard,
+        output_path=args.output,
+        show_progress=args.progress,
+        output_format=args.format,
+        timeout=args.timeout,
+        verify=args.verify,
+        per_config_root=args.per_config_root,
+        file_level_threshold=args.file_level_threshold,
+        in_config=args.in_config,
+        stdin_filename=args.stdin_filename,
+        preflight=args.preflight,
     )
 
 
 def main(argv: Sequence[str] | None = None) -> int:
-    rule_name, file_names, linter = _parse_args(argv)
-    silencer = Silencer(linter)
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == 'merge':
+        return _merge(argv[1:])
+    if argv and argv[0] == 'survey':
+        return _survey(argv[1:])
+    if argv and argv[0] == 'prune':
+        return _prune(argv[1:])
+
+    context = _parse_args(argv)
+    rule_name, linter, journal = context.rule_name, context.linter, context.journal
+    silencer = Silencer(linter, file_level_threshold=context.file_level_threshold)
+
+    if context.stdin_filename is not None:
+        return _silence_stdin(
+            silencer, rule_name=rule_name, filename=context.stdin_filename,
+        )
+
+    skipped: list[str] = []
+    fingerprints: dict[str, Fingerprint] = {}
+    progress = None
+    if journal:
+        try:
+            progress = journal.load(
+                linter_name=linter.name, rule_name=rule_name,
+                paths=context.file_names,
+            )
+        except journal.Mismatch as e:
+            if (e.linter_name, e.rule_name) == (linter.name, rule_name):
+                print(
+                    f'ERROR: {journal.path} is a journal for other paths',
+                    file=sys.stderr,
+                )
+            else:
+                print(
+                    f'ERROR: {journal.path} is a journal for '
+                    f'{e.rule_name!r} with {e.linter_name}',
+                    file=sys.stderr,
+                )
+            return 1
+
+    if journal and progress:
+        violations, done = progress.violations, progress.done
+        print(
+            f'-> resuming from {journal.path}: '
+            f'{len(done)} of {len(violations)} files already done',
+            file=sys.stderr,
+        )
+        journal.resume()
+    else:
+        try:
+            if context.report_path:
+                print(
+                    f'-> reading errors from {context.report_path}',
+                    file=sys.stderr,
+                )
+                violations = silencer.read_report(
+                    rule_name=rule_name, report_path=context.report_path,
+                )
+            elif context.shard and not context.file_names:
+                print('no files in this shard', file=sys.stderr)
+                return 0
+            else:
+                if context.preflight and hasattr(linter, 'check_rule'):
+                    ret = _preflight(
+                        cast('CheckingLinter', linter), rule_name=rule_name,
+                    )
+                    if ret:
+                        return ret
+
+                print(f'-> finding errors with {linter.name}', file=sys.stderr)
+                findings = silencer.find_violations(
+                    rule_name=rule_name, file_names=context.file_names,
+                    timeout=context.timeout,
+                    by_config_root=context.per_config_root,
+                    # only needed if the files are changed
+                    fingerprint=not (context.output_path or context.in_config),
+                )
+                violations, skipped = findings.violations, findings.skipped
+                fingerprints = findings.fingerprints
+        except silencer.ErrorReadingReport as e:
+            print(
+                f'ERROR: could not read {e.report_path}: {e.reason}',
+                file=sys.stderr,
+            )
+            return 1
+        except ErrorRunningTool as e:
+            print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+            return e.proc.returncode
+        except silencer.NoViolationsFound:
+            print('no errors found', file=sys.stderr)
+            return 0
+        except silencer.MultipleRulesViolated as e:
+            print(
+                'ERROR: errors found for multiple rules:', sorted(e.rule_names),
+                file=sys.stderr,
+            )
+            return 1
+        else:
+            print(f'found errors in {len(violations)} files', file=sys.stderr)
+
+        if skipped:
+            print(
+                f'WARNING: skipped {len(skipped)} files '
+                f'which took longer than {context.timeout:g}s to check:',
+                *skipped, sep='\n  ', file=sys.stderr,
+            )
+
+        if context.output_path:
+            print(f'-> writing errors to {context.output_path}', file=sys.stderr)
+            _write_violations(
+                context.output_path,
+                linter_name=linter.name, rule_name=rule_name,
+                paths=context.file_names, violations=violations,
+            )
+            return int(bool(skipped))
+
+        if context.in_config:
+            return _silence_in_config(
+                cast('ConfiguringLinter', linter),
+                rule_name=rule_name, violations=violations,
+            ) or int(bool(skipped))
+
+        done = {}
+        if journal:
+            journal.start(
+                linter_name=linter.name, rule_name=rule_name,
+                paths=context.file_names, violations=violations,
+            )
+
+    records = _record_writer(context.output_format)
+    changed_files, stale = _silence(
+        silencer, violations, fingerprints=fingerprints,
+        done=done, journal=journal, show_progress=context.show_progress,
+        records=records,
+    )
+    if stale:
+        more_changed_files, stale = _silence_stale(
+            silencer, rule_name=rule_name, file_names=stale,
+            timeout=context.timeout, by_config_root=context.per_config_root,
+            show_progress=context.show_progress, records=records,
+        )
+        changed_files += more_changed_files
+    if stale:
+        print(
+            f'WARNING: skipped {len(stale)} files '
+            f'which changed after they were checked:',
+            *stale, sep='\n  ', file=sys.stderr,
+        )
+
+    if changed_files and context.verify:
+        _verify(
+            silencer, rule_name=rule_name, file_names=changed_files,
+            timeout=context.timeout, by_config_root=context.per_config_root,
+        )
+    return int(bool(changed_files or skipped or stale))
+
+
+def _preflight(linter: CheckingLinter, *, rule_name: str) -> int:
+    """Check that the linter is installed and knows the rule.
+
+    Returns:
+        0 if the checks passed, or the return code to exit with.
+    """
+    from silence_lint_error import preflight
 
-    print(f'-> finding errors with {linter.name}', file=sys.stderr)
     try:
-        violations = silencer.find_violations(
-            rule_name=rule_name, file_names=file_names,
+        preflight.check(linter, rule_name)
+    except preflight.LinterNotInstalled as e:
+        print(f'ERROR: {e.executable} is not installed', file=sys.stderr)
+        return 1
+    except preflight.UnknownRule as e:
+        print(
+            f'ERROR: unknown rule {e.rule_name!r} for {linter.name}: {e.reason}',
+            file=sys.stderr,
+        )
+        return 1
+    except ErrorRunningTool as e:
+        print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+        return e.proc.returncode
+
+    return 0
+
+
+def _silence_in_config(
+        linter: ConfiguringLinter, *, rule_name: str, violations: ViolationSet,
+) -> int:
+    print('-> silencing errors in config', file=sys.stderr)
+    try:
+        config_path = linter.silence_in_config(
+            rule_name, list(violations), os.getcwd(),
+        )
+    except CannotEditConfig as e:
+        print(f'ERROR: could not edit {e.path}: {e.reason}', file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f'ERROR: {e}', file=sys.stderr)
+        return 1
+
+    if config_path is None:
+        return 0
+
+    print(config_path)
+    return 1
+
+
+def _silence_stdin(silencer: Silencer, *, rule_name: str, filename: str) -> int:
+    """Silence errors in source read from stdin, and write it to stdout.
+
+    The source is written back unchanged if there are no errors, so that it can
+    always replace the input. Nothing is written if the linter fails.
+    """
+    src, encoding = decode_source(sys.stdin.buffer.read())
+    try:
+        new_src = silencer.silence_source(
+            rule_name=rule_name, filename=filename, src=src,
         )
     except ErrorRunningTool as e:
         print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
         return e.proc.returncode
     except silencer.NoViolationsFound:
         print('no errors found', file=sys.stderr)
-        return 0
+        new_src = src
     except silencer.MultipleRulesViolated as e:
         print(
             'ERROR: errors found for multiple rules:', sorted(e.rule_names),
             file=sys.stderr,
         )
         return 1
+
+    sys.stdout.buffer.write(new_src.encode(encoding))
+    sys.stdout.buffer.flush()
+    return 0
+
+
+def _write_violations(
+        path: str, *, linter_name: str, rule_name: str, paths: Sequence[str],
+        violations: ViolationSet,
+) -> None:
+    # The output is a journal of a run which has not silenced any files yet.
+    from silence_lint_error.journal import Journal
+
+    output = Journal(path)
+    output.start(
+        linter_name=linter_name, rule_name=rule_name, paths=paths,
+        violations=violations,
+    )
+    output.close()
+
+
+def _merge(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='silence-lint-error merge',
+        description=(
+            'Silence the errors written to files by runs with --output '
+            '(e.g. from each shard of a run with --shard).'
+        ),
+    )
+    parser.add_argument('paths', nargs='+', metavar='FILE')
+    parser.add_argument(
+        '--progress', action=argparse.BooleanOptionalAction, help=PROGRESS_HELP,
+    )
+    parser.add_argument(
+        '--format', choices=('text', 'ndjson'), default='text', help=FORMAT_HELP,
+    )
+    args = parser.parse_args(argv)
+
+    from silence_lint_error.journal import Journal
+
+    linter_name = rule_name = None
+    violations = ViolationSet()
+    for path in args.paths:
+        progress = Journal(path).read()
+        if progress is None:
+            print(f'ERROR: no errors recorded in {path}', file=sys.stderr)
+            return 1
+        if linter_name is None:
+            linter_name, rule_name = progress.linter_name, progress.rule_name
+        elif (progress.linter_name, progress.rule_name) != (linter_name, rule_name):
+            print(
+                f'ERROR: {path} has errors for {progress.rule_name!r} '
+                f'with {progress.linter_name}, not {rule_name!r} with {linter_name}',
+                file=sys.stderr,
+            )
+            return 1
+        violations.update(progress.violations)
+
+    assert linter_name is not None
+    if linter_name not in LINTERS:
+        print(f'ERROR: unknown linter {linter_name!r}', file=sys.stderr)
+        return 1
+
+    print(
+        f'-> merged errors in {len(violations)} files '
+        f'from {len(args.paths)} outputs',
+        file=sys.stderr,
+    )
+    silencer = Silencer(LINTERS[linter_name]())
+    changed_files, __ = _silence(
+        silencer, violations,
+        done={}, journal=None, show_progress=args.progress,
+        records=_record_writer(args.format),
+    )
+    return int(bool(changed_files))
+
+
+def _survey(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='silence-lint-error survey',
+        description=(
+            'Count the errors reported by a linter for each rule and each '
+            'top-level directory, running the linter once for all rules.'
+        ),
+    )
+    parser.add_argument(
+        'linter', choices=LINTERS,
+        help='The linter to run',
+    )
+    parser.add_argument(
+        'filenames', nargs='*',
+        help='The files to check (default: the current directory)',
+    )
+    parser.add_argument(
+        '--prefix', default='',
+        help=(
+            'Only count rules starting with this prefix (default: all rules). '
+            'For fixit, a module of rules.'
+        ),
+    )
+    parser.add_argument('--format', choices=('table', 'json'), default='table')
+    args = parser.parse_intermixed_args(argv)
+
+    linter = LINTERS[args.linter]()
+    survey_violations = getattr(linter, 'survey', None)
+    if survey_violations is None:
+        print(f'ERROR: {args.linter} does not support surveys', file=sys.stderr)
+        return 1
+
+    from silence_lint_error import survey
+
+    print(f'-> surveying errors with {linter.name}', file=sys.stderr)
+    try:
+        violations = survey_violations(args.prefix, args.filenames or ['.'])
+    except ErrorRunningTool as e:
+        print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+        return e.proc.returncode
+
+    summary = survey.summarise(violations)
+    if args.format == 'json':
+        import json
+
+        print(json.dumps(summary, indent=2, sort_keys=True))
     else:
-        print(f'found errors in {len(violations)} files', file=sys.stderr)
+        print(survey.format_table('rule', summary['rules']))
+        print()
+        print(survey.format_table('directory', summary['directories']))
+
+    return 0
 
+
+def _prune(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='silence-lint-error prune',
+        description=(
+            'Remove codes from comments which no longer silence any errors, '
+            'running the linter once for all rules.'
+        ),
+    )
+    parser.add_argument(
+        'linter', choices=LINTERS,
+        help='The linter for which to remove comments',
+    )
+    parser.add_argument(
+        'filenames', nargs='*',
+        help='The files to check (default: the current directory)',
+    )
+    parser.add_argument(
+        '--prefix', default='',
+        help='Only remove codes starting with this prefix (default: all codes)',
+    )
+    args = parser.parse_intermixed_args(argv)
+
+    linter = LINTERS[args.linter]()
+    if not hasattr(linter, 'find_unused_silences'):
+        print(f'ERROR: {args.linter} does not support pruning', file=sys.stderr)
+        return 1
+
+    from silence_lint_error.pruning import Pruner
+
+    pruner = Pruner(cast('PruningLinter', linter))
+    print(f'-> finding unused comments with {linter.name}', file=sys.stderr)
+    try:
+        unused = pruner.find_unused_silences(
+            rule_prefix=args.prefix, file_names=args.filenames or ['.'],
+        )
+    except ErrorRunningTool as e:
+        print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+        return e.proc.returncode
+
+    if not unused:
+        print('no unused comments found', file=sys.stderr)
+        return 0
+
+    print('-> removing unused codes from comments', file=sys.stderr)
+    changed_files = []
+    for filename, file_unused in unused.items():
+        if pruner.prune(filename=filename, unused=file_unused):
+            changed_files.append(filename)
+            print(filename)
+
+    return int(bool(changed_files))
+
+
+def _record_writer(output_format: str) -> RecordWriter | None:
+    if output_format != 'ndjson':
+        return None
+
+    from silence_lint_error.records import RecordWriter
+
+    return RecordWriter(sys.stdout)
+
+
+def _silence(
+        silencer: Silencer, violations: ViolationSet, *,
+        done: dict[str, bool], journal: Journal | None,
+        show_progress: bool | None,
+        fingerprints: Mapping[str, Fingerprint] | None = None,
+        records: RecordWriter | None = None,
+) -> tuple[list[str], list[str]]:
+    """Silence violations, skipping files that are already done.
+
+    Files which no longer match their `fingerprints` are left unchanged.
+
+    Each file is written to stdout as it is processed: its name, or a record of
+    the errors silenced in it if there are `records`.
+
+    Returns:
+        The files that were changed (including those already done), and the
+        files that had changed since they were checked.
+    """
     print('-> adding comments to silence errors', file=sys.stderr)
-    ret = 0
-    for filename, file_violations in violations.items():
-        print(filename)
-        ret |= silencer.silence_violations(
-            filename=filename, violations=file_violations,
+    meter = ProgressMeter.for_stderr(
+        'adding comments', len(violations) - len(done), enabled=show_progress,
+    )
+    changed_files = [filename for filename, changed in done.items() if changed]
+    stale = []
+    # A journal must only record files once they have been written.
+    pipeline = PipelinedFiles(
+        (filename for filename in violations if filename not in done),
+        write_behind=journal is None,
+    )
+    recording = None
+    if records:
+        from silence_lint_error.records import RecordingFiles
+
+        recording = RecordingFiles(pipeline)
+    silencer = attrs.evolve(silencer, files=recording or pipeline)
+    with pipeline:
+        for filename, file_violations in violations.items():
+            if filename in done:
+                continue
+
+            if meter:
+                meter.clear()
+            if not records:
+                print(filename)
+            bytes_read = pipeline.bytes_read
+            start = time.perf_counter()
+            try:
+                changed = silencer.silence_violations(
+                    filename=filename, violations=file_violations,
+                    fingerprint=(fingerprints or {}).get(filename),
+                )
+            except silencer.FileChanged:
+                # not recorded in the journal, so it is done again if resumed
+                stale.append(filename)
+                status = 'stale'
+            else:
+                if changed:
+                    changed_files.append(filename)
+                if journal:
+                    journal.record(filename, changed=changed)
+                status = 'changed' if changed else 'unchanged'
+            if records and recording:
+                records.write({
+                    'path': filename,
+                    'rules': sorted({v.rule_name for v in file_violations}),
+                    'lines': sorted({v.lineno for v in file_violations}),
+                    'status': status,
+                    'bytes': recording.bytes_changed(),
+                    'elapsed': round(time.perf_counter() - start, 6),
+                })
+            if meter:
+                meter.advance(pipeline.bytes_read - bytes_read)
+
+    if journal:
+        journal.finish()
+    if meter:
+        meter.finish()
+
+    return changed_files, stale
+
+
+def _silence_stale(
+        silencer: Silencer, *,
+        rule_name: str, file_names: list[str],
+        timeout: float | None, by_config_root: bool, show_progress: bool | None,
+        records: RecordWriter | None = None,
+) -> tuple[list[str], list[str]]:
+    """Check files again which changed after they were checked, and silence them.
+
+    Returns:
+        The files that were changed, and the files that could not be silenced
+        (because they kept changing, or could not be checked).
+    """
+    changed_files: list[str] = []
+    for __ in range(MAX_STALE_ROUNDS):
+        print(
+            f'-> checking {len(file_names)} files again '
+            f'which changed after they were checked',
+            file=sys.stderr,
+        )
+        try:
+            findings = silencer.find_violations(
+                rule_name=rule_name, file_names=file_names,
+                timeout=timeout, by_config_root=by_config_root,
+            )
+        except silencer.NoViolationsFound:
+            return changed_files, []
+        except ErrorRunningTool as e:
+            print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+            break
+        except silencer.MultipleRulesViolated as e:
+            print(
+                'ERROR: errors found for multiple rules:', sorted(e.rule_names),
+                file=sys.stderr,
+            )
+            break
+
+        more_changed_files, file_names = _silence(
+            silencer, findings.violations, fingerprints=findings.fingerprints,
+            done={}, journal=None, show_progress=show_progress,
+            records=records,
         )
+        changed_files += more_changed_files
+        file_names += findings.skipped
+        if not file_names:
+            break
+
+    return changed_files, file_names
+
+
+def _verify(
+        silencer: Silencer, *,
+        rule_name: str, file_names: list[str],
+        timeout: float | None, by_config_root: bool,
+) -> None:
+    """Silence errors that are still reported after adding comments.
 
-    return ret
+    Only the changed files are checked again. Linters may name another linter
+    (with an `alternative` attribute) which places comments elsewhere, e.g. on
+    the same line as the error instead of the line above. Each time errors are
+    still reported, they are silenced with the next of these placements. Each
+    placement is only tried once, so that comments are not added twice.
+    """
+    placements = [silencer]
+    alternative: str | None = getattr(silencer.linter, 'alternative', None)
+    if alternative and alternative in LINTERS:
+        placements.append(Silencer(LINTERS[alternative]()))
+
+    violations = ViolationSet()
+    # the first placement has already been used
+    for placement in [*placements[1:], None]:
+        print(
+            f'-> checking for errors in {len(file_names)} changed files',
+            file=sys.stderr,
+        )
+        try:
+            violations = silencer.find_violations(
+                rule_name=rule_name, file_names=file_names,
+                timeout=timeout, by_config_root=by_config_root,
+                fingerprint=False,
+            ).violations
+        except silencer.NoViolationsFound:
+            print('all errors are silenced', file=sys.stderr)
+            return
+        except ErrorRunningTool as e:
+            print(f'ERROR: {e.proc.stderr.strip()}', file=sys.stderr)
+            return
+        except silencer.MultipleRulesViolated as e:
+            print(
+                'ERROR: errors found for multiple rules:', sorted(e.rule_names),
+                file=sys.stderr,
+            )
+            return
+
+        if placement is None:
+            break
+
+        print(
+            f'-> adding comments to silence errors in {len(violations)} files',
+            file=sys.stderr,
+        )
+        file_names = [
+            filename for filename, file_violations in violations.items()
+            if placement.silence_violations(
+                filename=filename, violations=file_violations,
+            )
+        ]
+        if not file_names:
+            break
+
+    print(
+        f'WARNING: errors are still reported in {len(violations)} files:',
+        *violations, sep='\n  ', file=sys.stderr,
+    )
 
 
 if __name__ == '__main__':
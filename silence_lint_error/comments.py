@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import itertools
+import re
+from collections.abc import Collection
+from collections.abc import Mapping
+
 import tokenize_rt
 
+from silence_lint_error import sources
+
+# PEP 263
+_encoding_cookie_re = re.compile(r'^[ \t\f]*#.*?coding[:=][ \t]*[-\w.]+')
+
 
 def add_error_silencing_comments(
         src: str, error_lines: set[int],
@@ -58,15 +68,88 @@ def add_noqa_comments(src: str, lines: set[int], error_code: str) -> str:
     return add_error_silencing_comments(src, lines, 'noqa', error_code)
 
 
+def add_file_level_comment(src: str, comment: str) -> str:
+    """Add a comment on its own line to the header of a module.
+
+    The comment is added after any shebang and encoding declaration. Only the
+    comments at the start of the module are read, so this is much cheaper than
+    adding comments to many lines of a large module.
+
+    Returns:
+        The content of the module with the comment added, or `src` if the
+        comment is already in the header.
+    """
+    insert_at = 0
+    start = 0
+    for lineno in itertools.count(1):
+        end = src.find('\n', start) + 1 or len(src)
+        line = src[start:end]
+        if not line.startswith('#'):
+            break
+        if line.rstrip('\r\n') == comment:
+            return src
+        if (lineno == 1 and line.startswith('#!')) or (
+                lineno <= 2 and _encoding_cookie_re.match(line)
+        ):
+            insert_at = end
+        if end == len(src):
+            break
+        start = end
+
+    newline = sources.line_ending(src[:src.find('\n') + 1])
+    header = src[:insert_at]
+    if header and not header.endswith('\n'):
+        header += newline
+    return f'{header}{comment}{newline}{src[insert_at:]}'
+
+
+def remove_code_from_file_level_comments(
+        src: str, comment_type: str, code: str,
+) -> str:
+    """Remove an error code from the comments in the header of a module.
+
+    This undoes `add_file_level_comment`. Like it, only the comments at the start
+    of the module are read.
+
+    Args:
+        src: The content of the module to remove the code from.
+        comment_type: The type of comment to remove the code from
+            (e.g. `ruff: noqa`).
+        code: The error code to remove.
+
+    Returns:
+        The content of the module without the code. Comments left without any
+        codes are removed, along with their lines.
+    """
+    header_end = 0
+    while src.startswith('#', header_end):
+        header_end = src.find('\n', header_end) + 1 or len(src)
+
+    lines = []
+    for line in src[:header_end].splitlines(keepends=True):
+        comment = line.rstrip('\r\n')
+        if f'{comment_type}:' in comment:
+            new_comment = remove_code_from_comment(comment, comment_type, code)
+            if not new_comment:
+                continue
+            line = new_comment + line[len(comment):]
+        lines.append(line)
+    return ''.join(lines) + src[header_end:]
+
+
 def add_code_to_comment(
         comment: str, comment_type: str, code: str, sep: str = '',
 ) -> str:
     """Add to a comment to make it a error-silencing comment.
 
     If the comment already includes an error silencing section of the same type, this
-    will add the code to the list of silenced errors.
+    will add the code to the list of silenced errors (unless it is already listed).
     """
     if f'{comment_type}: ' in comment:
+        __, __, codes = comment.partition(f'{comment_type}: ')
+        section, __, __ = codes.partition('#')
+        if code in re.split(r'[,\s]+', section):
+            return comment
         return comment.replace(
             f'{comment_type}: ', f'{comment_type}: {code},{sep}', 1,
         )
@@ -117,12 +200,96 @@ def remove_error_silencing_comments(
 
 def remove_code_from_comment(comment: str, comment_type: str, code: str) -> str:
     """Remove the error-silencing portion from a comment."""
+    type_ = re.escape(comment_type)
+    code_ = rf'{re.escape(code)}(?![\w.-])'  # not a prefix of another code
     return (
-        comment
-        .replace(f'{comment_type}: {code},', f'{comment_type}: ')
-        .replace(f',{code}', '')
-        .removeprefix(f'# {comment_type}: {code}')
-        .removesuffix(f'{comment_type}: {code}')
+        re.sub(
+            rf',\s*{code_}', '',  # a code after the first
+            re.sub(
+                rf'{type_}:\s*{code_},\s*', f'{comment_type}: ',  # the first code
+                re.sub(
+                    rf'#\s*{type_}:\s*{code_}(?=\s*(?:#|$))', '',  # the only code
+                    comment,
+                ),
+            ),
+        )
         .strip()
-        .removesuffix('  #')
     )
+
+
+def find_silencing_comments(
+        src: str, comment_type: str,
+) -> list[tuple[range, list[str]]]:
+    """Find the error codes in comments that silence errors.
+
+    Comments without codes (e.g. a bare `# noqa`) are not included.
+
+    Returns:
+        The codes in each comment, with the lines of the code the comment is on:
+        usually the line of the comment, but all the lines of a multi-line string
+        which ends on that line.
+    """
+    found: list[tuple[range, list[str]]] = []
+    if f'{comment_type}:' not in src:
+        return found
+
+    codes_re = re.compile(
+        rf'{re.escape(comment_type)}:\s*([^\s,#]+(?:,\s*[^\s,#]+)*)',
+    )
+    first_line = 1
+    for token in tokenize_rt.src_to_tokens(src):
+        if token.name in {'NEWLINE', 'NL'}:
+            first_line = token.line + 1
+        elif token.name == 'STRING' and '\n' in token.src:
+            first_line = min(first_line, token.line)
+        elif token.name == 'COMMENT':
+            match = codes_re.search(token.src)
+            if match:
+                found.append((
+                    range(min(first_line, token.line), token.line + 1),
+                    re.split(r',\s*', match[1]),
+                ))
+
+    return found
+
+
+def remove_codes_from_comments(
+        src: str, comment_type: str, codes: Mapping[int, Collection[str]],
+) -> str:
+    """Remove error codes from the comments on some lines, in a single pass.
+
+    Args:
+        src: The content of the module to remove codes from.
+        comment_type: The type of comment to remove codes from (e.g. `noqa`).
+        codes: The codes to remove from the comment on each line.
+
+    Returns:
+        The content of the module without the codes. Comments left without any
+        codes are removed, along with lines which only held the comment.
+    """
+    tokens = tokenize_rt.src_to_tokens(src)
+
+    for idx, token in tokenize_rt.reversed_enumerate(tokens):
+        if token.name != 'COMMENT' or token.line not in codes:
+            continue
+
+        new_comment = token.src
+        for code in codes[token.line]:
+            new_comment = remove_code_from_comment(new_comment, comment_type, code)
+        if new_comment:
+            tokens[idx] = token._replace(src=new_comment)
+            continue
+
+        del tokens[idx]
+        if idx and tokens[idx - 1].name == 'UNIMPORTANT_WS':
+            idx -= 1
+            del tokens[idx]
+        if (
+                (idx == 0 or tokens[idx - 1].name in {'NEWLINE', 'NL'})
+                and idx < len(tokens) and tokens[idx].name == 'NL'
+        ):
+            del tokens[idx]  # the line only held the comment
+
+    return tokenize_rt.tokens_to_src(tokens)  # type: ignore[no-any-return]
+    # tokenize-rt is a single-file distribution so cannot provide type
+    # information. See https://github.com/asottile/tokenize-rt/issues/147.
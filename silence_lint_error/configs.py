@@ -0,0 +1,342 @@
+"""Silence errors in linter config files, instead of with comments.
+
+Config files are edited as text, so that their comments and formatting are kept.
+Only the sections that silence errors are changed: values for patterns (or
+modules) which are already configured are extended, and other patterns are added
+as new entries.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import NamedTuple
+from typing import Protocol
+
+import attrs
+
+from silence_lint_error import files
+
+
+@attrs.frozen
+class CannotEditConfig(Exception):
+    path: str
+    reason: str
+
+
+class Linter(Protocol):
+    name: str
+
+    def silence_in_config(
+            self, rule_name: str, filenames: Sequence[str], root: str,
+    ) -> str | None:
+        """Silence a rule for some files in the linter's config file.
+
+        The config file used by the linter in `root` is changed, or created if
+        there is none. Directories where every file is given are silenced as a
+        whole.
+
+        Returns:
+            The path of the config file, if it was changed.
+
+        Raises:
+            CannotEditConfig: The config file cannot be changed safely.
+            ValueError: A file is not under `root`.
+        """
+
+
+def group_paths(
+        filenames: Iterable[str], root: str, *,
+        can_group: Callable[[str], bool] = lambda directory: True,
+) -> list[str]:
+    """Replace files with the directories which they fill.
+
+    Where every Python file under a directory is given (see `files.discover`),
+    the files are replaced by the directory, so that large directories can be
+    silenced with a single pattern.
+
+    Args:
+        filenames: The files to group.
+        root: The directory that paths are relative to.
+        can_group: Whether a directory (relative to `root`) may replace its files.
+
+    Returns:
+        The paths, relative to `root` and separated by `/`, in sorted order.
+        Directories end with `/`.
+
+    Raises:
+        ValueError: A file is not under `root`.
+    """
+    paths = {
+        os.path.relpath(filename, root).replace(os.sep, '/')
+        for filename in filenames
+    }
+    for path in paths:
+        if path.startswith('../'):
+            raise ValueError(f'{path!r} is not under {root!r}')
+
+    given: dict[str, int] = {}
+    for path in paths:
+        for directory in _parents(path):
+            given[directory] = given.get(directory, 0) + 1
+
+    found: dict[str, int] = {}
+    top_directories = sorted({path.partition('/')[0] for path in paths if '/' in path})
+    for filename in files.discover(
+            os.path.join(root, directory) for directory in top_directories
+    ):
+        path = os.path.relpath(filename, root).replace(os.sep, '/')
+        for directory in _parents(path):
+            if directory in given:
+                found[directory] = found.get(directory, 0) + 1
+
+    full = {
+        directory for directory, count in given.items()
+        if found.get(directory) == count and can_group(directory)
+    }
+    grouped = set()
+    for path in paths:
+        for directory in reversed(_parents(path)):  # from the top
+            if directory in full:
+                grouped.add(f'{directory}/')
+                break
+        else:
+            grouped.add(path)
+
+    return sorted(grouped)
+
+
+def _parents(path: str) -> list[str]:
+    """The directories above a relative path, nearest first."""
+    parents = []
+    directory, __, __ = path.rpartition('/')
+    while directory:
+        parents.append(directory)
+        directory, __, __ = directory.rpartition('/')
+    return parents
+
+
+def find_config(
+        root: str, candidates: Sequence[tuple[str, str | None]],
+) -> str | None:
+    """Find the config file used by a linter.
+
+    Args:
+        root: The directory to look in.
+        candidates: The names of the files the linter reads, in the order the
+            linter looks for them, and the header of the section which configures
+            the linter in that file (if the file may configure other tools).
+
+    Returns:
+        The path of the first file that configures the linter, if any.
+    """
+    for name, section in candidates:
+        path = os.path.join(root, name)
+        if not os.path.isfile(path):
+            continue
+        if section is None:
+            return path
+        if any(
+                found.name == section or found.name.startswith(f'{section}.')
+                for found in sections(read_config(path))
+        ):
+            return path
+
+    return None
+
+
+def read_config(path: str) -> str:
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ''
+
+
+def write_config(path: str, text: str) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+# Sections
+# ========
+
+_HEADER_RE = re.compile(
+    r'^[ \t]*(?P<open>\[\[?)[ \t]*(?P<name>[^\[\]]+?)[ \t]*\]\]?[ \t]*(?:[#;][^\r\n]*)?\r?$',
+    re.MULTILINE,
+)
+
+
+class Section(NamedTuple):
+    header: str  # e.g. `[tool.ruff]` or `[[tool.mypy.overrides]]`
+    name: str
+    header_start: int
+    start: int  # of the body
+    end: int
+
+
+def sections(text: str) -> list[Section]:
+    """Find the sections of an INI or TOML file."""
+    headers = list(_HEADER_RE.finditer(text))
+    return [
+        Section(
+            header=f'{match["open"]}{match["name"]}{match["open"].replace("[", "]")}',
+            name=match['name'],
+            header_start=match.start(),
+            start=min(match.end() + 1, len(text)),  # after the newline
+            end=headers[idx + 1].start() if idx + 1 < len(headers) else len(text),
+        )
+        for idx, match in enumerate(headers)
+    ]
+
+
+def newline(text: str) -> str:
+    return '\r\n' if '\r\n' in text else '\n'
+
+
+def insert_in_section(text: str, section: Section, lines: Sequence[str]) -> str:
+    """Add lines to the end of a section, before any blank lines."""
+    body = text[section.start:section.end]
+    end = section.start + len(body.rstrip())
+    nl = newline(text)
+    if end > section.start:
+        new_lines = ''.join(f'{nl}{line}' for line in lines)
+    else:  # an empty section
+        new_lines = ''.join(f'{line}{nl}' for line in lines)
+        if section.start == len(text) and not text.endswith('\n'):
+            new_lines = nl + new_lines
+    return f'{text[:end]}{new_lines}{text[end:]}'
+
+
+def append_section(text: str, header: str, lines: Sequence[str]) -> str:
+    nl = newline(text)
+    if text and not text.endswith('\n'):
+        text += nl
+    if text.strip():
+        text += nl
+    return text + ''.join(f'{line}{nl}' for line in (header, *lines))
+
+
+def copy_section(text: str, section: Section, header: str) -> str:
+    """Add a copy of a section, with a new header, to the end of a file."""
+    body = text[section.start:section.end].rstrip()
+    return append_section(text, header, body.splitlines() if body else [])
+
+
+def replace_header(text: str, section: Section, header: str) -> str:
+    header_end = text.index(']', section.header_start) + 1
+    if section.header.startswith('[['):
+        header_end += 1
+    return f'{text[:section.header_start]}{header}{text[header_end:]}'
+
+
+def find_section(text: str, names: Sequence[str]) -> Section | None:
+    """Find the first of some sections (or TOML tables)."""
+    for section in sections(text):
+        if section.header in (f'[{name}]' for name in names):
+            return section
+    return None
+
+
+# TOML
+# ====
+
+_TOML_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|\'([^\']*)\'')
+
+
+def toml_array(items: Iterable[str]) -> str:
+    return '[{}]'.format(', '.join(f'"{item}"' for item in items))
+
+
+def _toml_key_re(key: str) -> str:
+    quoted = rf'"{re.escape(key)}"|\'{re.escape(key)}\''
+    if re.fullmatch(r'[\w-]+', key):
+        quoted += rf'|{re.escape(key)}'
+    return rf'^[ \t]*(?:{quoted})[ \t]*=[ \t]*'
+
+
+def toml_find_array(body: str, key: str) -> re.Match[str] | None:
+    """Find an array of strings (or a single string) in the body of a TOML table.
+
+    The `value` group of the match is the array, and `items` its contents.
+    """
+    return re.search(
+        rf'{_toml_key_re(key)}(?P<value>\[(?P<items>[^\]]*)\]|"[^"\n]*")',
+        body, re.MULTILINE,
+    )
+
+
+def toml_items(match: re.Match[str]) -> list[str]:
+    return [
+        double or single
+        for double, single in _TOML_STRING_RE.findall(match['value'])
+    ]
+
+
+def toml_set_array(
+        text: str, section: Section, key: str, items: Sequence[str],
+) -> str:
+    """Set an array of strings in a TOML table, adding the key if needed."""
+    match = toml_find_array(text[section.start:section.end], key)
+    if match is None:
+        key_ = key if re.fullmatch(r'[\w-]+', key) else f'"{key}"'
+        return insert_in_section(text, section, [f'{key_} = {toml_array(items)}'])
+
+    start, end = match.span('value')
+    return (
+        f'{text[:section.start + start]}'
+        f'{toml_array(items)}'
+        f'{text[section.start + end:]}'
+    )
+
+
+def toml_add_to_array(
+        text: str, section: Section, key: str, items: Sequence[str],
+) -> str:
+    """Add items to an array of strings in a TOML table, adding the key if needed."""
+    match = toml_find_array(text[section.start:section.end], key)
+    existing = toml_items(match) if match else []
+    return toml_set_array(
+        text, section, key,
+        existing + [item for item in items if item not in existing],
+    )
+
+
+# INI
+# ===
+
+def ini_find_option(body: str, key: str) -> re.Match[str] | None:
+    """Find an option in the body of an INI section.
+
+    The `value` group of the match is the value, including any continuation lines.
+    Options may be spelled with `-` or `_`.
+    """
+    key_re = '[-_]'.join(re.escape(part) for part in re.split('[-_]', key))
+    return re.search(
+        rf'^{key_re}[ \t]*[=:][ \t]*(?P<value>[^\r\n]*(?:\r?\n[ \t]+\S[^\r\n]*)*)',
+        body, re.MULTILINE,
+    )
+
+
+def ini_add_to_list(
+        text: str, section: Section, key: str, items: Sequence[str],
+) -> str:
+    """Add items to a comma-separated option in an INI section.
+
+    The option is added if the section does not have it.
+    """
+    body = text[section.start:section.end]
+    match = ini_find_option(body, key)
+    if match is None:
+        return insert_in_section(text, section, [f'{key} = {", ".join(items)}'])
+
+    existing = [item.strip() for item in match['value'].split(',') if item.strip()]
+    new_items = existing + [item for item in items if item not in existing]
+    start, end = match.span('value')
+    return (
+        f'{text[:section.start + start]}'
+        f'{", ".join(new_items)}'
+        f'{text[section.start + end:]}'
+    )
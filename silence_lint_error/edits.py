@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import bisect
+import re
+from collections import defaultdict
+
+NEWLINE_RE = re.compile(r'\r\n?|\n')
+
+
+class EditPlan:
+    """Line-based edits to make to the source of a module.
+
+    Edits are recorded against line numbers in the original source, so they can be
+    made in any order without affecting each other. They are applied in a single
+    pass, which copies the unchanged regions of the source as slices.
+    """
+
+    def __init__(self, src: str) -> None:
+        self.src = src
+
+        # The offset at which each line starts, followed by the end of the source.
+        self._line_starts = [0]
+        self._line_starts.extend(m.end() for m in NEWLINE_RE.finditer(src))
+        if self._line_starts[-1] != len(src):
+            self._line_starts.append(len(src))
+
+        self._insertions: dict[int, list[str]] = defaultdict(list)
+        self._replacements: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        """The number of lines in the original source."""
+        return len(self._line_starts) - 1
+
+    def line(self, lineno: int) -> str:
+        """Get a line of the original source, including its line ending."""
+        if not 1 <= lineno <= len(self):
+            raise IndexError(lineno)
+        return self.src[self._line_starts[lineno-1]:self._line_starts[lineno]]
+
+    def lineno_at(self, offset: int) -> int:
+        """Get the number of the line containing an offset in the source."""
+        return bisect.bisect_right(self._line_starts, offset)
+
+    def insert(self, lineno: int, text: str) -> None:
+        """Insert text before a line.
+
+        The text should include its own line ending. Text inserted before the same
+        line is kept in the order it was inserted.
+        """
+        self.line(lineno)  # check the line exists
+        self._insertions[lineno].append(text)
+
+    def replace(self, lineno: int, text: str) -> None:
+        """Replace a line (including its line ending) with some other text.
+
+        Replacing a line with an empty string deletes it.
+        """
+        self.line(lineno)  # check the line exists
+        self._replacements[lineno] = text
+
+    def apply(self) -> str:
+        """Get the source with all the edits applied."""
+        if not self._insertions and not self._replacements:
+            return self.src
+
+        parts = []
+        position = 0
+        for lineno in sorted(self._insertions.keys() | self._replacements.keys()):
+            start = self._line_starts[lineno-1]
+            parts.append(self.src[position:start])
+            parts.extend(self._insertions.get(lineno, ()))
+            position = self._line_starts[lineno]
+            parts.append(self._replacements.get(lineno, self.src[start:position]))
+        parts.append(self.src[position:])
+
+        return ''.join(parts)
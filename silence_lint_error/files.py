@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+import sys
+import zlib
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import BinaryIO
+
+import attrs
+
+PYTHON_EXTENSIONS = ('.py', '.pyi')
+EXCLUDED_DIRECTORIES = frozenset((
+    '__pycache__',
+    'build',
+    'dist',
+    'node_modules',
+    'venv',
+))
+# The most file names (in characters) to give a linter on its command line in one
+# run. Command lines are limited to about 32K characters on Windows, and to
+# `ARG_MAX` (which also holds the environment) elsewhere, e.g. 1M on macOS.
+MAX_ARGS_LENGTH = 30_000 if sys.platform == 'win32' else 250_000
+# bytes read at a time from a list of files
+_READ_SIZE = 64 * 1024
+
+
+def discover(paths: Iterable[str]) -> Iterator[str]:
+    """Find the Python files in some paths.
+
+    Files are returned as given. Directories are searched recursively, in a
+    deterministic order, skipping hidden directories and common build and
+    environment directories.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(
+                dirname for dirname in dirnames
+                if not dirname.startswith('.')
+                and dirname not in EXCLUDED_DIRECTORIES
+            )
+            for filename in sorted(filenames):
+                if filename.endswith(PYTHON_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+
+def read_file_list(path: str, *, null_separated: bool = False) -> Iterator[str]:
+    """Read file names from a file, one per line (e.g. from `git ls-files`).
+
+    The file is read incrementally, so that very long lists need not be held in
+    memory. Empty names are skipped.
+
+    Args:
+        path: The file to read, or `-` for stdin.
+        null_separated: Whether names are separated by NUL characters instead of
+            newlines (e.g. from `git ls-files -z`), so that they may contain
+            newlines.
+    """
+    if path == '-':
+        yield from _read_names(sys.stdin.buffer, null_separated=null_separated)
+    else:
+        with open(path, 'rb') as f:
+            yield from _read_names(f, null_separated=null_separated)
+
+
+def _read_names(f: BinaryIO, *, null_separated: bool) -> Iterator[str]:
+    separator = b'\0' if null_separated else b'\n'
+    pending = b''
+    while chunk := f.read(_READ_SIZE):
+        *names, pending = (pending + chunk).split(separator)
+        for name in names:
+            yield from _decode_name(name, null_separated=null_separated)
+    yield from _decode_name(pending, null_separated=null_separated)
+
+
+def _decode_name(name: bytes, *, null_separated: bool) -> Iterator[str]:
+    if not null_separated:
+        name = name.removesuffix(b'\r')
+    if name:
+        yield os.fsdecode(name)
+
+
+def chunk_args(filenames: Iterable[str]) -> Iterator[list[str]]:
+    """Split file names into chunks which fit on a linter's command line.
+
+    See `MAX_ARGS_LENGTH`. No chunks are yielded if there are no file names.
+    """
+    chunk: list[str] = []
+    length = 0
+    for filename in filenames:
+        if chunk and length + len(filename) + 1 > MAX_ARGS_LENGTH:
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(filename)
+        length += len(filename) + 1  # and a space
+    if chunk:
+        yield chunk
+
+
+def group_by_config_root(
+        filenames: Iterable[str], is_config_root: Callable[[str], bool],
+) -> dict[str, list[str]]:
+    """Group files by their config root.
+
+    The config root of a file is the nearest directory above it for which
+    `is_config_root` is true (e.g. because it has the linter's config file), or
+    the current directory if there is none.
+
+    Returns:
+        Mapping of config root to the files under it. Both are absolute paths.
+    """
+    cwd = os.getcwd()
+    roots: dict[str, str] = {}  # directory -> config root
+    groups: dict[str, list[str]] = {}
+    for filename in filenames:
+        path = os.path.abspath(filename)
+        root = _config_root(
+            os.path.dirname(path), roots,
+            is_config_root=is_config_root, default=cwd,
+        )
+        groups.setdefault(root, []).append(path)
+    return groups
+
+
+def _config_root(
+        directory: str, roots: dict[str, str], *,
+        is_config_root: Callable[[str], bool], default: str,
+) -> str:
+    # Walk up from the directory until we find a config root, or a directory we
+    # have already seen, then remember the result for every directory on the way.
+    visited = []
+    while directory not in roots:
+        visited.append(directory)
+        if is_config_root(directory):
+            roots[directory] = directory
+            break
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            roots[directory] = default
+            break
+        directory = parent
+
+    root = roots[directory]
+    for directory in visited:
+        roots[directory] = root
+    return root
+
+
+@attrs.frozen
+class Shard:
+    """One of a number of deterministic partitions of a set of files.
+
+    Files are assigned to shards by a stable hash of their path, so each file is
+    always in the same shard (regardless of which other files there are) and
+    shards stay balanced as files are added and removed.
+    """
+
+    index: int  # 1-based
+    count: int
+
+    @classmethod
+    def parse(cls, s: str) -> Shard:
+        """Parse a shard in the form `i/n`, e.g. `1/4`."""
+        index_, sep, count_ = s.partition('/')
+        if sep and index_.isdigit() and count_.isdigit():
+            index, count = int(index_), int(count_)
+            if 1 <= index <= count:
+                return cls(index, count)
+
+        raise ValueError(f'invalid shard {s!r}: expected i/n, e.g. 1/4')
+
+    def includes(self, filename: str) -> bool:
+        """Whether a file belongs to this shard."""
+        key = os.path.normpath(filename).replace(os.sep, '/').encode()
+        return zlib.crc32(key) % self.count == self.index - 1
+
+    def select(self, filenames: Iterable[str]) -> Iterator[str]:
+        """Get the files that belong to this shard."""
+        return (filename for filename in filenames if self.includes(filename))
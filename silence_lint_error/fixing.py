@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import zlib
 from collections.abc import Sequence
+from typing import cast
 from typing import Protocol
 
 import attrs
 
+from silence_lint_error import files
+from silence_lint_error import silencing
+from silence_lint_error import sources
+
 
 class Linter(Protocol):
     name: str
@@ -26,9 +32,53 @@ class Linter(Protocol):
         """
 
 
+class UndoLog:
+    """The original sources of files, so that changes to them can be undone.
+
+    Sources are kept compressed, with a fingerprint of each, since a run may
+    change a large number of files.
+    """
+
+    def __init__(self) -> None:
+        # file name -> (compressed source, encoding, fingerprint)
+        self._originals: dict[str, tuple[bytes, str, sources.Fingerprint]] = {}
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._originals
+
+    def __len__(self) -> int:
+        return len(self._originals)
+
+    def record(self, filename: str, src: str, encoding: str) -> None:
+        """Record the original source of a file, unless it is already recorded."""
+        if filename in self._originals:
+            return
+        data = src.encode(encoding)
+        self._originals[filename] = (
+            zlib.compress(data, 1), encoding, sources.Fingerprint.of(data),
+        )
+
+    def restore(self, filename: str, files: sources.Files) -> bool:
+        """Restore the original source of a file.
+
+        Returns:
+            Whether the file was changed.
+        """
+        compressed, encoding, fingerprint = self._originals[filename]
+        src, current_encoding = files.read(filename)
+        if sources.Fingerprint.of_source(src, current_encoding) == fingerprint:
+            return False
+
+        files.write(filename, zlib.decompress(compressed).decode(encoding), encoding)
+        return True
+
+
 @attrs.frozen
 class Fixer:
     linter: Linter
+    files: sources.Files = attrs.field(factory=sources.DiskFiles)
+    # the sources of the files before comments were removed from them
+    undo_log: UndoLog = attrs.field(factory=UndoLog)
 
     class NoChangesMade(Exception):
         pass
@@ -36,18 +86,109 @@ class Fixer:
     def unsilence_violations(
             self, *, rule_name: str, filename: str,
     ) -> None:
-        with open(filename) as f:
-            src = f.read()
+        src, encoding = self.files.read(filename)
 
         src_without_comments = self.linter.remove_silence_comments(src, rule_name)
 
         if src_without_comments == src:
             raise self.NoChangesMade
 
-        with open(filename, 'w') as f:
-            f.write(src_without_comments)
+        self.undo_log.record(filename, src, encoding)
+        self.files.write(filename, src_without_comments, encoding)
 
     def apply_fixes(
             self, *, rule_name: str, filenames: Sequence[str],
     ) -> tuple[int, str]:
-        return self.linter.apply_fixes(rule_name, filenames)
+        """Fix violations of a rule.
+
+        Long lists of files are split into chunks which fit on the linter's
+        command line (see `files.chunk_args`), and fixed in turn.
+
+        Returns:
+            The highest return code, and the output of each run of the linter.
+        """
+        results = [
+            self.linter.apply_fixes(rule_name, chunk)
+            for chunk in files.chunk_args(filenames)
+        ]
+        return (
+            max((ret for ret, __ in results), default=0),
+            '\n'.join(message for __, message in results if message),
+        )
+
+    @property
+    def can_silence(self) -> bool:
+        """Whether the linter can also find and silence violations.
+
+        See `silencing.Linter`.
+        """
+        return all(
+            hasattr(self.linter, attr)
+            for attr in ('find_violations', 'read_report', 'silence_violations')
+        )
+
+    def silence_unfixed(
+            self, *, rule_name: str, filenames: Sequence[str],
+    ) -> silencing.ViolationSet:
+        """Silence violations which are still reported after applying fixes.
+
+        This puts back the comments for violations that could not be fixed, e.g.
+        because the fix is unsafe. Only `filenames` are checked.
+
+        Returns:
+            The violations that were silenced.
+
+        Raises:
+            ErrorRunningTool: There was an error whilst running the linter.
+            Silencer.MultipleRulesViolated: Violations of more than one rule were
+                found.
+        """
+        silencer = silencing.Silencer(
+            cast(silencing.Linter, self.linter), files=self.files,
+        )
+        try:
+            findings = silencer.find_violations(
+                rule_name=rule_name, file_names=filenames, fingerprint=False,
+            )
+        except silencer.NoViolationsFound:
+            return silencing.ViolationSet()
+
+        for filename, file_violations in findings.violations.items():
+            silencer.silence_violations(
+                filename=filename, violations=file_violations,
+            )
+
+        return findings.violations
+
+    def restore_unfixed(
+            self, *, rule_name: str, filenames: Sequence[str],
+    ) -> list[str]:
+        """Restore the original source of files which still have violations.
+
+        This undoes the changes to files which could not be fixed, e.g. because
+        the linter failed partway through applying fixes. Only `filenames` are
+        checked, and only files whose comments were removed are restored.
+
+        Returns:
+            The files that were restored.
+
+        Raises:
+            ErrorRunningTool: There was an error whilst running the linter.
+            Silencer.MultipleRulesViolated: Violations of more than one rule were
+                found.
+        """
+        silencer = silencing.Silencer(
+            cast(silencing.Linter, self.linter), files=self.files,
+        )
+        try:
+            findings = silencer.find_violations(
+                rule_name=rule_name, file_names=filenames, fingerprint=False,
+            )
+        except silencer.NoViolationsFound:
+            return []
+
+        return [
+            filename for filename in findings.violations
+            if filename in self.undo_log
+            and self.undo_log.restore(filename, self.files)
+        ]
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from typing import TextIO
+
+import attrs
+
+from silence_lint_error.silencing import ViolationSet
+
+
+@attrs.frozen
+class Progress:
+    """The progress of a run, as recorded in a journal."""
+
+    linter_name: str
+    rule_name: str
+    # the paths given to the run
+    paths: list[str]
+    violations: ViolationSet
+    # file name -> whether the file was changed
+    done: dict[str, bool]
+    # whether the run finished
+    complete: bool = False
+
+
+class Journal:
+    """A record of the progress of a run, so that it can be resumed.
+
+    The journal is a file of JSON lines. The first line records the paths given
+    and the violations that were found, and each subsequent line records a file
+    that has been finished. Lines are flushed as soon as they are written, so the
+    journal is complete up to the last file that was finished if the run is
+    killed. A final line records that the run finished, so it is not resumed.
+    """
+
+    @attrs.frozen
+    class Mismatch(Exception):
+        """The journal was written by a run for a different linter, rule or paths."""
+
+        linter_name: str
+        rule_name: str
+        paths: list[str]
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: TextIO | None = None
+
+    def load(
+            self, *, linter_name: str, rule_name: str, paths: Sequence[str],
+    ) -> Progress | None:
+        """Load the progress of an unfinished previous run from the journal.
+
+        Returns:
+            The progress of the previous run, or `None` if there was no previous
+            run (or it did not finish finding violations, or it finished).
+
+        Raises:
+            Mismatch: The journal is for a run with another linter, rule or paths.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        progress = self.read()
+        if progress is None or progress.complete:
+            return None
+        if (progress.linter_name, progress.rule_name, progress.paths) != (
+                linter_name, rule_name, list(paths),
+        ):
+            raise self.Mismatch(
+                progress.linter_name, progress.rule_name, progress.paths,
+            )
+
+        return progress
+
+    def read(self) -> Progress | None:
+        """Read the progress recorded in the journal.
+
+        Returns:
+            The recorded progress, or `None` if the run did not finish finding
+            violations.
+        """
+        with open(self.path, encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                return None
+
+            done = {}
+            complete = False
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # the run was killed whilst writing this line
+                if record.get('complete'):
+                    complete = True
+                else:
+                    done[record['done']] = record['changed']
+
+        return Progress(
+            linter_name=header['linter'],
+            rule_name=header['rule_name'],
+            paths=header['paths'],
+            violations=ViolationSet.from_json(header['violations']),
+            done=done,
+            complete=complete,
+        )
+
+    def start(
+            self, *, linter_name: str, rule_name: str, paths: Sequence[str],
+            violations: ViolationSet,
+    ) -> None:
+        """Start a new journal, recording the paths given and violations found."""
+        self.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'linter': linter_name,
+            'rule_name': rule_name,
+            'paths': list(paths),
+            'violations': violations.to_json(),
+        })
+
+    def resume(self) -> None:
+        """Continue writing to an existing journal."""
+        self.close()
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+            interrupted = f.read(1) not in (b'', b'\n')
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if interrupted:
+            # finish the partial line, so it doesn't corrupt the next record
+            self._file.write('\n')
+
+    def record(self, filename: str, *, changed: bool) -> None:
+        """Record that a file has been finished."""
+        self._write({'done': filename, 'changed': changed})
+
+    def finish(self) -> None:
+        """Record that the run finished, so that it is not resumed."""
+        self._write({'complete': True})
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: object) -> None:
+        assert self._file is not None, 'journal has not been started'
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import os
 import re
 import subprocess
-from collections import defaultdict
-from collections.abc import Iterator
+import tempfile
+from collections.abc import Iterable
 from collections.abc import Sequence
+from typing import TextIO
 from typing import TYPE_CHECKING
 
 from silence_lint_error import comments
+from silence_lint_error import edits
+from silence_lint_error import preflight
+from silence_lint_error import sources
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import StreamedProcess
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -20,13 +27,20 @@ if TYPE_CHECKING:
 
 class Fixit:
     name = 'fixit'
+    alternative = 'fixit-inline'
+    # the files which configure fixit, and the section that does so in each
+    config_files = (
+        ('fixit.toml', 'tool.fixit'),
+        ('pyproject.toml', 'tool.fixit'),
+    )
 
     def __init__(self) -> None:
         self.error_line_re = re.compile(r'^.*?@\d+:\d+ ')
 
     def find_violations(
         self, rule_name: RuleName, filenames: Sequence[FileName],
-    ) -> dict[FileName, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         proc = subprocess.run(
             (
                 'fixit',
@@ -35,18 +49,75 @@ class Fixit:
             ),
             capture_output=True,
             text=True,
+            timeout=timeout,
+            cwd=cwd,
         )
 
         if proc.returncode and proc.stderr.endswith('No module named fixit\n'):
             raise ErrorRunningTool(proc)
 
+        return self._collect(proc.stdout.splitlines())
+
+    def version(self) -> str:
+        return preflight.tool_version('fixit')
+
+    def check_rule(self, rule_name: RuleName) -> None:
+        # fixit only warns about rules it cannot load, and then finds no errors,
+        # so lint an empty file and look for the warning
+        with tempfile.TemporaryDirectory() as tmpdir:
+            empty = os.path.join(tmpdir, 'empty.py')
+            sources.write_source(empty, '', 'utf-8')
+            proc = subprocess.run(
+                ('fixit', '--rules', rule_name, 'lint', empty),
+                capture_output=True, text=True,
+            )
+
+        match = re.search(r'Failed to load rules .*?: (.*)', proc.stderr)
+        if match:
+            raise preflight.UnknownRule(rule_name, match[1])
+        if proc.returncode and proc.stderr.endswith('No module named fixit\n'):
+            raise ErrorRunningTool(proc)
+
+    def survey(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        # rules can only be selected by module, so use the configured rules if
+        # there is no prefix
+        run = StreamedProcess((
+            'fixit',
+            *(('--rules', rule_prefix) if rule_prefix else ()),
+            'lint', *filenames,
+        ))
+        with run as output:
+            violations = self._collect(line.rstrip('\n') for line in output)
+
+        if run.proc.returncode and run.proc.stderr.endswith(
+                'No module named fixit\n',
+        ):
+            raise ErrorRunningTool(run.proc)
+
+        return violations
+
+    def read_report(self, rule_name: RuleName, report: TextIO) -> ViolationSet:
+        # rules may be given as a module (which contains many rules) or a
+        # `module:RuleName` reference to one rule
+        __, __, rule_id = rule_name.rpartition(':')
+        return self._collect(
+            (line.rstrip('\n') for line in report),
+            rule_id=rule_id if ':' in rule_name else None,
+        )
+
+    def _collect(
+            self, lines: Iterable[str], rule_id: str | None = None,
+    ) -> ViolationSet:
         # extract filenames and line numbers
-        results: dict[str, list[Violation]] = defaultdict(list)
-        for line in proc.stdout.splitlines():
+        results = ViolationSet()
+        for line in lines:
             found_error = self._parse_output_line(line)
             if found_error:
                 filename, violation = found_error
-                results[filename].append(violation)
+                if rule_id is None or violation.rule_name == rule_id:
+                    results.add(filename, violation.rule_name, violation.lineno)
             else:  # pragma: no cover
                 pass
 
@@ -71,41 +142,39 @@ class Fixit:
         [rule_name] = {violation.rule_name for violation in violations}
         linenos_to_silence = {violation.lineno for violation in violations}
 
-        lines = src.splitlines(keepends=True)
-
-        new_lines = []
-        for current_lineno, line in enumerate(lines, start=1):
-            if current_lineno in linenos_to_silence:
-                leading_ws = line.removesuffix(line.lstrip())
-                new_lines.append(f'{leading_ws}# lint-fixme: {rule_name}\n')
-            new_lines.append(line)
+        plan = edits.EditPlan(src)
+        for lineno in sorted(linenos_to_silence):
+            if not 1 <= lineno <= len(plan):  # e.g. from a stale report
+                continue
+            line = plan.line(lineno)
+            leading_ws = line.removesuffix(line.lstrip())
+            newline = sources.line_ending(line)
+            plan.insert(lineno, f'{leading_ws}# lint-fixme: {rule_name}{newline}')
 
-        return ''.join(new_lines)
+        return plan.apply()
 
     def remove_silence_comments(self, src: str, rule_name: RuleName) -> str:
-        return ''.join(
-            self._remove_comments(
-                src.splitlines(keepends=True), rule_name,
-            ),
-        )
-
-    def _remove_comments(
-            self, lines: Sequence[str], rule_name: RuleName,
-    ) -> Iterator[str]:
         __, rule_id = rule_name.rsplit(':', maxsplit=1)
         fixme_comment = f'# lint-fixme: {rule_id}'
-        for line in lines:
+
+        plan = edits.EditPlan(src)
+        linenos = {
+            plan.lineno_at(match.start())
+            for match in re.finditer(re.escape(fixme_comment), src)
+        }
+        for lineno in linenos:
+            line = plan.line(lineno)
             if line.strip() == fixme_comment:  # fixme comment only
-                continue
+                plan.replace(lineno, '')
             elif line.rstrip().endswith(fixme_comment):  # code then fixme comment
                 trailing_ws = line.removeprefix(line.rstrip())
                 line_without_comment = (
                     line.rstrip().removesuffix(fixme_comment)  # remove comment
                     .rstrip()  # and remove any intermediate ws
                 )
-                yield line_without_comment + trailing_ws
-            else:
-                yield line
+                plan.replace(lineno, line_without_comment + trailing_ws)
+
+        return plan.apply()
 
     def apply_fixes(
             self, rule_name: RuleName, filenames: Sequence[str],
@@ -132,6 +201,8 @@ class FixitInline(Fixit):
     ensure it is respected (e.g. for decorators).
     """
 
+    alternative = 'fixit'
+
     def silence_violations(
         self, src: str, violations: Sequence[Violation],
     ) -> str:
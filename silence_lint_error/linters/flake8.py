@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import fnmatch
+import importlib.metadata
+import os
+import re
 import subprocess
-from collections import defaultdict
 from collections.abc import Sequence
+from typing import TextIO
 from typing import TYPE_CHECKING
 
 from silence_lint_error import comments
+from silence_lint_error import configs
+from silence_lint_error import files
+from silence_lint_error import preflight
+from silence_lint_error import pruning
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import StreamedProcess
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -18,10 +28,28 @@ if TYPE_CHECKING:
 
 class Flake8:
     name = 'flake8'
+    # the files which configure flake8, and the section that does so in each
+    config_files = (
+        ('setup.cfg', 'flake8'),
+        ('tox.ini', 'flake8'),
+        ('.flake8', 'flake8'),
+    )
+
+    # the default output format, e.g. `t.py:1:1: F401 'os' imported but unused`
+    report_line_re = re.compile(r'^(?P<path>.+?):(?P<row>\d+):\d+: (?P<code>\w+) ')
+    # an entry of the `per-file-ignores` option, e.g. `tests/*:E501,F401`
+    per_file_ignore_re = re.compile(
+        r'(?P<pattern>[^\s:,]+)[ \t]*:[ \t]*(?P<codes>\w+(?:[ \t]*,[ \t]*\w+)*)',
+    )
+    # the codes (and prefixes of codes) which flake8 allows plugins to report
+    code_re = re.compile(r'^[A-Z]{1,3}[0-9]{0,3}$')
+    # the prefixes of the codes reported by the checks that come with flake8
+    builtin_code_prefixes = ('C90', 'E', 'F', 'W')
 
     def find_violations(
         self, rule_name: RuleName, filenames: Sequence[FileName],
-    ) -> dict[FileName, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         proc = subprocess.run(
             (
                 'flake8',
@@ -31,16 +59,221 @@ class Flake8:
             ),
             capture_output=True,
             text=True,
+            timeout=timeout,
+            cwd=cwd,
         )
 
         if proc.returncode and proc.stderr.endswith('No module named flake8\n'):
             raise ErrorRunningTool(proc)
 
+        return self._collect(rule_name, proc.stdout)
+
+    def find_violations_in_source(
+        self, rule_name: RuleName, src: str, filename: FileName,
+    ) -> ViolationSet:
+        proc = subprocess.run(
+            (
+                'flake8',
+                '--select', rule_name,
+                '--format', '%(path)s %(row)s',
+                '--stdin-display-name', filename,
+                '-',
+            ),
+            input=src,
+            capture_output=True,
+            encoding='utf-8',
+        )
+
+        if proc.returncode and proc.stderr.endswith('No module named flake8\n'):
+            raise ErrorRunningTool(proc)
+
+        return self._collect(rule_name, proc.stdout)
+
+    def _collect(self, rule_name: RuleName, output: str) -> ViolationSet:
         # extract filenames and line numbers
-        results: dict[FileName, list[Violation]] = defaultdict(list)
-        for line in proc.stdout.splitlines():
+        results = ViolationSet()
+        for line in output.splitlines():
             filename_, lineno_ = line.rsplit(maxsplit=1)
-            results[filename_].append(Violation(rule_name, int(lineno_)))
+            results.add(filename_, rule_name, int(lineno_))
+
+        return results
+
+    def version(self) -> str:
+        return preflight.tool_version('flake8')
+
+    def check_rule(self, rule_name: RuleName) -> None:
+        # flake8 does not say which codes its plugins report, and selecting any
+        # other code just finds no errors, so only the form of the code is checked
+        if not self.code_re.match(rule_name):
+            raise preflight.UnknownRule(
+                rule_name,
+                'flake8 codes are 1-3 capital letters followed by up to 3 digits',
+            )
+
+    def survey(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        run = StreamedProcess((
+            'flake8',
+            *(('--select', rule_prefix) if rule_prefix else ()),
+            *filenames,
+        ))
+        with run as output:
+            results = ViolationSet()
+            for line in output:
+                match = self.report_line_re.match(line)
+                if match:
+                    results.add(match['path'], match['code'], int(match['row']))
+
+        if run.proc.returncode and run.proc.stderr.endswith(
+                'No module named flake8\n',
+        ):
+            raise ErrorRunningTool(run.proc)
+
+        return results
+
+    def find_unused_silences(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        filenames = list(files.discover(filenames))
+        proc = subprocess.run(
+            (
+                'flake8', '--disable-noqa',
+                *(('--select', rule_prefix) if rule_prefix else ()),
+                *filenames,
+            ),
+            capture_output=True,
+            text=True,
+        )
+
+        if proc.returncode and proc.stderr.endswith('No module named flake8\n'):
+            raise ErrorRunningTool(proc)
+
+        reported: dict[str, dict[int, set[str]]] = {}
+        for line in proc.stdout.splitlines():
+            match = self.report_line_re.match(line)
+            if match:
+                reported.setdefault(match['path'], {}).setdefault(
+                    int(match['row']), set(),
+                ).add(match['code'])
+
+        known_prefixes = self._known_code_prefixes()
+        return pruning.find_unused_codes(
+            filenames, 'noqa', reported, rule_prefix=rule_prefix,
+            # `noqa` codes are prefixes of the codes they silence
+            silences=lambda code, reported_code: reported_code.startswith(code),
+            # e.g. `RUF012`, which is for ruff
+            knows=lambda code: code.startswith(known_prefixes),
+        )
+
+    def _known_code_prefixes(self) -> tuple[str, ...]:
+        # Plugins name their entry points after the prefix of the codes they
+        # report. Only plugins installed alongside this tool are found, so codes
+        # for other plugins are left alone.
+        return (
+            *self.builtin_code_prefixes,
+            *(
+                entry_point.name
+                for entry_point in importlib.metadata.entry_points(
+                    group='flake8.extension',
+                )
+            ),
+        )
+
+    def silence_in_config(
+        self, rule_name: RuleName, filenames: Sequence[FileName], root: str,
+    ) -> str | None:
+        path = configs.find_config(root, self.config_files) or os.path.join(
+            root, '.flake8',
+        )
+
+        # `*` also matches `/`, so `dir/*` matches every file under `dir`
+        patterns = {
+            (f'{grouped}*' if grouped.endswith('/') else grouped): grouped
+            for grouped in configs.group_paths(filenames, root)
+        }
+
+        text = new_text = configs.read_config(path)
+        section = configs.find_section(new_text, ('flake8',))
+        if section is None:
+            new_text = configs.append_section(new_text, '[flake8]', [])
+            section = configs.find_section(new_text, ('flake8',))
+            assert section is not None
+
+        option = configs.ini_find_option(
+            new_text[section.start:section.end], 'per-file-ignores',
+        )
+        if option is None:
+            new_text = configs.insert_in_section(new_text, section, [
+                'per-file-ignores =',
+                *(f'    {pattern}:{rule_name}' for pattern in patterns),
+            ])
+        else:
+            start, end = option.span('value')
+            value = option['value']
+
+            # flake8 only applies the longest pattern which matches a file, so
+            # longer patterns which match any of the files must silence the rule
+            # as well
+            relpaths = [
+                os.path.relpath(filename, root).replace(os.sep, '/')
+                for filename in filenames
+            ]
+
+            def own_pattern(relpath: str) -> str:
+                return next(
+                    pattern for pattern, grouped in patterns.items()
+                    if relpath == grouped or (
+                        grouped.endswith('/') and relpath.startswith(grouped)
+                    )
+                )
+
+            entries = list(self.per_file_ignore_re.finditer(value))
+            for entry in reversed(entries):
+                pattern = entry['pattern']
+                if pattern in patterns or any(
+                        self._matches(pattern, relpath)
+                        and len(pattern) >= len(own_pattern(relpath))
+                        for relpath in relpaths
+                ):
+                    codes = re.split(r'[ \t]*,[ \t]*', entry['codes'])
+                    if rule_name not in codes:
+                        value = (
+                            f'{value[:entry.end("codes")]},{rule_name}'
+                            f'{value[entry.end("codes"):]}'
+                        )
+
+            existing = {entry['pattern'] for entry in entries}
+            indent = re.search(r'\n([ \t]+)', value)
+            for pattern in patterns:
+                if pattern not in existing:
+                    value += (
+                        f'{configs.newline(text)}{indent[1] if indent else "    "}'
+                        f'{pattern}:{rule_name}'
+                    )
+            new_text = (
+                f'{new_text[:section.start + start]}{value}'
+                f'{new_text[section.start + end:]}'
+            )
+
+        if new_text == text:
+            return None
+        configs.write_config(path, new_text)
+        return path
+
+    @staticmethod
+    def _matches(pattern: str, relpath: str) -> bool:
+        # like flake8, match the file name or the path from the config directory
+        return fnmatch.fnmatch(os.path.basename(relpath), pattern) or (
+            fnmatch.fnmatch(relpath, pattern.removeprefix('./'))
+        )
+
+    def read_report(self, rule_name: RuleName, report: TextIO) -> ViolationSet:
+        results = ViolationSet()
+        for line in report:
+            match = self.report_line_re.match(line)
+            if match and match['code'].startswith(rule_name):
+                results.add(match['path'], rule_name, int(match['row']))
 
         return results
 
@@ -50,3 +283,10 @@ class Flake8:
         [rule_name] = {violation.rule_name for violation in violations}
         linenos_to_silence = {violation.lineno for violation in violations}
         return comments.add_noqa_comments(src, linenos_to_silence, rule_name)
+
+    def remove_unused_silences(
+        self, src: str, unused: Sequence[Violation],
+    ) -> str:
+        return comments.remove_codes_from_comments(
+            src, 'noqa', pruning.codes_by_line(unused),
+        )
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import os
+import re
 import subprocess
-from collections import defaultdict
+import tempfile
+from collections.abc import Callable
+from collections.abc import Iterable
 from collections.abc import Sequence
+from typing import TextIO
 from typing import TYPE_CHECKING
 
 import tokenize_rt
 
+from silence_lint_error import comments
+from silence_lint_error import configs
+from silence_lint_error import preflight
+from silence_lint_error import pruning
+from silence_lint_error import sources
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import StreamedProcess
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -19,10 +31,26 @@ if TYPE_CHECKING:
 
 class Mypy:
     name = 'mypy'
+    # the files which configure mypy, and the section that does so in each
+    config_files = (
+        ('mypy.ini', 'mypy'),
+        ('.mypy.ini', 'mypy'),
+        ('pyproject.toml', 'tool.mypy'),
+        ('setup.cfg', 'mypy'),
+    )
+    error_line_re = re.compile(
+        r'^(?P<path>.+?):(?P<row>\d+):(?:\d+:)? error: .*\[(?P<code>[\w-]+)\]$',
+    )
+    unused_ignore_re = re.compile(
+        r'^(?P<path>.+?):(?P<row>\d+):(?:\d+:)? error: '
+        r'Unused "type: ignore(?:\[(?P<codes>[^\]]*)\])?" comment',
+    )
+    ignore_codes_re = re.compile(r'type:\s*ignore\[(?P<codes>[^\]]*)\]')
 
     def find_violations(
         self, rule_name: RuleName, filenames: Sequence[FileName],
-    ) -> dict[FileName, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         proc = subprocess.run(
             (
                 'mypy',
@@ -33,21 +61,285 @@ class Mypy:
             ),
             capture_output=True,
             text=True,
+            timeout=timeout,
+            cwd=cwd,
         )
 
         if proc.returncode > 1:
             raise ErrorRunningTool(proc)
 
+        return self._collect(rule_name, proc.stdout.splitlines())
+
+    def find_violations_in_source(
+        self, rule_name: RuleName, src: str, filename: FileName,
+    ) -> ViolationSet:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shadow = os.path.join(tmpdir, os.path.basename(filename))
+            sources.write_source(shadow, src, 'utf-8')
+            # mypy reads the source from the shadow file in place of the file,
+            # which must exist. New files are checked on their own.
+            if os.path.isfile(filename):
+                targets: tuple[str, ...] = ('--shadow-file', filename, shadow, filename)
+            else:
+                targets = (shadow,)
+            proc = subprocess.run(
+                (
+                    'mypy',
+                    '--follow-imports', 'silent',  # do not report errors in other modules
+                    '--enable-error-code', rule_name,
+                    '--show-error-codes', '--no-pretty', '--no-error-summary',
+                    *targets,
+                ),
+                capture_output=True,
+                text=True,
+            )
+
+        if proc.returncode > 1:
+            raise ErrorRunningTool(proc)
+
+        return self._collect(rule_name, proc.stdout.splitlines())
+
+    def version(self) -> str:
+        return preflight.tool_version('mypy')
+
+    def check_rule(self, rule_name: RuleName) -> None:
+        # mypy rejects unknown error codes (including those from plugins in the
+        # config) before checking anything, so check an empty module
+        with tempfile.TemporaryDirectory() as tmpdir:
+            empty = os.path.join(tmpdir, 'empty.py')
+            sources.write_source(empty, '', 'utf-8')
+            proc = subprocess.run(
+                ('mypy', '--enable-error-code', rule_name, '--no-error-summary', empty),
+                capture_output=True, text=True,
+            )
+        if proc.returncode > 1:
+            match = re.search(r'error: (Invalid error code.*)', proc.stderr)
+            if match:
+                raise preflight.UnknownRule(rule_name, match[1])
+            raise ErrorRunningTool(proc)
+
+    def survey(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        run = StreamedProcess((
+            'mypy',
+            '--follow-imports', 'silent',  # do not report errors in other modules
+            '--show-error-codes', '--no-pretty', '--no-error-summary',
+            *filenames,
+        ))
+        with run as output:
+            results = ViolationSet()
+            for line in output:
+                match = self.error_line_re.match(line.rstrip())
+                if match and match['code'].startswith(rule_prefix):
+                    results.add(match['path'], match['code'], int(match['row']))
+
+        if run.proc.returncode > 1:
+            raise ErrorRunningTool(run.proc)
+
+        return results
+
+    def find_unused_silences(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        run = StreamedProcess((
+            'mypy',
+            '--follow-imports', 'silent',  # do not report errors in other modules
+            '--warn-unused-ignores',
+            '--show-error-codes', '--no-pretty', '--no-error-summary',
+            *filenames,
+        ))
+        with run as output:
+            unused: list[tuple[str, int, str | None]] = []
+            for line in output:
+                match = self.unused_ignore_re.match(line.rstrip())
+                if match:
+                    unused.append((match['path'], int(match['row']), match['codes']))
+
+        if run.proc.returncode > 1:
+            raise ErrorRunningTool(run.proc)
+
+        results = ViolationSet()
+        lines_by_file: dict[str, list[str]] = {}
+        for path, lineno, codes in unused:
+            if codes is None:
+                # mypy does not list the codes when none of them are used, so
+                # read them from the comment. Blanket `type: ignore` comments
+                # are left alone, since they do not say which errors they were
+                # meant to silence.
+                if path not in lines_by_file:
+                    lines_by_file[path] = sources.read_source(path)[0].splitlines()
+                match = self.ignore_codes_re.search(lines_by_file[path][lineno - 1])
+                if match is None:
+                    continue
+                codes = match['codes']
+
+            for code in re.split(r',\s*', codes.strip()):
+                if code.startswith(rule_prefix):
+                    results.add(path, code, lineno)
+
+        return results
+
+    def silence_in_config(
+        self, rule_name: RuleName, filenames: Sequence[FileName], root: str,
+    ) -> str | None:
+        path = configs.find_config(root, self.config_files)
+        if path is None:
+            pyproject = os.path.join(root, 'pyproject.toml')
+            path = pyproject if os.path.isfile(pyproject) else os.path.join(
+                root, 'mypy.ini',
+            )
+
+        def is_package(directory: str) -> bool:
+            return os.path.isfile(os.path.join(root, directory, '__init__.py'))
+
+        modules = [
+            module
+            for grouped in configs.group_paths(filenames, root, can_group=is_package)
+            if (module := self._module_name(grouped, is_package))
+        ]
+
+        text = configs.read_config(path)
+        if path.endswith('.toml'):
+            new_text = self._silence_in_toml(text, path, rule_name, modules)
+        else:
+            new_text = self._silence_in_ini(text, rule_name, modules)
+
+        if new_text == text:
+            return None
+        configs.write_config(path, new_text)
+        return path
+
+    @staticmethod
+    def _module_name(path: str, is_package: Callable[[str], bool]) -> str:
+        # Like mypy, the module name includes the directories above the module
+        # which are packages. Directories end with `/`, and include submodules.
+        directories = path.rstrip('/').split('/')
+        if path.endswith('/'):
+            name = '*'
+        else:
+            *directories, filename = directories
+            name, __ = os.path.splitext(filename)
+
+        top = len(directories)
+        while top and is_package('/'.join(directories[:top])):
+            top -= 1
+        parts = directories[top:]
+        if name != '__init__':
+            parts.append(name)
+        return '.'.join(parts)
+
+    # mypy does not allow a module to be in more than one override (or section)
+    # with different values, so the rule is silenced in the overrides which
+    # already include the modules. Modules are moved out of overrides which also
+    # include other modules, to a copy of the override.
+
+    @staticmethod
+    def _silence_in_toml(
+            text: str, path: str, rule_name: RuleName, modules: Sequence[str],
+    ) -> str:
+        if re.search(r'^[ \t]*(?:[\w.-]+\.)?overrides[ \t]*=', text, re.M):
+            raise configs.CannotEditConfig(path, 'overrides are not tables')
+
+        header = '[[tool.mypy.overrides]]'
+        remaining = list(modules)
+        # from the end, so that editing a section does not move the others
+        for section in reversed(configs.sections(text)):
+            if section.header != header:
+                continue
+            match = configs.toml_find_array(
+                text[section.start:section.end], 'module',
+            )
+            if match is None:
+                continue
+            overridden = configs.toml_items(match)
+            silenced = [module for module in overridden if module in remaining]
+            if not silenced:
+                continue
+
+            remaining = [module for module in remaining if module not in silenced]
+            if len(silenced) < len(overridden):
+                text = configs.copy_section(text, section, header)
+                copy = configs.sections(text)[-1]
+                text = configs.toml_set_array(text, copy, 'module', silenced)
+                text = configs.toml_add_to_array(
+                    text, configs.sections(text)[-1],
+                    'disable_error_code', [rule_name],
+                )
+                text = configs.toml_set_array(
+                    text, section, 'module',
+                    [module for module in overridden if module not in silenced],
+                )
+            else:
+                text = configs.toml_add_to_array(
+                    text, section, 'disable_error_code', [rule_name],
+                )
+
+        if remaining:
+            text = configs.append_section(text, header, [
+                f'module = {configs.toml_array(remaining)}',
+                f'disable_error_code = {configs.toml_array([rule_name])}',
+            ])
+        return text
+
+    @staticmethod
+    def _silence_in_ini(
+            text: str, rule_name: RuleName, modules: Sequence[str],
+    ) -> str:
+        if not text.strip():
+            text = configs.append_section(text, '[mypy]', [])
+
+        remaining = list(modules)
+        # from the end, so that editing a section does not move the others
+        for section in reversed(configs.sections(text)):
+            if not section.name.startswith('mypy-'):
+                continue
+            overridden = [
+                module.strip()
+                for module in section.name.removeprefix('mypy-').split(',')
+            ]
+            silenced = [module for module in overridden if module in remaining]
+            if not silenced:
+                continue
+
+            remaining = [module for module in remaining if module not in silenced]
+            if len(silenced) < len(overridden):
+                text = configs.copy_section(
+                    text, section, f'[mypy-{",".join(silenced)}]',
+                )
+                text = configs.ini_add_to_list(
+                    text, configs.sections(text)[-1],
+                    'disable_error_code', [rule_name],
+                )
+                text = configs.replace_header(text, section, '[mypy-{}]'.format(
+                    ','.join(module for module in overridden if module not in silenced),
+                ))
+            else:
+                text = configs.ini_add_to_list(
+                    text, section, 'disable_error_code', [rule_name],
+                )
+
+        if remaining:
+            text = configs.append_section(
+                text, f'[mypy-{",".join(remaining)}]',
+                [f'disable_error_code = {rule_name}'],
+            )
+        return text
+
+    def read_report(self, rule_name: RuleName, report: TextIO) -> ViolationSet:
+        return self._collect(rule_name, (line.rstrip() for line in report))
+
+    def _collect(self, rule_name: RuleName, lines: Iterable[str]) -> ViolationSet:
         # extract filenames and line numbers
-        results: dict[FileName, list[Violation]] = defaultdict(list)
-        for line in proc.stdout.splitlines():
+        results = ViolationSet()
+        for line in lines:
             if not line.endswith(f'[{rule_name}]'):
                 continue
 
             location, *__ = line.split()
             filename_, lineno_, *__ = location.split(':')
 
-            results[filename_].append(Violation(rule_name, int(lineno_)))
+            results.add(filename_, rule_name, int(lineno_))
 
         return results
 
@@ -89,3 +381,45 @@ class Mypy:
         return tokenize_rt.tokens_to_src(tokens)  # type: ignore[no-any-return]
         # tokenize-rt is a single-file distribution so cannot provide type
         # information. See https://github.com/asottile/tokenize-rt/issues/147.
+
+    def silence_file(self, src: str, rule_name: RuleName) -> str:
+        return comments.add_file_level_comment(
+            src, f'# mypy: disable-error-code="{rule_name}"',
+        )
+
+    def remove_unused_silences(
+        self, src: str, unused: Sequence[Violation],
+    ) -> str:
+        codes_by_line = pruning.codes_by_line(unused)
+
+        def remove_codes(match: re.Match[str], codes: set[str]) -> str:
+            remaining = [
+                code for code in re.split(r',\s*', match['codes'])
+                if code not in codes
+            ]
+            if not remaining:
+                return ''
+            return f'type: ignore[{", ".join(remaining)}]'
+
+        tokens = tokenize_rt.src_to_tokens(src)
+        for idx, token in tokenize_rt.reversed_enumerate(tokens):
+            if token.name != 'COMMENT' or token.line not in codes_by_line:
+                continue
+
+            new_comment = self.ignore_codes_re.sub(
+                lambda match: remove_codes(match, codes_by_line[token.line]),
+                token.src,
+            )
+            # drop the comment if the `type: ignore` was all it held
+            new_comment = re.sub(r'#\s*(?=#|$)', '', new_comment).strip()
+            if new_comment:
+                tokens[idx] = token._replace(src=new_comment)
+                continue
+
+            del tokens[idx]
+            if idx and tokens[idx - 1].name == 'UNIMPORTANT_WS':
+                del tokens[idx - 1]
+
+        return tokenize_rt.tokens_to_src(tokens)  # type: ignore[no-any-return]
+        # tokenize-rt is a single-file distribution so cannot provide type
+        # information. See https://github.com/asottile/tokenize-rt/issues/147.
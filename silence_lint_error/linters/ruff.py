@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import itertools
 import json
+import os
+import re
 import subprocess
-from collections import defaultdict
+from collections.abc import Iterable
 from collections.abc import Sequence
+from typing import Any
+from typing import TextIO
 from typing import TYPE_CHECKING
 
 from silence_lint_error import comments
+from silence_lint_error import configs
+from silence_lint_error import preflight
+from silence_lint_error import pruning
+from silence_lint_error import reports
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import StreamedProcess
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -19,10 +30,20 @@ if TYPE_CHECKING:
 
 class Ruff:
     name = 'ruff'
+    # the files which configure ruff, and the section that does so in each
+    config_files = (
+        ('.ruff.toml', None),
+        ('ruff.toml', None),
+        ('pyproject.toml', 'tool.ruff'),
+    )
+
+    # e.g. "Unused `noqa` directive (unused: `F401`, `F841`; non-enabled: `E501`)"
+    unused_noqa_re = re.compile(r'\bunused: ([^;)]*)')
 
     def find_violations(
         self, rule_name: RuleName, filenames: Sequence[FileName],
-    ) -> dict[FileName, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         proc = subprocess.run(
             (
                 'ruff', 'check',
@@ -32,24 +53,141 @@ class Ruff:
             ),
             capture_output=True,
             text=True,
+            timeout=timeout,
+            cwd=cwd,
+        )
+
+        if proc.returncode and proc.stderr.endswith('No module named ruff\n'):
+            raise ErrorRunningTool(proc)
+
+        return self._collect(json.loads(proc.stdout))
+
+    def find_violations_in_source(
+        self, rule_name: RuleName, src: str, filename: FileName,
+    ) -> ViolationSet:
+        proc = subprocess.run(
+            (
+                'ruff', 'check',
+                '--select', rule_name,
+                '--output-format', 'json',
+                '--stdin-filename', filename,
+                '-',
+            ),
+            input=src,
+            capture_output=True,
+            encoding='utf-8',
         )
 
         if proc.returncode and proc.stderr.endswith('No module named ruff\n'):
             raise ErrorRunningTool(proc)
 
+        return self._collect(json.loads(proc.stdout))
+
+    def version(self) -> str:
+        return preflight.tool_version('ruff')
+
+    def check_rule(self, rule_name: RuleName) -> None:
+        # ruff rejects unknown rule selectors before checking any files
+        proc = subprocess.run(
+            ('ruff', 'check', '--select', rule_name, '--no-cache', '-'),
+            input='', capture_output=True, text=True,
+        )
+        if proc.returncode == 2:
+            if 'rule selector' in proc.stderr:
+                *__, cause = proc.stderr.strip().splitlines()
+                raise preflight.UnknownRule(
+                    rule_name, cause.strip().removeprefix('Cause: '),
+                )
+            raise ErrorRunningTool(proc)
+
+    def survey(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        run = StreamedProcess((
+            'ruff', 'check',
+            '--select', rule_prefix or 'ALL',
+            '--output-format', 'json-lines',
+            *filenames,
+        ))
+        with run as output:
+            violations = self._collect(
+                json.loads(line) for line in output if line.strip()
+            )
+
+        if run.proc.returncode and run.proc.stderr.endswith('No module named ruff\n'):
+            raise ErrorRunningTool(run.proc)
+
+        return violations
+
+    def find_unused_silences(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        # RUF100 reports unused `noqa` codes. Codes for rules which are not
+        # enabled are left alone, since they may be used by other tools.
+        run = StreamedProcess((
+            'ruff', 'check',
+            *(
+                ('--select', f'{rule_prefix},RUF100') if rule_prefix
+                else ('--extend-select', 'RUF100')
+            ),
+            '--output-format', 'json-lines',
+            *filenames,
+        ))
+        with run as output:
+            results = ViolationSet()
+            for line in output:
+                if not line.strip():
+                    continue
+                violation = json.loads(line)
+                if violation['code'] != 'RUF100':
+                    continue
+                match = self.unused_noqa_re.search(violation['message'])
+                if match is None:  # e.g. a blanket `noqa`
+                    continue
+                for code in re.findall(r'`([^`]+)`', match[1]):
+                    if code.startswith(rule_prefix):
+                        results.add(
+                            violation['filename'], code,
+                            violation['location']['row'],
+                        )
+
+        if run.proc.returncode and run.proc.stderr.endswith('No module named ruff\n'):
+            raise ErrorRunningTool(run.proc)
+
+        return results
+
+    def read_report(self, rule_name: RuleName, report: TextIO) -> ViolationSet:
+        # reports may be in the `json` or `json-lines` output format
+        first_line = report.readline()
+        if first_line.lstrip().startswith('['):
+            all_violations: Iterable[dict[str, Any]] = reports.iter_json(
+                itertools.chain([first_line], reports.read_chunks(report)),
+                ('*',),
+            )
+        else:
+            all_violations = (
+                json.loads(line)
+                for line in itertools.chain([first_line], report)
+                if line.strip()
+            )
+
+        return self._collect(
+            violation for violation in all_violations
+            if (violation['code'] or '').startswith(rule_name)
+        )
+
+    def _collect(self, all_violations: Iterable[dict[str, Any]]) -> ViolationSet:
         # extract filenames and line numbers
-        all_violations = json.loads(proc.stdout)
-        results: dict[FileName, list[Violation]] = defaultdict(list)
+        results = ViolationSet()
         for violation in all_violations:
             if violation['code'] in (None, 'invalid-syntax'):
                 # ignore syntax errors while parsing the file
                 continue
 
-            results[violation['filename']].append(
-                Violation(
-                    rule_name=violation['code'],
-                    lineno=violation['location']['row'],
-                ),
+            results.add(
+                violation['filename'],
+                rule_name=violation['code'],
+                lineno=violation['location']['row'],
             )
 
         return results
@@ -61,10 +199,74 @@ class Ruff:
         linenos_to_silence = {violation.lineno for violation in violations}
         return comments.add_noqa_comments(src, linenos_to_silence, rule_name)
 
+    def silence_file(self, src: str, rule_name: RuleName) -> str:
+        return comments.add_file_level_comment(src, f'# ruff: noqa: {rule_name}')
+
+    def silence_in_config(
+        self, rule_name: RuleName, filenames: Sequence[FileName], root: str,
+    ) -> str | None:
+        path = configs.find_config(root, self.config_files)
+        if path is None:
+            pyproject = os.path.join(root, 'pyproject.toml')
+            path = pyproject if os.path.isfile(pyproject) else os.path.join(
+                root, 'ruff.toml',
+            )
+        prefix = 'tool.ruff.' if os.path.basename(path) == 'pyproject.toml' else ''
+        tables = (f'{prefix}lint.per-file-ignores', f'{prefix}per-file-ignores')
+
+        text = configs.read_config(path)
+        # directories end with `/`
+        patterns = [
+            f'{grouped}**' if grouped.endswith('/') else grouped
+            for grouped in configs.group_paths(filenames, root)
+        ]
+        new_text = text
+        section = configs.find_section(new_text, tables)
+        if section is None:
+            if re.search(r'^[ \t]*(?:[\w.-]+\.)?per-file-ignores[ \t]*=', text, re.M):
+                raise configs.CannotEditConfig(
+                    path, 'per-file-ignores is not a table of its own',
+                )
+            new_text = configs.append_section(new_text, f'[{tables[0]}]', [])
+            section = configs.find_section(new_text, tables)
+            assert section is not None
+
+        new_patterns = []
+        for pattern in patterns:
+            if configs.toml_find_array(new_text[section.start:section.end], pattern):
+                new_text = configs.toml_add_to_array(
+                    new_text, section, pattern, [rule_name],
+                )
+                section = configs.find_section(new_text, tables)
+                assert section is not None
+            else:
+                new_patterns.append(pattern)
+        if new_patterns:
+            new_text = configs.insert_in_section(new_text, section, [
+                f'"{pattern}" = {configs.toml_array([rule_name])}'
+                for pattern in new_patterns
+            ])
+
+        if new_text == text:
+            return None
+        configs.write_config(path, new_text)
+        return path
+
+    def remove_unused_silences(
+        self, src: str, unused: Sequence[Violation],
+    ) -> str:
+        return comments.remove_codes_from_comments(
+            src, 'noqa', pruning.codes_by_line(unused),
+        )
+
     def remove_silence_comments(self, src: str, rule_name: RuleName) -> str:
-        return comments.remove_error_silencing_comments(
+        src = comments.remove_error_silencing_comments(
             src, comment_type='noqa', error_code=rule_name,
         )
+        # and the comment added by `silence_file`
+        return comments.remove_code_from_file_level_comments(
+            src, 'ruff: noqa', rule_name,
+        )
 
     def apply_fixes(
             self, rule_name: RuleName, filenames: Sequence[str],
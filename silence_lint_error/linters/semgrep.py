@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import json
 import subprocess
-from collections import defaultdict
+from collections.abc import Iterable
 from collections.abc import Sequence
+from typing import Any
+from typing import TextIO
 from typing import TYPE_CHECKING
 
 from silence_lint_error import comments
+from silence_lint_error import edits
+from silence_lint_error import files
+from silence_lint_error import preflight
+from silence_lint_error import pruning
+from silence_lint_error import reports
+from silence_lint_error import sources
 from silence_lint_error.silencing import ErrorRunningTool
 from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import StreamedProcess
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -19,10 +29,13 @@ if TYPE_CHECKING:
 
 class Semgrep:
     name = 'semgrep'
+    # the file of rules semgrep runs when it is not given any
+    config_files = (('.semgrep.yml', None),)
 
     def find_violations(
         self, rule_name: RuleName, filenames: Sequence[FileName],
-    ) -> dict[FileName, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         proc = subprocess.run(
             (
                 'semgrep', 'scan',
@@ -32,26 +45,126 @@ class Semgrep:
             ),
             capture_output=True,
             text=True,
+            timeout=timeout,
+            cwd=cwd,
         )
 
         if proc.returncode:
             raise ErrorRunningTool(proc)
 
+        return self._collect(rule_name, json.loads(proc.stdout)['results'])
+
+    def version(self) -> str:
+        # semgrep checks for a newer version online unless told not to
+        return preflight.tool_version(
+            'semgrep', env={'SEMGREP_ENABLE_VERSION_CHECK': '0'},
+        )
+
+    def check_rule(self, rule_name: RuleName) -> None:
+        # rules come from semgrep's config, so check that the config is valid.
+        # Rule IDs depend on where the config is, so they are not checked.
+        proc = subprocess.run(
+            ('semgrep', 'scan', '--metrics=off', '--oss-only', '--validate'),
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode:
+            raise ErrorRunningTool(proc)
+
+    def survey(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        run = StreamedProcess((
+            'semgrep', 'scan',
+            '--metrics=off', '--oss-only',
+            '--json',
+            *filenames,
+        ))
+        with run as output:
+            results = ViolationSet()
+            for result in reports.iter_json(
+                    reports.read_chunks(output), ('results', '*'),
+            ):
+                if result['check_id'].startswith(rule_prefix):
+                    results.add(
+                        result['path'],
+                        rule_name=result['check_id'],
+                        lineno=result['start']['line'],
+                    )
+
+        if run.proc.returncode:
+            raise ErrorRunningTool(run.proc)
+
+        return results
+
+    def find_unused_silences(
+        self, rule_prefix: RuleName, filenames: Sequence[FileName],
+    ) -> ViolationSet:
+        filenames = list(files.discover(filenames))
+        proc = subprocess.run(
+            (
+                'semgrep', 'scan',
+                '--metrics=off', '--oss-only',
+                '--disable-nosem',
+                # to list the rules which were run
+                '--time',
+                '--json',
+                *filenames,
+            ),
+            capture_output=True,
+            text=True,
+        )
+
+        if proc.returncode:
+            raise ErrorRunningTool(proc)
+
+        output = json.loads(proc.stdout)
+        reported: dict[str, dict[int, set[str]]] = {}
+        for result in output['results']:
+            reported.setdefault(result['path'], {}).setdefault(
+                result['start']['line'], set(),
+            ).add(result['check_id'])
+        # e.g. `["python.lang.no-print"]`, or `[{"id": ...}]` in older versions
+        rule_ids = [
+            rule if isinstance(rule, str) else rule['id']
+            for rule in output.get('time', {}).get('rules', ())
+        ]
+
+        def silences(code: str, check_id: str) -> bool:
+            # rule IDs may be qualified by the path of the config
+            return check_id == code or check_id.endswith(f'.{code}')
+
+        return pruning.find_unused_codes(
+            filenames, 'nosemgrep', reported, rule_prefix=rule_prefix,
+            silences=silences,
+            # codes for rules which were not run may be for other configs
+            knows=lambda code: any(silences(code, rule_id) for rule_id in rule_ids),
+            # `nosemgrep` comments on their own line silence the next line
+            next_line=True,
+        )
+
+    def read_report(self, rule_name: RuleName, report: TextIO) -> ViolationSet:
+        return self._collect(
+            rule_name,
+            reports.iter_json(reports.read_chunks(report), ('results', '*')),
+        )
+
+    def _collect(
+            self, rule_name: RuleName, all_results: Iterable[dict[str, Any]],
+    ) -> ViolationSet:
         # extract filenames and line numbers
-        results: dict[FileName, list[Violation]] = defaultdict(list)
-        data = json.loads(proc.stdout)
-        for result in data['results']:
+        results = ViolationSet()
+        for result in all_results:
             if result['check_id'] != rule_name:
                 continue
 
-            results[result['path']].append(
-                Violation(
-                    rule_name=result['check_id'],
-                    lineno=result['start']['line'],
-                ),
+            results.add(
+                result['path'],
+                rule_name=result['check_id'],
+                lineno=result['start']['line'],
             )
 
-        return dict(results)
+        return results
 
     def silence_violations(
         self, src: str, violations: Sequence[Violation],
@@ -59,19 +172,29 @@ class Semgrep:
         [rule_name] = {violation.rule_name for violation in violations}
         linenos_to_silence = {violation.lineno for violation in violations}
 
-        lines = src.splitlines(keepends=True)
-
-        new_lines: list[str] = []
-        for current_lineno, line in enumerate(lines, start=1):
-            if current_lineno in linenos_to_silence:
-                previous_line = new_lines[-1]
-                if '# nosemgrep' in previous_line:
-                    new_lines[-1] = comments.add_code_to_comment(
+        plan = edits.EditPlan(src)
+        for lineno in sorted(linenos_to_silence):
+            if not 1 <= lineno <= len(plan):  # e.g. from a stale report
+                continue
+            line = plan.line(lineno)
+            previous_line = plan.line(lineno - 1) if lineno > 1 else ''
+            if '# nosemgrep' in previous_line:
+                plan.replace(
+                    lineno - 1,
+                    comments.add_code_to_comment(
                         previous_line, 'nosemgrep', code=rule_name, sep=' ',
-                    )
-                else:
-                    leading_ws = line.removesuffix(line.lstrip())
-                    new_lines.append(f'{leading_ws}# nosemgrep: {rule_name}\n')
-            new_lines.append(line)
+                    ),
+                )
+            else:
+                leading_ws = line.removesuffix(line.lstrip())
+                newline = sources.line_ending(line)
+                plan.insert(lineno, f'{leading_ws}# nosemgrep: {rule_name}{newline}')
+
+        return plan.apply()
 
-        return ''.join(new_lines)
+    def remove_unused_silences(
+        self, src: str, unused: Sequence[Violation],
+    ) -> str:
+        return comments.remove_codes_from_comments(
+            src, 'nosemgrep', pruning.codes_by_line(unused),
+        )
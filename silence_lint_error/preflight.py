@@ -0,0 +1,130 @@
+"""Check that a linter can run and knows a rule, before running it on any files.
+
+Linters are slow to run over a large repository, and some report a rule they do
+not know as "no errors". Linters which support it (with `version` and
+`check_rule` methods) are checked before they are run, so that a typo in a rule
+name fails straight away.
+
+Rules which pass are cached for each linter version and directory (since rules
+may come from plugins or config in the project), so that the check only costs a
+`--version` call on later runs. Rules which fail are not cached.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import subprocess
+from collections.abc import Mapping
+from typing import Any
+from typing import Protocol
+
+import attrs
+
+from silence_lint_error.silencing import ErrorRunningTool
+
+
+@attrs.frozen
+class LinterNotInstalled(Exception):
+    executable: str
+
+
+@attrs.frozen
+class UnknownRule(Exception):
+    rule_name: str
+    reason: str
+
+
+class Linter(Protocol):
+    name: str
+
+    def version(self) -> str:
+        """The version of the linter.
+
+        Raises:
+            LinterNotInstalled: The linter's executable cannot be found.
+            ErrorRunningTool: There was an error whilst running the linter.
+        """
+
+    def check_rule(self, rule_name: str) -> None:
+        """Check that the linter knows a rule, without checking any files.
+
+        Raises:
+            UnknownRule: The linter does not know the rule.
+            ErrorRunningTool: There was an error whilst running the linter.
+        """
+
+
+def tool_version(
+        executable: str, *, env: Mapping[str, str] | None = None,
+) -> str:
+    """Get the version of a tool from its `--version` output.
+
+    Raises:
+        LinterNotInstalled: The executable cannot be found.
+        ErrorRunningTool: The tool failed to report its version.
+    """
+    try:
+        proc = subprocess.run(
+            (executable, '--version'),
+            capture_output=True, text=True,
+            env={**os.environ, **env} if env else None,
+        )
+    except FileNotFoundError:
+        raise LinterNotInstalled(executable) from None
+
+    if proc.returncode:
+        raise ErrorRunningTool(proc)
+
+    return proc.stdout.strip()
+
+
+def default_cache_path() -> str:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'silence-lint-error', 'preflight.json')
+
+
+def check(
+        linter: Linter, rule_name: str, *, cache_path: str | None = None,
+) -> None:
+    """Check that a linter is installed and knows a rule.
+
+    Raises:
+        LinterNotInstalled: The linter's executable cannot be found.
+        UnknownRule: The linter does not know the rule.
+        ErrorRunningTool: There was an error whilst running the linter.
+    """
+    if cache_path is None:
+        cache_path = default_cache_path()
+
+    version = linter.version()
+    cache = _read_cache(cache_path)
+    # linter name -> directory -> the version and the rules that passed with it
+    entry = cache.setdefault(linter.name, {}).get(os.getcwd())
+    if not isinstance(entry, dict) or entry.get('version') != version:
+        entry = cache[linter.name][os.getcwd()] = {'version': version, 'rules': []}
+    if rule_name in entry['rules']:
+        return
+
+    linter.check_rule(rule_name)
+
+    entry['rules'].append(rule_name)
+    _write_cache(cache_path, cache)
+
+
+def _read_cache(path: str) -> dict[str, Any]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_cache(path: str, cache: dict[str, Any]) -> None:
+    # the cache only saves time, so failing to write it is not an error
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Callable
+from typing import TextIO
+
+# How often to update the progress, in seconds. A terminal is redrawn in place,
+# so it can be updated often; other output gets a new line each time.
+INTERACTIVE_INTERVAL = 0.1
+PLAIN_INTERVAL = 10.0
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f'{hours}:{minutes:02}:{seconds:02}'
+    return f'{minutes}:{seconds:02}'
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if n < 1024:
+            return f'{n:.1f} {unit}'
+        n /= 1024
+    return f'{n:.1f} GiB'
+
+
+class ProgressMeter:
+    """Report progress through the files in a phase of a run.
+
+    On a terminal, the progress is shown on a single line which is redrawn in
+    place. Otherwise, a line is written every `PLAIN_INTERVAL` seconds. Either
+    way, a summary is written when the phase finishes.
+
+    Updates are throttled, so advancing the meter is cheap enough to do for every
+    file.
+    """
+
+    def __init__(
+            self, phase: str, total: int, *,
+            stream: TextIO, interactive: bool,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.phase = phase
+        self.total = total
+        self.files = 0
+        self.bytes = 0
+        self._stream = stream
+        self._interactive = interactive
+        self._interval = INTERACTIVE_INTERVAL if interactive else PLAIN_INTERVAL
+        self._clock = clock
+        self._start = self._last_update = clock()
+        self._shown = False
+
+    @classmethod
+    def for_stderr(
+            cls, phase: str, total: int, *, enabled: bool | None,
+    ) -> ProgressMeter | None:
+        """Create a progress meter on stderr, if enabled.
+
+        By default (`enabled=None`), progress is only shown on a terminal.
+        """
+        interactive = sys.stderr.isatty()
+        if not (interactive if enabled is None else enabled):
+            return None
+
+        return cls(phase, total, stream=sys.stderr, interactive=interactive)
+
+    def advance(self, nbytes: int = 0) -> None:
+        """Record that a file (of `nbytes` bytes) has been processed."""
+        self.files += 1
+        self.bytes += nbytes
+
+        now = self._clock()
+        if (
+                (self._interactive and not self._shown)
+                or now - self._last_update >= self._interval
+        ):
+            self._last_update = now
+            self._show(self._status(now))
+
+    def clear(self) -> None:
+        """Remove the progress from a terminal, before writing something else."""
+        if self._interactive and self._shown:
+            self._stream.write('\r\033[K')
+            self._stream.flush()
+            self._shown = False
+
+    def finish(self) -> None:
+        """Write a summary of the phase."""
+        elapsed = self._clock() - self._start
+        self._show(
+            f'{self.phase}: {self.files}/{self.total} files '
+            f'in {_format_duration(elapsed)}{self._rates(elapsed)}',
+        )
+        if self._interactive:
+            self._stream.write('\n')
+            self._stream.flush()
+            self._shown = False
+
+    def _status(self, now: float) -> str:
+        elapsed = now - self._start
+        status = f'{self.phase}: {self.files}/{self.total} files'
+        if self.total:
+            status += f' ({self.files / self.total:.0%})'
+        status += self._rates(elapsed)
+        if self.files and self.files < self.total:
+            eta = elapsed / self.files * (self.total - self.files)
+            status += f', ETA {_format_duration(eta)}'
+        return status
+
+    def _rates(self, elapsed: float) -> str:
+        if elapsed <= 0:
+            return ''
+        return (
+            f', {self.files / elapsed:.0f} files/s'
+            f', {_format_bytes(self.bytes / elapsed)}/s'
+        )
+
+    def _show(self, status: str) -> None:
+        if self._interactive:
+            self._stream.write(f'\r\033[K{status}')
+            self._shown = True
+        else:
+            self._stream.write(f'{status}\n')
+        self._stream.flush()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Collection
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import Protocol
+
+import attrs
+
+from silence_lint_error import comments
+from silence_lint_error import sources
+from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+
+
+class Linter(Protocol):
+    name: str
+
+    def find_unused_silences(
+            self, rule_prefix: str, filenames: Sequence[str],
+    ) -> ViolationSet:
+        """Find error codes in comments which do not silence any errors.
+
+        The linter is run once, with the comments disabled or reported. Only codes
+        starting with `rule_prefix` are included.
+
+        Returns:
+            Mapping of file path to the unused codes, on the lines of the comments
+            which contain them.
+
+        Raises:
+            ErrorRunningTool: There was an error whilst running the linter.
+        """
+
+    def remove_unused_silences(
+            self, src: str, unused: Sequence[Violation],
+    ) -> str:
+        """Modify module source to remove unused codes from comments.
+
+        Returns:
+            Modified `src` without the `unused` codes, and without comments that
+            are left without any codes.
+        """
+
+
+def codes_by_line(unused: Sequence[Violation]) -> dict[int, set[str]]:
+    """Group unused codes by the line of the comment which contains them."""
+    codes: dict[int, set[str]] = {}
+    for violation in unused:
+        codes.setdefault(violation.lineno, set()).add(violation.rule_name)
+    return codes
+
+
+def find_unused_codes(
+        filenames: Iterable[str], comment_type: str,
+        reported: Mapping[str, Mapping[int, Collection[str]]], *,
+        rule_prefix: str,
+        silences: Callable[[str, str], bool],
+        knows: Callable[[str], bool],
+        next_line: bool = False,
+) -> ViolationSet:
+    """Find codes in comments which do not silence any of the reported errors.
+
+    This is for linters which can report errors with their comments disabled,
+    but cannot report unused comments themselves.
+
+    Args:
+        filenames: The files to search for comments.
+        comment_type: The type of comment (e.g. `noqa`).
+        reported: The codes of the errors reported on each line of each file.
+        rule_prefix: Only include codes which start with this prefix.
+        silences: Whether a code in a comment silences a reported code.
+        knows: Whether a code in a comment is for a rule the linter checked. Other
+            codes are left alone, since they may be used by other tools.
+        next_line: Whether comments also silence errors on the next line.
+
+    Returns:
+        Mapping of file path to the unused codes, on the lines of the comments.
+    """
+    unused = ViolationSet()
+    for filename in filenames:
+        src, __ = sources.read_source(filename)
+        file_reported = reported.get(filename, {})
+        for lines, codes in comments.find_silencing_comments(src, comment_type):
+            comment_lineno = lines[-1]
+            if next_line:
+                lines = range(lines.start, lines.stop + 1)
+            reported_codes = {
+                code for lineno in lines for code in file_reported.get(lineno, ())
+            }
+            for code in codes:
+                if code.startswith(rule_prefix) and knows(code) and not any(
+                        silences(code, reported_code)
+                        for reported_code in reported_codes
+                ):
+                    unused.add(filename, code, comment_lineno)
+
+    return unused
+
+
+@attrs.frozen
+class Pruner:
+    linter: Linter
+    files: sources.Files = attrs.field(factory=sources.DiskFiles)
+
+    def find_unused_silences(
+            self, *, rule_prefix: str, file_names: Sequence[str],
+    ) -> ViolationSet:
+        return self.linter.find_unused_silences(rule_prefix, file_names)
+
+    def prune(self, *, filename: str, unused: Sequence[Violation]) -> bool:
+        src, encoding = self.files.read(filename)
+
+        pruned_src = self.linter.remove_unused_silences(src, unused)
+
+        if pruned_src == src:
+            return False
+
+        self.files.write(filename, pruned_src, encoding)
+        return True
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import difflib
+import json
+from typing import Any
+from typing import TextIO
+
+from silence_lint_error import sources
+
+
+class RecordingFiles:
+    """Read and write modules with other `Files`, remembering the last change.
+
+    This is used to report how each file was changed.
+    """
+
+    def __init__(self, files: sources.Files) -> None:
+        self.files = files
+        self.src = ''
+        self.new_src: str | None = None
+        self.encoding = 'utf-8'
+
+    def read(self, filename: str) -> tuple[str, str]:
+        self.src, self.encoding = self.files.read(filename)
+        self.new_src = None
+        return self.src, self.encoding
+
+    def write(self, filename: str, src: str, encoding: str) -> None:
+        self.files.write(filename, src, encoding)
+        self.new_src = src
+
+    def bytes_changed(self) -> int:
+        """How much larger the last file read was made, in bytes."""
+        if self.new_src is None:
+            return 0
+        return (
+            len(self.new_src.encode(self.encoding))
+            - len(self.src.encode(self.encoding))
+        )
+
+    def changed_lines(self) -> list[int]:
+        """The lines of the last file read which were changed or removed."""
+        if self.new_src is None:
+            return []
+        lines = self.src.splitlines()
+        new_lines = self.new_src.splitlines()
+
+        # Diffing can take quadratic time, so only the lines between those which
+        # are the same at the start and end of the file are compared, and they
+        # are only diffed if lines were added or removed.
+        prefix = 0
+        shortest = min(len(lines), len(new_lines))
+        while prefix < shortest and lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+                suffix < shortest - prefix
+                and lines[-1 - suffix] == new_lines[-1 - suffix]
+        ):
+            suffix += 1
+        lines = lines[prefix:len(lines) - suffix]
+        new_lines = new_lines[prefix:len(new_lines) - suffix]
+
+        if len(lines) == len(new_lines):  # e.g. comments removed from lines
+            return [
+                prefix + i + 1
+                for i, (line, new_line) in enumerate(zip(lines, new_lines))
+                if line != new_line
+            ]
+
+        matcher = difflib.SequenceMatcher(None, lines, new_lines)
+        return [
+            lineno
+            for tag, start, end, __, __ in matcher.get_opcodes()
+            if tag != 'equal'
+            for lineno in range(prefix + start + 1, prefix + end + 1)
+        ]
+
+
+class RecordWriter:
+    """Write a JSON record for each file processed, one per line (NDJSON).
+
+    Each record is flushed as soon as it is written, so other tools can read the
+    records while the run continues.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._stream.write(f'{json.dumps(record)}\n')
+        self._stream.flush()
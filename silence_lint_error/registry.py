@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib
+import importlib.metadata
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import Any
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from silence_lint_error import fixing
+    from silence_lint_error import silencing
+
+T = TypeVar('T')
+
+
+def _load(target: str) -> Any:
+    module_name, __, attr = target.partition(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class Registry(Mapping[str, T]):
+    """Named linter adapters, which are only imported when they are used.
+
+    Built-in adapters are given as `module:attribute` references. Other packages
+    can add adapters by registering entry points in the registry's group, e.g.
+
+        [project.entry-points."silence_lint_error.linters"]
+        my-linter = "my_package.silence:MyLinter"
+
+    Entry points are only looked up when a name is not one of the built-in adapters
+    or when listing all of the adapters (e.g. for `--help`), because reading
+    package metadata is comparatively slow.
+    """
+
+    def __init__(self, builtins: Mapping[str, str], *, group: str) -> None:
+        self.group = group
+        self._builtins = dict(builtins)
+        self._plugins: dict[str, Callable[[], Any]] | None = None
+        self._loaded: dict[str, T] = {}
+
+    def _get_plugins(self) -> dict[str, Callable[[], Any]]:
+        if self._plugins is None:
+            self._plugins = {
+                entry_point.name: entry_point.load
+                for entry_point in importlib.metadata.entry_points(group=self.group)
+                if entry_point.name not in self._builtins
+            }
+        return self._plugins
+
+    def __getitem__(self, name: str) -> T:
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+
+        loaded: T
+        if name in self._builtins:
+            loaded = _load(self._builtins[name])
+        else:
+            loaded = self._get_plugins()[name]()
+
+        self._loaded[name] = loaded
+        return loaded
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._builtins or name in self._get_plugins()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._builtins
+        yield from sorted(self._get_plugins())
+
+    def __len__(self) -> int:
+        return len(self._builtins) + len(self._get_plugins())
+
+
+# the linters which can silence errors, for `silence-lint-error`
+LINTERS: Registry[type[silencing.Linter]] = Registry(
+    {
+        'fixit': 'silence_lint_error.linters.fixit:Fixit',
+        'fixit-inline': 'silence_lint_error.linters.fixit:FixitInline',
+        'flake8': 'silence_lint_error.linters.flake8:Flake8',
+        'mypy': 'silence_lint_error.linters.mypy:Mypy',
+        'ruff': 'silence_lint_error.linters.ruff:Ruff',
+        'semgrep': 'silence_lint_error.linters.semgrep:Semgrep',
+    },
+    group='silence_lint_error.linters',
+)
+
+# the linters which can fix errors, for `fix-silenced-error`
+FIXERS: Registry[type[fixing.Linter]] = Registry(
+    {
+        'fixit': 'silence_lint_error.linters.fixit:Fixit',
+        'ruff': 'silence_lint_error.linters.ruff:Ruff',
+    },
+    group='silence_lint_error.fixers',
+)
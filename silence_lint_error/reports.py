@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import functools
+import json
+import re
+import urllib.parse
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import Any
+from typing import IO
+from typing import TextIO
+
+from silence_lint_error.silencing import ViolationSet
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE_RE = re.compile(r'\s*')
+_DECODER = json.JSONDecoder()
+
+
+def read_chunks(f: IO[str]) -> Iterator[str]:
+    """Read a file in chunks, to avoid reading all of a large file at once."""
+    return iter(functools.partial(f.read, CHUNK_SIZE), '')
+
+
+class _Reader:
+    """Read JSON values from a stream of text, one value at a time."""
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = ''
+        self._position = 0
+
+    def _fill(self, size: int = 1) -> bool:
+        """Read at least `size` more characters into the buffer, if possible."""
+        new_chunks = []
+        for chunk in self._chunks:
+            new_chunks.append(chunk)
+            size -= len(chunk)
+            if size <= 0:
+                break
+        if not new_chunks:
+            return False
+
+        self._buffer = self._buffer[self._position:] + ''.join(new_chunks)
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character, or '' at the end of the stream."""
+        while True:
+            match = _WHITESPACE_RE.match(self._buffer, self._position)
+            assert match is not None  # the pattern can match an empty string
+            self._position = match.end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            elif not self._fill():
+                return ''
+
+    def take(self, expected: str) -> str:
+        """Consume the next non-whitespace character, which must be expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(
+                f'expected one of {expected!r}, found {char or "end of file"!r}',
+            )
+        self._position += 1
+        return char
+
+    def value(self) -> Any:
+        """Consume the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # the value may continue in the next chunk(s); grow the buffer
+                # geometrically so that large values are not re-parsed too often
+                if not self._fill(len(self._buffer) - self._position):
+                    raise
+                continue
+
+            if end == len(self._buffer) and self._fill():
+                continue  # a number might continue in the next chunk
+
+            self._position = end
+            return value
+
+
+def iter_json(chunks: Iterable[str], path: Sequence[str]) -> Iterator[Any]:
+    """Stream the values at a path through a JSON document.
+
+    The path is a sequence of object keys, or `'*'` for every item in an array.
+    For example, `('results', '*')` gives each item in the `results` array of the
+    top-level object. Only one of these values is held in memory at a time, and
+    other values in the document are skipped.
+
+    Raises:
+        ValueError: The document is not valid JSON, or does not have this shape.
+    """
+    reader = _Reader(chunks)
+    yield from _walk(reader, path)
+    if reader.peek():
+        raise ValueError('unexpected data after the end of the JSON document')
+
+
+def _walk(reader: _Reader, path: Sequence[str]) -> Iterator[Any]:
+    if not path:
+        yield reader.value()
+        return
+
+    step, *rest = path
+    if step == '*':
+        reader.take('[')
+        if reader.peek() == ']':
+            reader.take(']')
+            return
+        while True:
+            yield from _walk(reader, rest)
+            if reader.take(',]') == ']':
+                return
+    else:
+        reader.take('{')
+        if reader.peek() == '}':
+            reader.take('}')
+            return
+        while True:
+            key = reader.value()
+            reader.take(':')
+            if key == step:
+                yield from _walk(reader, rest)
+            else:
+                reader.value()  # skip it
+            if reader.take(',}') == '}':
+                return
+
+
+def is_sarif(path: str) -> bool:
+    """Whether a report is in the SARIF format, based on its file name."""
+    return path.endswith(('.sarif', '.sarif.json'))
+
+
+def read_sarif(report: TextIO, rule_name: str) -> ViolationSet:
+    """Find violations of a rule in a SARIF report.
+
+    Rules are matched by prefix, in the same way as rules are selected by most
+    linters (e.g. `F4` matches `F401`).
+    """
+    violations = ViolationSet()
+    for result in iter_json(read_chunks(report), ('runs', '*', 'results', '*')):
+        rule_id = result.get('ruleId')
+        if not rule_id or not rule_id.startswith(rule_name):
+            continue
+
+        for location in result.get('locations', ()):
+            physical_location = location['physicalLocation']
+            violations.add(
+                _uri_to_path(physical_location['artifactLocation']['uri']),
+                rule_name=rule_id,
+                lineno=physical_location['region']['startLine'],
+            )
+
+    return violations
+
+
+def _uri_to_path(uri: str) -> str:
+    parsed = urllib.parse.urlsplit(uri)
+    if parsed.scheme not in ('', 'file'):
+        raise ValueError(f'unsupported URI: {uri}')
+    return urllib.parse.unquote(parsed.path)
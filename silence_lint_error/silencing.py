@@ -1,11 +1,29 @@
 from __future__ import annotations
 
-import subprocess
+import itertools
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import cast
 from typing import Protocol
+from typing import TextIO
+from typing import TYPE_CHECKING
 
 import attrs
 
+from silence_lint_error import configs
+from silence_lint_error import files
+from silence_lint_error import sources
+
+if TYPE_CHECKING:
+    import subprocess
+
 
 @attrs.frozen
 class Violation:
@@ -13,24 +31,151 @@ class Violation:
     lineno: int
 
 
+class ViolationSet(Mapping[str, list[Violation]]):
+    """Violations of linting rules, grouped by file.
+
+    This behaves like a `dict[str, list[Violation]]`, but stores violations in a
+    compact, columnar form: file names and rule names are interned and the line
+    numbers for each file are held in an array. This keeps memory use low when a
+    linter reports millions of violations. `Violation` objects are only created
+    when the violations for a file are requested.
+    """
+
+    def __init__(self) -> None:
+        self._rule_names: list[str] = []
+        self._rule_ids: dict[str, int] = {}
+        # file name -> (rule ids, line numbers)
+        self._files: dict[str, tuple[array[int], array[int]]] = {}
+
+    def add(self, filename: str, rule_name: str, lineno: int) -> None:
+        """Record a violation of a rule on a line of a file."""
+        try:
+            rule_id = self._rule_ids[rule_name]
+        except KeyError:
+            rule_id = self._rule_ids[rule_name] = len(self._rule_names)
+            self._rule_names.append(sys.intern(rule_name))
+
+        try:
+            rule_ids, linenos = self._files[filename]
+        except KeyError:
+            rule_ids, linenos = self._files[sys.intern(filename)] = (
+                array('I'), array('I'),
+            )
+
+        rule_ids.append(rule_id)
+        linenos.append(lineno)
+
+    def update(self, other: ViolationSet, *, directory: str | None = None) -> None:
+        """Add all the violations from another set.
+
+        If `directory` is given, relative file names in `other` are relative to
+        that directory.
+        """
+        for filename, (rule_ids, linenos) in other._files.items():
+            if directory is not None and not os.path.isabs(filename):
+                filename = os.path.normpath(os.path.join(directory, filename))
+            for rule_id, lineno in zip(rule_ids, linenos):
+                self.add(filename, other._rule_names[rule_id], lineno)
+
+    @property
+    def rule_names(self) -> set[str]:
+        """The names of all the rules that have been violated."""
+        return set(self._rule_names)
+
+    def linenos(self, filename: str) -> set[int]:
+        """The lines of a file on which there are violations."""
+        __, linenos = self._files[filename]
+        return set(linenos)
+
+    def to_json(self) -> dict[str, dict[str, list[int]]]:
+        """Convert to a JSON-serializable mapping of file -> rule -> line numbers."""
+        data: dict[str, dict[str, list[int]]] = {}
+        for filename, (rule_ids, linenos) in self._files.items():
+            file_data = data[filename] = {}
+            for rule_id, lineno in zip(rule_ids, linenos):
+                rule_name = self._rule_names[rule_id]
+                file_data.setdefault(rule_name, []).append(lineno)
+        return data
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Mapping[str, Sequence[int]]]) -> ViolationSet:
+        """Create from the output of `to_json`."""
+        violations = cls()
+        for filename, file_data in data.items():
+            for rule_name, linenos in file_data.items():
+                for lineno in linenos:
+                    violations.add(filename, rule_name, lineno)
+        return violations
+
+    def __getitem__(self, filename: str) -> list[Violation]:
+        rule_ids, linenos = self._files[filename]
+        return [
+            Violation(self._rule_names[rule_id], lineno)
+            for rule_id, lineno in zip(rule_ids, linenos)
+        ]
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+
 @attrs.frozen
 class ErrorRunningTool(Exception):
     proc: subprocess.CompletedProcess[str]
 
 
+@attrs.frozen
+class Findings:
+    """The result of running a linter."""
+
+    violations: ViolationSet
+    # files which were too slow to check
+    skipped: list[str] = attrs.field(factory=list)
+    # fingerprints of the files with violations, as they were before the linter
+    # ran (files which changed whilst it ran get a stale fingerprint)
+    fingerprints: dict[str, sources.Fingerprint] = attrs.field(factory=dict)
+
+
 class Linter(Protocol):
     name: str
 
     def find_violations(
         self, rule_name: str, filenames: Sequence[str],
-    ) -> dict[str, list[Violation]]:
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
         """Find violations of a rule.
 
+        The linter should be run from `cwd`, if given. File names in the result
+        may be absolute or relative to that directory.
+
+        `timeout` and `cwd` are only given if the user asked for them, so linters
+        that do not support them still work without them.
+
         Returns:
             Mapping of file path to the violations found in that file.
 
         Raises:
             ErrorRunningTool: There was an error whilst running the linter.
+            subprocess.TimeoutExpired: The linter ran for longer than `timeout`
+                seconds.
+        """
+
+    def read_report(self, rule_name: str, report: TextIO) -> ViolationSet:
+        """Find violations of a rule in a report from a previous run of the linter.
+
+        The report is read incrementally, so that large reports need not be held
+        in memory.
+
+        Returns:
+            Mapping of file path to the violations found in that file.
         """
 
     def silence_violations(
@@ -43,9 +188,32 @@ class Linter(Protocol):
         """
 
 
+class SourceLinter(Linter, Protocol):
+    def find_violations_in_source(
+        self, rule_name: str, src: str, filename: str,
+    ) -> ViolationSet:
+        """Find violations of a rule in source which is not on disk.
+
+        The linter is given `src` (e.g. on stdin) in place of the file at
+        `filename`, which need not exist, so that the linter's config for that
+        file applies. Only `src` is checked, so the file names in the result do
+        not matter.
+
+        Returns:
+            Mapping of file path to the violations found in the source.
+
+        Raises:
+            ErrorRunningTool: There was an error whilst running the linter.
+        """
+
+
 @attrs.frozen
 class Silencer:
     linter: Linter
+    files: sources.Files = attrs.field(factory=sources.DiskFiles)
+    # silence files with more violations than this with a single file-level
+    # comment, if the linter supports one (with a `silence_file` method)
+    file_level_threshold: int | None = None
 
     class NoViolationsFound(Exception):
         pass
@@ -54,19 +222,177 @@ class Silencer:
     class MultipleRulesViolated(Exception):
         rule_names: set[str]
 
+    @attrs.frozen
+    class ErrorReadingReport(Exception):
+        report_path: str
+        reason: str
+
+    @attrs.frozen
+    class FileChanged(Exception):
+        filename: str
+
     def find_violations(
             self, *, rule_name: str, file_names: Sequence[str],
-    ) -> dict[str, list[Violation]]:
-        violations = self.linter.find_violations(rule_name, file_names)
+            timeout: float | None = None, by_config_root: bool = False,
+            cwd: str | None = None, fingerprint: bool = True,
+    ) -> Findings:
+        """Find violations of a rule by running the linter.
+
+        The linter is run from `cwd`, if given, and relative file names in the
+        result are joined onto it.
+
+        If `by_config_root` is set, the files are grouped by their nearest config
+        root (see `files.group_by_config_root`) and the linter is run for each
+        group, in parallel, from the config root. A config root is a directory
+        with one of the files that configure the linter, as given by its
+        `config_files` attribute. Directories are searched for Python files.
+
+        Long lists of files are split into chunks which fit on the linter's
+        command line (see `files.chunk_args`), and the linter is run for each.
+
+        If the linter runs for longer than `timeout` seconds, the files are split
+        in half (searching directories for Python files if necessary) and each
+        half is checked separately, until the files that are too slow to check
+        are isolated and skipped.
+
+        If `fingerprint` is set, the files with violations are fingerprinted, so
+        that `silence_violations` can detect files which have changed since, even
+        if they changed whilst the linter was running. Only the size and
+        modification time of the files to check are taken before the linter
+        starts: files with violations which no longer match them once it has
+        finished get a stale fingerprint. Files with violations which were not
+        given (e.g. found by the linter itself) are fingerprinted as they are
+        once the linter has finished. Callers which do not change the files
+        should not set `fingerprint`, to avoid reading them.
+
+        Returns:
+            The violations found, the files that were skipped, and the fingerprints
+            of the files with violations.
+        """
+        if not by_config_root:
+            base = cwd or os.curdir
+            stats = _stat_inputs(
+                # without any file names, the linter checks the current directory
+                [os.path.join(base, name) for name in file_names] or [base],
+            ) if fingerprint else {}
+            violations, skipped = self._find(
+                rule_name, file_names, timeout=timeout, cwd=cwd,
+            )
+            if cwd is not None:
+                found, violations = violations, ViolationSet()
+                violations.update(found, directory=cwd)
+        else:
+            # e.g. `(('pyproject.toml', 'tool.ruff'),)`, see `configs.find_config`
+            config_files = getattr(self.linter, 'config_files', ())
+            groups = files.group_by_config_root(
+                # without any file names, the linter checks the current directory
+                files.discover(file_names or [os.curdir]),
+                lambda directory: (
+                    configs.find_config(directory, config_files) is not None
+                ),
+            )
+            stats = _stat_inputs(
+                itertools.chain.from_iterable(groups.values()),
+            ) if fingerprint else {}
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                results = executor.map(
+                    lambda group: self._find(
+                        rule_name, group[1], timeout=timeout, cwd=group[0],
+                    ),
+                    groups.items(),
+                )
+                violations, skipped = ViolationSet(), []
+                for root, (group_violations, group_skipped) in zip(groups, results):
+                    violations.update(group_violations, directory=root)
+                    skipped.extend(group_skipped)
+
+        if violations or not skipped:
+            self._check(violations)
+
+        if not fingerprint:
+            return Findings(violations, skipped)
+
+        # files with violations which were not given have no stats
+        expected_stats = {}
+        for filename in violations:
+            stat = stats.get(os.path.abspath(filename))
+            if stat is not None:
+                expected_stats[filename] = stat
+        fingerprints = sources.fingerprint_files(violations, stats=expected_stats)
+        return Findings(violations, skipped, fingerprints)
+
+    def _find(
+            self, rule_name: str, file_names: Sequence[str], *,
+            timeout: float | None, cwd: str | None,
+    ) -> tuple[ViolationSet, list[str]]:
+        # only pass the optional arguments that were given, so linters that do
+        # not support them still work without them
+        kwargs: dict[str, Any] = {}
+        if cwd is not None:
+            kwargs['cwd'] = cwd
+        # without any file names, the linter checks the current directory
+        chunks = list(files.chunk_args(file_names)) or [[]]
+        if timeout is None:
+            if len(chunks) == 1:
+                return self.linter.find_violations(rule_name, chunks[0], **kwargs), []
+
+            violations = ViolationSet()
+            for chunk in chunks:
+                violations.update(
+                    self.linter.find_violations(rule_name, chunk, **kwargs),
+                )
+            return violations, []
+
+        kwargs['timeout'] = timeout
+
+        # not imported at module level, as the CLI imports this module on start-up
+        import subprocess
+
+        violations = ViolationSet()
+        skipped = []
+        chunks.reverse()  # to check them in order
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                violations.update(
+                    self.linter.find_violations(rule_name, chunk, **kwargs),
+                )
+            except subprocess.TimeoutExpired:
+                if len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    chunks += [chunk[middle:], chunk[:middle]]
+                    continue
+
+                expanded = list(files.discover(chunk or [cwd or '.']))
+                if expanded == chunk:
+                    skipped.extend(chunk)
+                elif expanded:
+                    chunks.append(expanded)
+
+        return violations, skipped
+
+    def read_report(self, *, rule_name: str, report_path: str) -> ViolationSet:
+        # `reports` imports `json`, which is slow to import
+        from silence_lint_error import reports
+
+        try:
+            with open(report_path, encoding='utf-8') as report:
+                if reports.is_sarif(report_path):
+                    violations = reports.read_sarif(report, rule_name)
+                else:
+                    violations = self.linter.read_report(rule_name, report)
+        except OSError as e:
+            raise self.ErrorReadingReport(report_path, e.strerror or str(e))
+        except (KeyError, TypeError, ValueError) as e:
+            raise self.ErrorReadingReport(report_path, f'invalid report ({e!r})')
 
+        return self._check(violations)
+
+    def _check(self, violations: ViolationSet) -> ViolationSet:
         if not violations:
             raise self.NoViolationsFound
 
-        violation_names = {
-            violation.rule_name
-            for file_violations in violations.values()
-            for violation in file_violations
-        }
+        violation_names = violations.rule_names
         if len(violation_names) != 1:
             raise self.MultipleRulesViolated(violation_names)
 
@@ -74,13 +400,82 @@ class Silencer:
 
     def silence_violations(
             self, *, filename: str, violations: Sequence[Violation],
+            fingerprint: sources.Fingerprint | None = None,
     ) -> bool:
-        with open(filename) as f:
-            src = f.read()
+        """Add comments to a file to silence violations.
+
+        If `fingerprint` is given, the file is only changed if it still matches.
+
+        If there are more than `file_level_threshold` violations, and the linter
+        supports it, the rule is silenced for the whole file instead.
+
+        Returns:
+            Whether the file was changed.
+
+        Raises:
+            FileChanged: The file does not match `fingerprint`: it has changed
+                since the violations were found.
+        """
+        src, encoding = self.files.read(filename)
+        if (
+                fingerprint is not None
+                and sources.Fingerprint.of_source(src, encoding) != fingerprint
+        ):
+            raise self.FileChanged(filename)
+
+        silence_file = getattr(self.linter, 'silence_file', None)
+        if (
+                silence_file is not None
+                and self.file_level_threshold is not None
+                and len(violations) > self.file_level_threshold
+        ):
+            src_with_comments = silence_file(src, violations[0].rule_name)
+        else:
+            src_with_comments = self.linter.silence_violations(src, violations)
+
+        if src_with_comments == src:
+            return False
+
+        self.files.write(filename, src_with_comments, encoding)
+        return True
+
+    def silence_source(self, *, rule_name: str, filename: str, src: str) -> str:
+        """Silence violations of a rule in source which is not on disk.
+
+        This is for editors, which want to silence the errors in a buffer which
+        has not been saved. The linter must support checking source (see
+        `SourceLinter`). Nothing is read from or written to `filename`.
+
+        Returns:
+            The source with comments that silence the violations.
+
+        Raises:
+            ErrorRunningTool: There was an error whilst running the linter.
+            NoViolationsFound: The linter found no violations of the rule.
+            MultipleRulesViolated: Violations of more than one rule were found.
+        """
+        linter = cast(SourceLinter, self.linter)
+        found = self._check(linter.find_violations_in_source(rule_name, src, filename))
+        violations = [
+            violation
+            for file_violations in found.values()
+            for violation in file_violations
+        ]
+
+        memory = sources.MemoryFiles({filename: src})
+        attrs.evolve(self, files=memory).silence_violations(
+            filename=filename, violations=violations,
+        )
+        return memory.changed.get(filename, src)
 
-        src_with_comments = self.linter.silence_violations(src, violations)
 
-        with open(filename, 'w') as f:
-            f.write(src_with_comments)
+def _stat_inputs(paths: Iterable[str]) -> dict[str, sources.FileStat]:
+    """Get the size and modification time of the Python files in some paths.
 
-        return src_with_comments != src
+    Returns:
+        Mapping of the absolute path of each file to its stats.
+    """
+    return {
+        os.path.abspath(filename): stat
+        for filename, stat in sources.stat_files(files.discover(paths)).items()
+    }
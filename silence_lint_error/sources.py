@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tokenize
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Mapping
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+
+import attrs
+
+
+def decode_source(data: bytes) -> tuple[str, str]:
+    """Decode the content of a Python module.
+
+    The encoding is detected from a BOM or a PEP 263 encoding cookie, falling back
+    to UTF-8. Newlines are not translated, so the decoded source keeps the line
+    endings of the original.
+
+    Returns:
+        The decoded source and the encoding used to decode it.
+    """
+    encoding, __ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    return data.decode(encoding), encoding
+
+
+def read_source(filename: str) -> tuple[str, str]:
+    """Read a Python module from disk.
+
+    Returns:
+        The decoded source and the encoding used to decode it.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    return decode_source(data)
+
+
+def write_source(filename: str, src: str, encoding: str) -> None:
+    """Write a Python module to disk, in the encoding it was read with."""
+    with open(filename, 'wb') as f:
+        f.write(src.encode(encoding))
+
+
+@attrs.frozen
+class Fingerprint:
+    """The size and a hash of the content of a file.
+
+    These are compared, rather than the modification time, so that a file which
+    is touched but not changed is not treated as changed.
+    """
+
+    size: int
+    digest: bytes
+
+    @classmethod
+    def of(cls, data: bytes) -> Fingerprint:
+        return cls(len(data), hashlib.blake2b(data, digest_size=16).digest())
+
+    @classmethod
+    def of_source(cls, src: str, encoding: str) -> Fingerprint:
+        """Take the fingerprint of decoded source, as it would be on disk."""
+        return cls.of(src.encode(encoding))
+
+    @classmethod
+    def stale(cls) -> Fingerprint:
+        """A fingerprint which no file matches, for a file known to have changed."""
+        return cls(-1, b'')
+
+
+@attrs.frozen
+class FileStat:
+    """The size and modification time of a file.
+
+    These are much cheaper to get than a `Fingerprint`, but a file which is
+    touched without being changed no longer matches.
+    """
+
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, stat: os.stat_result) -> FileStat:
+        return cls(stat.st_size, stat.st_mtime_ns)
+
+
+def stat_files(filenames: Iterable[str]) -> dict[str, FileStat]:
+    """Get the size and modification time of files.
+
+    Files which cannot be read are left out.
+    """
+    stats = {}
+    for filename in filenames:
+        try:
+            stats[filename] = FileStat.of(os.stat(filename))
+        except OSError:
+            pass
+    return stats
+
+
+def fingerprint_files(
+        filenames: Iterable[str], *, workers: int = 8,
+        stats: Mapping[str, FileStat] | None = None,
+) -> dict[str, Fingerprint]:
+    """Take the fingerprints of files, using a pool of threads.
+
+    If `stats` are given, files which no longer match them have changed since
+    the stats were taken, so get a stale fingerprint (see `Fingerprint.stale`).
+    Files which cannot be read are left out.
+    """
+    filenames = list(filenames)
+    stats = stats or {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _fingerprint_file, filenames,
+            [stats.get(filename) for filename in filenames],
+        )
+        return {
+            filename: fingerprint
+            for filename, fingerprint in results
+            if fingerprint is not None
+        }
+
+
+def _fingerprint_file(
+        filename: str, stat: FileStat | None,
+) -> tuple[str, Fingerprint | None]:
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+            if stat is not None and FileStat.of(os.fstat(f.fileno())) != stat:
+                return filename, Fingerprint.stale()
+    except OSError:
+        return filename, None
+
+    return filename, Fingerprint.of(data)
+
+
+def line_ending(line: str) -> str:
+    """Get the newline sequence that ends a line of source.
+
+    Lines without a newline (i.e. the last line of a module) are treated as if
+    they ended with `\\n`.
+    """
+    return line[len(line.rstrip('\r\n')):] or '\n'
+
+
+class Files(Protocol):
+    """Where modules are read from and written to."""
+
+    def read(self, filename: str) -> tuple[str, str]:
+        """Read a Python module.
+
+        Returns:
+            The decoded source and the encoding used to decode it.
+        """
+
+    def write(self, filename: str, src: str, encoding: str) -> None:
+        """Write a Python module, in the encoding it was read with."""
+
+
+class DiskFiles:
+    """Read and write modules on disk, one at a time."""
+
+    def read(self, filename: str) -> tuple[str, str]:
+        return read_source(filename)
+
+    def write(self, filename: str, src: str, encoding: str) -> None:
+        write_source(filename, src, encoding)
+
+
+class MemoryFiles:
+    """Read and write modules held in memory.
+
+    Modules are read from `sources`, a mapping of file name to source, which is
+    not modified. Modules that are written are kept in `changed`, and read from
+    there afterwards.
+    """
+
+    def __init__(self, sources: Mapping[str, str]) -> None:
+        self.sources = sources
+        self.changed: dict[str, str] = {}
+
+    def read(self, filename: str) -> tuple[str, str]:
+        if filename in self.changed:
+            return self.changed[filename], 'utf-8'
+        try:
+            return self.sources[filename], 'utf-8'
+        except KeyError:
+            raise FileNotFoundError(filename) from None
+
+    def write(self, filename: str, src: str, encoding: str) -> None:
+        self.changed[filename] = src
+
+
+class PipelinedFiles:
+    """Read and write modules on disk using a pool of threads.
+
+    Files are read ahead of time, in the order they will be needed, and written
+    in the background, so that a loop which reads, changes and writes one file at
+    a time is not held up by the latency of each read and write (e.g. on a
+    network filesystem). At most `window` files are being read ahead and at most
+    `window` files are waiting to be written at any time, which bounds the memory
+    used. If `write_behind` is false, each write finishes before `write` returns.
+
+    Errors from reading a file are raised when it is read. Errors from writing a
+    file are raised by a later write, or by `close`.
+    """
+
+    def __init__(
+            self, filenames: Iterable[str], *,
+            workers: int = 8, window: int = 32, write_behind: bool = True,
+    ) -> None:
+        self.bytes_read = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._filenames = iter(filenames)
+        self._window = window
+        self._write_behind = write_behind
+        self._seen: set[str] = set()
+        self._reads: dict[str, Future[tuple[str, str, int]]] = {}
+        self._writes: deque[Future[None]] = deque()
+        self._prefetch()
+
+    def _prefetch(self) -> None:
+        while len(self._reads) < self._window:
+            filename = next(self._filenames, None)
+            if filename is None:
+                return
+            if filename in self._seen:
+                # it may be written before it is needed again
+                continue
+
+            self._seen.add(filename)
+            self._reads[filename] = self._executor.submit(_read_with_size, filename)
+
+    def read(self, filename: str) -> tuple[str, str]:
+        future = self._reads.pop(filename, None)
+        self._prefetch()
+        if future is None:  # not read ahead: wait for pending writes then read
+            self._flush(0)
+            src, encoding, size = _read_with_size(filename)
+        else:
+            src, encoding, size = future.result()
+
+        self.bytes_read += size
+        return src, encoding
+
+    def write(self, filename: str, src: str, encoding: str) -> None:
+        self._writes.append(
+            self._executor.submit(write_source, filename, src, encoding),
+        )
+        self._flush(self._window if self._write_behind else 0)
+
+    def _flush(self, pending: int) -> None:
+        """Wait until at most `pending` writes are outstanding."""
+        while len(self._writes) > pending:
+            self._writes.popleft().result()
+
+    def close(self) -> None:
+        """Wait for all writes to finish, and stop reading ahead."""
+        try:
+            for future in self._reads.values():
+                future.cancel()
+            self._reads.clear()
+            self._flush(0)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> PipelinedFiles:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _read_with_size(filename: str) -> tuple[str, str, int]:
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    src, encoding = decode_source(data)
+    return src, encoding, len(data)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+from collections import Counter
+from collections.abc import Sequence
+from types import TracebackType
+from typing import IO
+from typing import TextIO
+
+from silence_lint_error.silencing import ViolationSet
+
+
+class StreamedProcess:
+    """Run a process and read its output as it is written.
+
+    This avoids holding all of the output in memory, which can be very large when
+    a linter reports violations of many rules. After the process has finished,
+    `proc` holds its return code and stderr.
+    """
+
+    def __init__(self, args: Sequence[str]) -> None:
+        self.args = args
+        self.proc: subprocess.CompletedProcess[str]  # set when it finishes
+        self._popen: subprocess.Popen[str] | None = None
+        self._stderr: TextIO | None = None
+
+    def __enter__(self) -> IO[str]:
+        # stderr is written to a file, so the process cannot block on a full pipe
+        # while we are reading stdout
+        self._stderr = tempfile.TemporaryFile('w+')
+        self._popen = subprocess.Popen(
+            self.args, stdout=subprocess.PIPE, stderr=self._stderr, text=True,
+        )
+        assert self._popen.stdout is not None
+        return self._popen.stdout
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_value: BaseException | None,
+            traceback: TracebackType | None,
+    ) -> None:
+        assert self._popen is not None and self._popen.stdout is not None
+        assert self._stderr is not None
+        if exc_type is None:
+            self._popen.stdout.read()  # let the process finish writing
+        else:
+            self._popen.kill()
+        self._popen.stdout.close()
+        returncode = self._popen.wait()
+
+        self._stderr.seek(0)
+        self.proc = subprocess.CompletedProcess(
+            self.args, returncode, stdout='', stderr=self._stderr.read(),
+        )
+        self._stderr.close()
+
+
+def _top_level_directory(filename: str) -> str:
+    path = os.path.relpath(filename) if os.path.isabs(filename) else filename
+    top, sep, __ = os.path.normpath(path).partition(os.sep)
+    return top if sep else '.'
+
+
+def summarise(violations: ViolationSet) -> dict[str, dict[str, dict[str, int]]]:
+    """Count the violations, and the files with violations, by rule and directory.
+
+    Directories are the top-level directories (relative to the current directory)
+    of the files, or `.` for files in the current directory.
+
+    Returns:
+        Mapping of `rules` and `directories` to counts of `violations` and `files`
+        for each rule or directory.
+    """
+    rules: dict[str, dict[str, int]] = {}
+    directories: dict[str, dict[str, int]] = {}
+    for filename, file_violations in violations.items():
+        directory = directories.setdefault(
+            _top_level_directory(filename), {'violations': 0, 'files': 0},
+        )
+        directory['violations'] += len(file_violations)
+        directory['files'] += 1
+
+        for rule_name, count in Counter(
+                violation.rule_name for violation in file_violations
+        ).items():
+            rule = rules.setdefault(rule_name, {'violations': 0, 'files': 0})
+            rule['violations'] += count
+            rule['files'] += 1
+
+    return {'rules': rules, 'directories': directories}
+
+
+def format_table(heading: str, counts: dict[str, dict[str, int]]) -> str:
+    """Format counts as a table, with the most violations first."""
+    rows = sorted(counts.items(), key=lambda item: (-item[1]['violations'], item[0]))
+    width = max([len(heading), *(len(name) for name, __ in rows)])
+    lines = [f'{heading:<{width}}  violations   files']
+    for name, count in rows:
+        lines.append(
+            f'{name:<{width}}  {count["violations"]:>10}  {count["files"]:>6}',
+        )
+    return '\n'.join(lines)
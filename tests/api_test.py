@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from silence_lint_error import api
+
+
+def test_silence() -> None:
+    contents = {
+        'pkg/a.py': 'import os\nimport sys\n\nprint(sys.argv)\n',
+        'pkg/b.py': 'import os\n',
+        'pkg/c.py': 'import sys\n\nprint(sys.argv)\n',
+        'README.md': '# pkg\n',
+    }
+
+    changed = api.silence('ruff', 'F401', contents)
+
+    assert changed == {
+        'pkg/a.py': 'import os  # noqa: F401\nimport sys\n\nprint(sys.argv)\n',
+        'pkg/b.py': 'import os  # noqa: F401\n',
+    }
+    assert contents['pkg/b.py'] == 'import os\n'
+
+
+def test_silence_uses_config() -> None:
+    contents = {
+        'pyproject.toml': (
+            '[tool.ruff.lint.per-file-ignores]\n'
+            '"tests/*" = ["F401"]\n'
+        ),
+        'src/a.py': 'import os\n',
+        'tests/a_test.py': 'import os\n',
+    }
+
+    changed = api.silence('ruff', 'F401', contents)
+
+    assert changed == {'src/a.py': 'import os  # noqa: F401\n'}
+
+
+def test_silence_no_violations() -> None:
+    assert api.silence('ruff', 'F401', {'a.py': 'x = 1\n'}) == {}
+
+
+@pytest.mark.parametrize('path', ('/tmp/a.py', '../a.py', 'pkg/../../a.py'))
+def test_silence_path_outside_repository(path: str) -> None:
+    with pytest.raises(ValueError):
+        api.silence('ruff', 'F401', {path: 'import os\n'})
+
+
+def test_fix() -> None:
+    contents = {
+        'a.py': 'import os  # noqa: F401\nimport sys\n\nprint(sys.argv)\n',
+        'b.py': 'import os\n',
+    }
+
+    changed = api.fix('ruff', 'F401', contents)
+
+    assert changed == {'a.py': 'import sys\n\nprint(sys.argv)\n'}
+
+
+def test_fix_silences_unfixed_errors() -> None:
+    contents = {
+        # the fix for F841 is unsafe, so it is not applied
+        'a.py': 'def f():\n    x = 1  # noqa: F841\n    y = 2  # noqa: F841\n',
+    }
+
+    changed = api.fix('ruff', 'F841', contents)
+
+    assert changed == {}
+
+
+def test_fix_no_silenced_errors() -> None:
+    assert api.fix('ruff', 'F401', {'a.py': 'import os\n'}) == {}
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import json
+import re
 from pathlib import Path
 
 import pytest
 
 from silence_lint_error.cli.fix_silenced_error import main
+from silence_lint_error.files import Shard
 
 
 class TestFixit:
@@ -46,6 +49,8 @@ def f(x):
 -> removing comments that silence errors
 -> applying auto-fixes with fixit
 🛠️  1 file checked, 1 file with errors, 2 auto-fixes available, 2 fixes applied 🛠️
+-> silencing errors which were not fixed
+all errors were fixed
 """
 
     def test_main_no_violations(
@@ -105,6 +110,8 @@ print(math.pi, file=sys.stderr)
 -> removing comments that silence errors
 -> applying auto-fixes with ruff
 Found 1 error (1 fixed, 0 remaining).
+-> silencing errors which were not fixed
+all errors were fixed
 """
 
     def test_main_no_violations(
@@ -131,3 +138,178 @@ print(math.pi, file=sys.stderr)
 -> removing comments that silence errors
 no silenced errors found
 """
+
+    def test_main_no_paths(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os  # noqa: F401\n')
+        monkeypatch.chdir(tmp_path)
+
+        # without --shard, the current directory is not fixed (e.g. when
+        # `xargs` passes no files)
+        ret = main(('ruff', 'F401'))
+
+        assert ret == 0
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+        captured = capsys.readouterr()
+        assert captured.err == """\
+-> removing comments that silence errors
+no silenced errors found
+"""
+
+    @pytest.mark.parametrize(
+        'paths', (pytest.param(('.',), id='paths'), pytest.param((), id='no-paths')),
+    )
+    def test_main_shard(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            paths: tuple[str, ...],
+    ) -> None:
+        src = """\
+import os  # noqa: F401
+"""
+        for i in range(10):
+            (tmp_path / f'mod_{i}.py').write_text(src)
+        monkeypatch.chdir(tmp_path)
+
+        shard = Shard(1, 3)
+
+        ret = main(('ruff', 'F401', *paths, '--shard', '1/3'))
+
+        assert ret == 0
+        changed = {
+            str(module) for module in tmp_path.glob('*.py')
+            if module.read_text() != src
+        }
+        assert changed
+        assert changed == {
+            str(module) for module in tmp_path.glob('*.py')
+            if shard.includes(module.name)
+        }
+
+    def test_main_progress(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os  # noqa: F401\n')
+
+        ret = main(('ruff', 'F401', str(python_module), '--progress'))
+
+        assert ret == 0
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert re.match(
+            r"""-> removing comments that silence errors
+removing comments: 1/1 files in 0:00, \d+ files/s, [\d.]+ \w+/s
+-> applying auto-fixes with ruff
+""",
+            captured.err,
+        )
+
+    def test_main_ndjson(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import math\nimport os  # noqa: F401\n')
+        (tmp_path / 'other.py').write_text('import sys\n')
+
+        ret = main(('ruff', 'F401', str(tmp_path), '--format', 'ndjson'))
+
+        assert ret == 0
+        captured = capsys.readouterr()
+        [record] = [json.loads(line) for line in captured.out.splitlines()]
+        assert record.pop('elapsed') >= 0
+        assert record == {
+            'path': str(python_module),
+            'rules': ['F401'],
+            'lines': [2],
+            'status': 'changed',
+            'bytes': -14,
+        }
+
+    def test_main_silence_unfixed(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        # the fix for F841 is unsafe, so it is not applied
+        python_module.write_text("""\
+def f():
+    x = 1  # noqa: F841
+    y = 2  # noqa: F841
+    return y
+""")
+
+        ret = main(('ruff', 'F841', str(python_module)))
+
+        assert ret == 1
+        assert python_module.read_text() == """\
+def f():
+    x = 1  # noqa: F841
+    y = 2
+    return y
+"""
+
+        captured = capsys.readouterr()
+        # ruff's report of the error is left out: it varies between versions
+        assert captured.err.startswith("""\
+-> removing comments that silence errors
+-> applying auto-fixes with ruff
+""")
+        assert captured.err.endswith(f"""
+-> silencing errors which were not fixed
+silenced errors in 1 files:
+  {python_module}
+""")
+
+    def test_main_files_from(self, tmp_path: Path) -> None:
+        (tmp_path / 'a.py').write_text('import os  # noqa: F401\n')
+        (tmp_path / 'b.py').write_text('import sys  # noqa: F401\n')
+        file_list = tmp_path / 'files'
+        file_list.write_text(f'{tmp_path / "a.py"}\n{tmp_path / "b.py"}\n')
+
+        ret = main(('ruff', 'F401', '--files-from', str(file_list)))
+
+        assert ret == 0
+        assert (tmp_path / 'a.py').read_text() == ''
+        assert (tmp_path / 'b.py').read_text() == ''
+
+    def test_main_no_silence_unfixed(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('def f():\n    x = 1  # noqa: F841\n')
+
+        ret = main((
+            'ruff', 'F841', str(python_module),
+            '--no-silence-unfixed', '--no-restore-unfixed',
+        ))
+
+        assert ret == 1
+        assert python_module.read_text() == 'def f():\n    x = 1\n'
+
+    def test_main_restore_unfixed(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('def f():\n    x = 1  # noqa: F841\n')
+        fixed_module = tmp_path / 'u.py'
+        fixed_module.write_text('def f():\n    x = 1  # noqa: F841\n    del x\n')
+
+        ret = main((
+            'ruff', 'F841', str(python_module), str(fixed_module),
+            '--no-silence-unfixed',
+        ))
+
+        assert ret == 1
+        # the error could not be fixed, so the original is put back
+        assert python_module.read_text() == 'def f():\n    x = 1  # noqa: F841\n'
+        assert fixed_module.read_text() == 'def f():\n    x = 1\n    del x\n'
+
+        captured = capsys.readouterr()
+        assert captured.err.endswith(f"""
+-> restoring files where errors were not fixed
+restored 1 files:
+  {python_module}
+""")
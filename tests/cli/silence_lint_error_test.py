@@ -1,13 +1,58 @@
 from __future__ import annotations
 
+import io
+import json
 import os
+import re
+import subprocess
+import sys
 from pathlib import Path
+from typing import Any
 from unittest import mock
 
 import pytest
 from pytest_subprocess import FakeProcess
 
 from silence_lint_error.cli.silence_lint_error import main
+from silence_lint_error.silencing import Silencer
+
+
+def _imported_modules(*args: str) -> set[str]:
+    proc = subprocess.run(
+        (sys.executable, '-X', 'importtime', *args),
+        capture_output=True, text=True, check=True,
+    )
+    return {
+        line.rsplit('|', maxsplit=1)[-1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith('import time:')
+    }
+
+
+@pytest.mark.parametrize(
+    'args', (
+        pytest.param(
+            ('-c', 'import silence_lint_error.cli.silence_lint_error'),
+            id='import',
+        ),
+        pytest.param(
+            ('-m', 'silence_lint_error.cli.silence_lint_error', '--help'),
+            id='help',
+        ),
+        pytest.param(
+            ('-m', 'silence_lint_error.cli.fix_silenced_error', '--help'),
+            id='help-fix',
+        ),
+    ),
+)
+def test_startup_imports(args: tuple[str, ...]) -> None:
+    imported = _imported_modules(*args)
+
+    assert not imported & {'json', 'subprocess', 'tokenize_rt'}
+    assert not {
+        module for module in imported
+        if module.startswith('silence_lint_error.linters.')
+    }
 
 
 class TestFixit:
@@ -48,6 +93,24 @@ found errors in 1 files
 -> adding comments to silence errors
 """
 
+    def test_main_preserves_line_endings(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_bytes(
+            b'x = None\r\n'
+            b'isinstance(x, str) or isinstance(x, int)\r\n',
+        )
+
+        ret = main(
+            ('fixit', 'fixit.rules:CollapseIsinstanceChecks', str(python_module)),
+        )
+
+        assert ret == 1
+        assert python_module.read_bytes() == (
+            b'x = None\r\n'
+            b'# lint-fixme: CollapseIsinstanceChecks\r\n'
+            b'isinstance(x, str) or isinstance(x, int)\r\n'
+        )
+
     def test_main_no_violations(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
@@ -98,6 +161,21 @@ if True:
 ERROR: errors found for multiple rules: ['CollapseIsinstanceChecks', 'NoStaticIfCondition']
 """  # noqa: B950
 
+    def test_main_unknown_rule(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('x = None\n')
+
+        ret = main(('fixit', 'fixit.rules:Nope', str(python_module)))
+
+        assert ret == 1
+        captured = capsys.readouterr()
+        assert captured.err == (
+            "ERROR: unknown rule 'fixit.rules:Nope' for fixit: "
+            'CollectionError: could not find rule fixit.rules:Nope\n'
+        )
+
     def test_not_installed(self, capsys: pytest.CaptureFixture[str]) -> None:
         with FakeProcess() as process:
             process.register(
@@ -105,7 +183,7 @@ ERROR: errors found for multiple rules: ['CollapseIsinstanceChecks', 'NoStaticIf
                 returncode=1, stderr='/path/to/python3: No module named fixit\n',
             )
 
-            ret = main(('fixit', 'fixit.rules', 'path/to/file.py'))
+            ret = main(('fixit', 'fixit.rules', 'path/to/file.py', '--no-preflight'))
 
         assert ret == 1
 
@@ -116,6 +194,106 @@ ERROR: errors found for multiple rules: ['CollapseIsinstanceChecks', 'NoStaticIf
 ERROR: /path/to/python3: No module named fixit
 """
 
+    def test_main_verify(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+x = None
+isinstance(x, str) or isinstance(x, int)
+""")
+        fixit = ('fixit', '--rules', 'fixit.rules:CollapseIsinstanceChecks', 'lint')
+        error = 'CollapseIsinstanceChecks: Multiple isinstance calls'
+
+        with FakeProcess() as process:
+            # the error is still reported after adding a comment above it
+            for lineno in (2, 3):
+                process.register(
+                    (*fixit, str(python_module)),
+                    returncode=1, stdout=f'{python_module}@{lineno}:0 {error}\n',
+                )
+            process.register((*fixit, str(python_module)))
+
+            ret = main((
+                'fixit', 'fixit.rules:CollapseIsinstanceChecks',
+                str(python_module), '--verify', '--no-preflight',
+            ))
+
+        assert ret == 1
+        assert python_module.read_text() == """\
+x = None
+# lint-fixme: CollapseIsinstanceChecks
+isinstance(x, str) or isinstance(x, int)  # lint-fixme: CollapseIsinstanceChecks
+"""
+
+        captured = capsys.readouterr()
+        assert captured.err == """\
+-> finding errors with fixit
+found errors in 1 files
+-> adding comments to silence errors
+-> checking for errors in 1 changed files
+-> adding comments to silence errors in 1 files
+-> checking for errors in 1 changed files
+all errors are silenced
+"""
+
+    def test_main_verify_errors_remain(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+x = None
+isinstance(x, str) or isinstance(x, int)
+""")
+        fixit = ('fixit', '--rules', 'fixit.rules:CollapseIsinstanceChecks', 'lint')
+        error = 'CollapseIsinstanceChecks: Multiple isinstance calls'
+
+        with FakeProcess() as process:
+            # the error is still reported with comments in both places
+            for lineno in (2, 3, 3):
+                process.register(
+                    (*fixit, str(python_module)),
+                    returncode=1, stdout=f'{python_module}@{lineno}:0 {error}\n',
+                )
+
+            ret = main((
+                'fixit', 'fixit.rules:CollapseIsinstanceChecks',
+                str(python_module), '--verify', '--no-preflight',
+            ))
+
+        assert ret == 1
+        # each placement is only tried once
+        assert python_module.read_text() == """\
+x = None
+# lint-fixme: CollapseIsinstanceChecks
+isinstance(x, str) or isinstance(x, int)  # lint-fixme: CollapseIsinstanceChecks
+"""
+
+        captured = capsys.readouterr()
+        assert captured.err == f"""\
+-> finding errors with fixit
+found errors in 1 files
+-> adding comments to silence errors
+-> checking for errors in 1 changed files
+-> adding comments to silence errors in 1 files
+-> checking for errors in 1 changed files
+WARNING: errors are still reported in 1 files:
+  {python_module}
+"""
+
+    def test_prune_not_supported(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        ret = main(('prune', 'fixit', 'path/to/file.py'))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == """\
+ERROR: fixit does not support pruning
+"""
+
 
 class TestFixitInline:
     def test_main_inline(
@@ -192,6 +370,25 @@ found errors in 1 files
 -> adding comments to silence errors
 """
 
+    def test_main_stdin_filename(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('x = 1\n')
+        monkeypatch.setattr(
+            sys, 'stdin',
+            io.TextIOWrapper(io.BytesIO(b'import os\nimport glob  # noqa: F401\n')),
+        )
+
+        ret = main(('flake8', 'F401', '--stdin-filename', str(python_module)))
+
+        assert ret == 0
+        # the file on disk is not read or changed
+        assert python_module.read_text() == 'x = 1\n'
+        captured = capsys.readouterr()
+        assert captured.out == 'import os  # noqa: F401\nimport glob  # noqa: F401\n'
+
     def test_main_no_violations(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
@@ -222,7 +419,7 @@ no errors found
                 returncode=1, stderr='/path/to/python3: No module named flake8\n',
             )
 
-            ret = main(('flake8', 'F401', 'path/to/file.py'))
+            ret = main(('flake8', 'F401', 'path/to/file.py', '--no-preflight'))
 
         assert ret == 1
 
@@ -233,6 +430,41 @@ no errors found
 ERROR: /path/to/python3: No module named flake8
 """
 
+    @pytest.mark.parametrize(
+        'paths', (pytest.param(('t.py',), id='paths'), pytest.param((), id='no-paths')),
+    )
+    def test_prune(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str], paths: tuple[str, ...],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+import os  # noqa: F401
+import sys  # noqa: F401,E501
+x = 1  # noqa: F841,E501
+# noqa: W291
+y: list = []  # noqa: RUF012
+""")
+        monkeypatch.chdir(tmp_path)
+
+        ret = main(('prune', 'flake8', *paths))
+
+        assert ret == 1
+        # codes which flake8 does not know are for other tools, so are kept
+        assert python_module.read_text() == """\
+import os  # noqa: F401
+import sys  # noqa: F401
+x = 1
+y: list = []  # noqa: RUF012
+"""
+
+        captured = capsys.readouterr()
+        assert os.path.normpath(captured.out.strip()) == 't.py'
+        assert captured.err == """\
+-> finding unused comments with flake8
+-> removing unused codes from comments
+"""
+
 
 class TestRuff:
     def test_main(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
@@ -264,116 +496,232 @@ found errors in 1 files
 -> adding comments to silence errors
 """
 
-    def test_main_no_violations(
+    def test_main_timeout(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
-        src = """\
-def foo():
-    print('hello there')
-"""
+        fast_module = tmp_path / 'fast.py'
+        fast_module.write_text('import os\n')
+        slow_module = tmp_path / 'slow.py'
+        slow_module.write_text('import sys\n')
+        ruff = ('ruff', 'check', '--select', 'F401', '--output-format', 'json')
 
-        python_module = tmp_path / 't.py'
-        python_module.write_text(src)
+        def time_out(process: Any) -> None:
+            raise subprocess.TimeoutExpired(process.args, 0.01)
 
-        ret = main(('ruff', 'F401', str(python_module)))
+        with FakeProcess() as process:
+            process.register(
+                (*ruff, str(fast_module), str(slow_module)), callback=time_out,
+            )
+            process.register(
+                (*ruff, str(fast_module)),
+                returncode=1,
+                stdout=json.dumps([{
+                    'code': 'F401',
+                    'filename': str(fast_module),
+                    'location': {'row': 1, 'column': 8},
+                }]),
+            )
+            process.register((*ruff, str(slow_module)), callback=time_out)
 
-        assert ret == 0
-        assert python_module.read_text() == src
+            ret = main((
+                'ruff', 'F401', str(fast_module), str(slow_module),
+                '--timeout', '0.01', '--no-preflight',
+            ))
+
+        assert ret == 1
+        assert fast_module.read_text() == 'import os  # noqa: F401\n'
+        assert slow_module.read_text() == 'import sys\n'
 
         captured = capsys.readouterr()
-        assert captured.out == ''
-        assert captured.err == """\
+        assert captured.out == f"""\
+{fast_module}
+"""
+        assert captured.err == f"""\
 -> finding errors with ruff
-no errors found
+found errors in 1 files
+WARNING: skipped 1 files which took longer than 0.01s to check:
+  {slow_module}
+-> adding comments to silence errors
 """
 
-    def test_ignores_modules_with_syntax_error(
+    def test_main_ndjson(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
         python_module = tmp_path / 't.py'
-        python_module.write_text("""\
-import sys
-""")
-        invalid_module = tmp_path / 'y.py'
-        invalid_module.write_text("""\
-import sys
-
-print(
-""")
+        python_module.write_text('import os\nimport sys  # noqa: F401\n')
 
-        ret = main(('ruff', 'F401', str(tmp_path)))
+        ret = main(('ruff', 'F401', str(python_module), '--format', 'ndjson'))
 
         assert ret == 1
-        assert python_module.read_text() == """\
-import sys  # noqa: F401
-"""
-        assert invalid_module.read_text() == """\
-import sys
+        assert python_module.read_text() == (
+            'import os  # noqa: F401\nimport sys  # noqa: F401\n'
+        )
 
-print(
-"""
+        captured = capsys.readouterr()
+        [record] = [json.loads(line) for line in captured.out.splitlines()]
+        assert record.pop('elapsed') >= 0
+        assert record == {
+            'path': str(python_module),
+            'rules': ['F401'],
+            'lines': [1],
+            'status': 'changed',
+            'bytes': 14,
+        }
+
+    def test_main_file_changed_after_checking(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        ruff = ('ruff', 'check', '--select', 'F401', '--output-format', 'json')
+
+        find_violations = Silencer.find_violations
+
+        def find_violations_then_edit(self: Silencer, **kwargs: Any) -> Any:
+            findings = find_violations(self, **kwargs)
+            if python_module.read_text() == 'import os\n':
+                python_module.write_text('"""A docstring."""\nimport os\n')
+            return findings
+
+        monkeypatch.setattr(Silencer, 'find_violations', find_violations_then_edit)
+
+        with FakeProcess() as process:
+            for lineno in (1, 2):
+                process.register(
+                    (*ruff, str(python_module)),
+                    returncode=1,
+                    stdout=json.dumps([{
+                        'code': 'F401',
+                        'filename': str(python_module),
+                        'location': {'row': lineno, 'column': 8},
+                    }]),
+                )
+
+            ret = main(('ruff', 'F401', str(python_module), '--no-preflight'))
+
+        assert ret == 1
+        assert python_module.read_text() == (
+            '"""A docstring."""\nimport os  # noqa: F401\n'
+        )
 
         captured = capsys.readouterr()
         assert captured.out == f"""\
 {python_module}
+{python_module}
 """
         assert captured.err == """\
 -> finding errors with ruff
 found errors in 1 files
 -> adding comments to silence errors
+-> checking 1 files again which changed after they were checked
+-> adding comments to silence errors
 """
 
-    def test_not_installed(self, capsys: pytest.CaptureFixture[str]) -> None:
+    def test_main_file_keeps_changing(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        ruff = ('ruff', 'check', '--select', 'F401', '--output-format', 'json')
+
+        find_violations = Silencer.find_violations
+
+        def find_violations_then_edit(self: Silencer, **kwargs: Any) -> Any:
+            findings = find_violations(self, **kwargs)
+            with python_module.open('a') as f:
+                f.write('x = 1\n')
+            return findings
+
+        monkeypatch.setattr(Silencer, 'find_violations', find_violations_then_edit)
+
         with FakeProcess() as process:
             process.register(
-                ('ruff', process.any()),
-                returncode=1, stderr='/path/to/python3: No module named ruff\n',
+                (*ruff, str(python_module)),
+                returncode=1,
+                stdout=json.dumps([{
+                    'code': 'F401',
+                    'filename': str(python_module),
+                    'location': {'row': 1, 'column': 8},
+                }]),
             )
+            process.keep_last_process(True)
 
-            ret = main(('ruff', 'F401', 'path/to/file.py'))
+            ret = main(('ruff', 'F401', str(python_module), '--no-preflight'))
 
         assert ret == 1
+        assert python_module.read_text() == 'import os\n' + 'x = 1\n' * 4
 
         captured = capsys.readouterr()
-        assert captured.out == ''
-        assert captured.err == """\
+        assert captured.err == f"""\
 -> finding errors with ruff
-ERROR: /path/to/python3: No module named ruff
+found errors in 1 files
+-> adding comments to silence errors
+-> checking 1 files again which changed after they were checked
+-> adding comments to silence errors
+-> checking 1 files again which changed after they were checked
+-> adding comments to silence errors
+-> checking 1 files again which changed after they were checked
+-> adding comments to silence errors
+WARNING: skipped 1 files which changed after they were checked:
+  {python_module}
 """
 
+    @pytest.mark.parametrize(
+        'paths', (
+            pytest.param(('src', 'tests'), id='paths'),
+            pytest.param((), id='no-paths'),
+        ),
+    )
+    def test_survey(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str], paths: tuple[str, ...],
+    ) -> None:
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'src/a.py').write_text('import os\nimport sys\nx = 1 \n')
+        (tmp_path / 'tests').mkdir()
+        (tmp_path / 'tests/a_test.py').write_text('import os\n')
+        monkeypatch.chdir(tmp_path)
 
-class TestSemgrep:
-    def test_main(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
-        python_module = tmp_path / 't.py'
-        python_module.write_text(
-            """\
-import time
+        ret = main(('survey', 'ruff', '--prefix', 'F', *paths))
 
-time.sleep(5)
+        assert ret == 0
+        assert (tmp_path / 'src/a.py').read_text() == 'import os\nimport sys\nx = 1 \n'
 
-# a different error (open-never-closed)
-fd = open('foo')
-""",
-        )
+        captured = capsys.readouterr()
+        assert captured.out == """\
+rule  violations   files
+F401           3       2
 
-        with mock.patch.dict(os.environ, {'SEMGREP_RULES': 'r/python'}):
-            ret = main(
-                (
-                    'semgrep',
-                    'python.lang.best-practice.sleep.arbitrary-sleep',
-                    str(python_module),
-                ),
-            )
+directory  violations   files
+src                 2       1
+tests               1       1
+"""
+        assert captured.err == """\
+-> surveying errors with ruff
+"""
 
-        assert ret == 1
-        assert python_module.read_text() == """\
-import time
+    def test_prune(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+import os  # noqa: F401
+import sys  # noqa: F401,F841
+x = 1  # noqa: F841  # a comment
+y = 2  # noqa: E501
+""")
 
-# nosemgrep: python.lang.best-practice.sleep.arbitrary-sleep
-time.sleep(5)
+        ret = main(('prune', 'ruff', '--prefix', 'F', str(python_module)))
 
-# a different error (open-never-closed)
-fd = open('foo')
+        assert ret == 1
+        # codes for rules which are not enabled are left alone
+        assert python_module.read_text() == """\
+import os  # noqa: F401
+import sys  # noqa: F401
+x = 1  # a comment
+y = 2  # noqa: E501
 """
 
         captured = capsys.readouterr()
@@ -381,61 +729,826 @@ fd = open('foo')
 {python_module}
 """
         assert captured.err == """\
--> finding errors with semgrep
-found errors in 1 files
--> adding comments to silence errors
+-> finding unused comments with ruff
+-> removing unused codes from comments
 """
 
-    def test_main_no_violations(
+    def test_prune_no_unused_comments(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
-        src = """\
-def foo():
-    print('hello there')
-"""
-
         python_module = tmp_path / 't.py'
-        python_module.write_text(src)
+        python_module.write_text('import os  # noqa: F401\n')
 
-        with mock.patch.dict(os.environ, {'SEMGREP_RULES': 'r/python'}):
-            ret = main(
-                (
-                    'semgrep',
-                    'python.lang.best-practice.sleep.arbitrary-sleep',
-                    str(python_module),
-                ),
-            )
+        ret = main(('prune', 'ruff', '--prefix', 'F401', str(python_module)))
 
         assert ret == 0
-        assert python_module.read_text() == src
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
 
         captured = capsys.readouterr()
         assert captured.out == ''
         assert captured.err == """\
--> finding errors with semgrep
-no errors found
+-> finding unused comments with ruff
+no unused comments found
 """
 
-    def test_not_installed(self, capsys: pytest.CaptureFixture[str]) -> None:
-        with FakeProcess() as process:
-            process.register(
-                ('semgrep', process.any()),
-                returncode=1, stderr='zsh: command not found: semgrep\n',
-            )
+    def test_main_file_level_threshold(self, tmp_path: Path) -> None:
+        many = tmp_path / 'many.py'
+        many.write_text('import os\nimport sys\n')
+        few = tmp_path / 'few.py'
+        few.write_text('import os\n')
+
+        ret = main((
+            'ruff', 'F401', str(many), str(few), '--file-level-threshold', '1',
+        ))
 
-            ret = main(('semgrep', 'semgrep.rule', 'path/to/file.py'))
+        assert ret == 1
+        assert many.read_text() == '# ruff: noqa: F401\nimport os\nimport sys\n'
+        assert few.read_text() == 'import os  # noqa: F401\n'
+
+    def test_main_file_level_threshold_not_supported(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(SystemExit) as excinfo:
+            main(('flake8', 'F401', 't.py', '--file-level-threshold', '1'))
+
+        assert excinfo.value.code == 2
+        captured = capsys.readouterr()
+        assert captured.err.endswith(
+            'error: --file-level-threshold is not supported for flake8\n',
+        )
+
+    def test_main_in_config(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        (tmp_path / 'pkg').mkdir()
+        (tmp_path / 'pkg/a.py').write_text('import os\n')
+        (tmp_path / 'pkg/b.py').write_text('import sys\n')
+        (tmp_path / 'c.py').write_text('import os\n')
+        (tmp_path / 'd.py').write_text('x = 1\n')
+        monkeypatch.chdir(tmp_path)
+
+        ret = main(('ruff', 'F401', '.', '--in-config'))
 
         assert ret == 1
+        assert (tmp_path / 'pkg/a.py').read_text() == 'import os\n'
+        assert (tmp_path / 'ruff.toml').read_text() == """\
+[lint.per-file-ignores]
+"c.py" = ["F401"]
+"pkg/**" = ["F401"]
+"""
 
         captured = capsys.readouterr()
-        assert captured.out == ''
+        assert captured.out == f"""\
+{tmp_path / 'ruff.toml'}
+"""
         assert captured.err == """\
--> finding errors with semgrep
-ERROR: zsh: command not found: semgrep
+-> finding errors with ruff
+found errors in 3 files
+-> silencing errors in config
+"""
+
+        # the errors are silenced
+        assert main(('ruff', 'F401', '.')) == 0
+
+    def test_main_in_config_not_supported(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(SystemExit) as excinfo:
+            main(('fixit', 'fixit.rules', 't.py', '--in-config'))
+
+        assert excinfo.value.code == 2
+        captured = capsys.readouterr()
+        assert captured.err.endswith(
+            'error: --in-config is not supported for fixit\n',
+        )
+
+    def test_main_stdin_filename(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        # the config for the file applies, though the file does not exist
+        (tmp_path / 'ruff.toml').write_text("""\
+[lint.per-file-ignores]
+"tests/*" = ["F401"]
+""")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'import os\nimport sys\n')),
+        )
+
+        ret = main(('ruff', 'F401', '--stdin-filename', 'pkg/t.py'))
+
+        assert ret == 0
+        assert not (tmp_path / 'pkg').exists()
+        captured = capsys.readouterr()
+        assert captured.out == 'import os  # noqa: F401\nimport sys  # noqa: F401\n'
+
+        monkeypatch.setattr(
+            sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'import os\n')),
+        )
+
+        ret = main(('ruff', 'F401', '--stdin-filename', 'tests/t.py'))
+
+        assert ret == 0
+        captured = capsys.readouterr()
+        assert captured.out == 'import os\n'
+        assert captured.err == 'no errors found\n'
+
+    def test_main_files_from_stdin(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        (tmp_path / 'a.py').write_text('import os\n')
+        (tmp_path / 'b.py').write_text('import sys\n')
+        (tmp_path / 'c.py').write_text('import glob\n')
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'a.py\0b.py\0')),
+        )
+
+        ret = main(('ruff', 'F401', 'c.py', '--files-from', '-', '-0'))
+
+        assert ret == 1
+        assert (tmp_path / 'a.py').read_text() == 'import os  # noqa: F401\n'
+        assert (tmp_path / 'b.py').read_text() == 'import sys  # noqa: F401\n'
+        assert (tmp_path / 'c.py').read_text() == 'import glob  # noqa: F401\n'
+
+    def test_main_null_without_files_from(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(SystemExit) as excinfo:
+            main(('ruff', 'F401', 't.py', '-0'))
+
+        assert excinfo.value.code == 2
+        captured = capsys.readouterr()
+        assert captured.err.endswith(
+            'error: --null can only be given with --files-from\n',
+        )
+
+    def test_main_unknown_rule(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+
+        ret = main(('ruff', 'F4O1', str(python_module)))
+
+        assert ret == 1
+        assert python_module.read_text() == 'import os\n'
+        captured = capsys.readouterr()
+        assert captured.err == (
+            "ERROR: unknown rule 'F4O1' for ruff: "
+            'Unknown rule selector `F4O1` in `select` from the CLI\n'
+        )
+
+    def test_main_stdin_filename_with_filenames(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(SystemExit) as excinfo:
+            main(('ruff', 'F401', 't.py', '--stdin-filename', 't.py'))
+
+        assert excinfo.value.code == 2
+        captured = capsys.readouterr()
+        assert 'cannot be given with --stdin-filename' in captured.err
+
+    def test_main_stdin_filename_not_supported(
+            self, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(SystemExit) as excinfo:
+            main(('fixit', 'fixit.rules', '--stdin-filename', 't.py'))
+
+        assert excinfo.value.code == 2
+        captured = capsys.readouterr()
+        assert captured.err.endswith(
+            'error: --stdin-filename is not supported for fixit\n',
+        )
+
+    @pytest.mark.parametrize(
+        'paths', (pytest.param(('.',), id='paths'), pytest.param((), id='no-paths')),
+    )
+    def test_main_per_config_root(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            paths: tuple[str, ...],
+    ) -> None:
+        (tmp_path / 'pkg_a').mkdir()
+        (tmp_path / 'pkg_a/pyproject.toml').write_text("""\
+[tool.ruff.lint.per-file-ignores]
+"*.py" = ["F401"]
+""")
+        (tmp_path / 'pkg_a/a.py').write_text('import os\n')
+        (tmp_path / 'pkg_b').mkdir()
+        (tmp_path / 'pkg_b/pyproject.toml').write_text('[tool.ruff]\n')
+        (tmp_path / 'pkg_b/b.py').write_text('import os\n')
+        monkeypatch.chdir(tmp_path)
+
+        ret = main(('ruff', 'F401', *paths, '--per-config-root'))
+
+        assert ret == 1
+        assert (tmp_path / 'pkg_a/a.py').read_text() == 'import os\n'
+        assert (tmp_path / 'pkg_b/b.py').read_text() == 'import os  # noqa: F401\n'
+
+    def test_main_verify_errors_remain(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        ruff = ('ruff', 'check', '--select', 'F401', '--output-format', 'json')
+        output = json.dumps([{
+            'code': 'F401',
+            'filename': str(python_module),
+            'location': {'row': 1, 'column': 8},
+        }])
+
+        with FakeProcess() as process:
+            # the error is still reported after adding a comment
+            process.register((*ruff, str(python_module)), stdout=output)
+            process.register((*ruff, str(python_module)), stdout=output)
+
+            ret = main((
+                'ruff', 'F401', str(python_module), '--verify', '--no-preflight',
+            ))
+
+        assert ret == 1
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+        captured = capsys.readouterr()
+        assert captured.err == f"""\
+-> finding errors with ruff
+found errors in 1 files
+-> adding comments to silence errors
+-> checking for errors in 1 changed files
+WARNING: errors are still reported in 1 files:
+  {python_module}
+"""
+
+    @pytest.mark.parametrize(
+        'returncode, stdout, stderr, expected_error', (
+            pytest.param(
+                1, '', '/path/to/python3: No module named ruff\n',
+                'ERROR: /path/to/python3: No module named ruff',
+                id='error-running-tool',
+            ),
+            pytest.param(
+                1,
+                json.dumps([
+                    {'code': 'F401', 'filename': 't.py', 'location': {'row': 1}},
+                    {'code': 'F811', 'filename': 't.py', 'location': {'row': 2}},
+                ]),
+                '',
+                "ERROR: errors found for multiple rules: ['F401', 'F811']",
+                id='multiple-rules',
+            ),
+        ),
+    )
+    def test_main_verify_fails(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+            returncode: int, stdout: str, stderr: str, expected_error: str,
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        ruff = ('ruff', 'check', '--select', 'F401', '--output-format', 'json')
+        output = json.dumps([{
+            'code': 'F401',
+            'filename': str(python_module),
+            'location': {'row': 1, 'column': 8},
+        }])
+
+        with FakeProcess() as process:
+            process.register((*ruff, str(python_module)), stdout=output)
+            process.register(
+                (*ruff, str(python_module)),
+                returncode=returncode, stdout=stdout, stderr=stderr,
+            )
+
+            ret = main((
+                'ruff', 'F401', str(python_module), '--verify', '--no-preflight',
+            ))
+
+        assert ret == 1
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+        captured = capsys.readouterr()
+        assert captured.err == f"""\
+-> finding errors with ruff
+found errors in 1 files
+-> adding comments to silence errors
+-> checking for errors in 1 changed files
+{expected_error}
+"""
+
+    def test_main_progress(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+
+        ret = main(('ruff', 'F401', str(python_module), '--progress'))
+
+        assert ret == 1
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert re.fullmatch(
+            r"""-> finding errors with ruff
+found errors in 1 files
+-> adding comments to silence errors
+adding comments: 1/1 files in 0:00, \d+ files/s, [\d.]+ \w+/s
+""",
+            captured.err,
+        )
+
+    def test_main_no_violations(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        src = """\
+def foo():
+    print('hello there')
+"""
+
+        python_module = tmp_path / 't.py'
+        python_module.write_text(src)
+
+        ret = main(('ruff', 'F401', str(python_module)))
+
+        assert ret == 0
+        assert python_module.read_text() == src
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == """\
+-> finding errors with ruff
+no errors found
+"""
+
+    def test_main_preserves_encoding_and_line_endings(
+            self, tmp_path: Path,
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_bytes(
+            b'\xef\xbb\xbfimport sys\r\n'
+            b's = "\xc3\xa9"\r\n',
+        )
+
+        ret = main(('ruff', 'F401', str(python_module)))
+
+        assert ret == 1
+        assert python_module.read_bytes() == (
+            b'\xef\xbb\xbfimport sys  # noqa: F401\r\n'
+            b's = "\xc3\xa9"\r\n'
+        )
+
+    def test_main_with_journal(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import sys\n')
+        journal = tmp_path / 'journal'
+
+        ret = main(
+            ('ruff', 'F401', str(python_module), '--journal', str(journal)),
+        )
+
+        assert ret == 1
+        assert python_module.read_text() == 'import sys  # noqa: F401\n'
+        assert journal.read_text().splitlines() == [
+            json.dumps(
+                {
+                    'linter': 'ruff', 'rule_name': 'F401',
+                    'paths': [str(python_module)],
+                    'violations': {str(python_module): {'F401': [1]}},
+                },
+                separators=(',', ':'),
+            ),
+            json.dumps(
+                {'done': str(python_module), 'changed': True},
+                separators=(',', ':'),
+            ),
+            json.dumps({'complete': True}, separators=(',', ':')),
+        ]
+
+    def test_main_with_finished_journal(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import sys\n')
+        journal = tmp_path / 'journal'
+        argv = ('ruff', 'F401', str(python_module), '--journal', str(journal))
+        main(argv)
+        python_module.write_text('import os\n')
+
+        # the run is not resumed, so the new error is silenced
+        ret = main(argv)
+
+        assert ret == 1
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+    def test_main_resume_from_journal(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        done_module = tmp_path / 'done.py'
+        done_module.write_text('import sys  # noqa: F401\n')
+        todo_module = tmp_path / 'todo.py'
+        todo_module.write_text('import sys\n')
+        journal = tmp_path / 'journal'
+        journal.write_text(
+            json.dumps({
+                'linter': 'ruff', 'rule_name': 'F401', 'paths': [str(tmp_path)],
+                'violations': {
+                    str(done_module): {'F401': [1]},
+                    str(todo_module): {'F401': [1]},
+                },
+            }) + '\n'
+            + json.dumps({'done': str(done_module), 'changed': True}) + '\n',
+        )
+
+        with FakeProcess():  # the linter must not be run again
+            ret = main(('ruff', 'F401', str(tmp_path), '--journal', str(journal)))
+
+        assert ret == 1
+        assert done_module.read_text() == 'import sys  # noqa: F401\n'
+        assert todo_module.read_text() == 'import sys  # noqa: F401\n'
+
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{todo_module}
+"""
+        assert captured.err == f"""\
+-> resuming from {journal}: 1 of 2 files already done
+-> adding comments to silence errors
+"""
+
+    def test_main_journal_for_other_rule(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        journal = tmp_path / 'journal'
+        journal.write_text(
+            json.dumps({
+                'linter': 'ruff', 'rule_name': 'F401', 'paths': [str(tmp_path)],
+                'violations': {},
+            }) + '\n',
+        )
+
+        ret = main(('ruff', 'E501', str(tmp_path), '--journal', str(journal)))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == f"""\
+ERROR: {journal} is a journal for 'F401' with ruff
+"""
+
+    def test_main_journal_for_other_paths(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        journal = tmp_path / 'journal'
+        journal.write_text(
+            json.dumps({
+                'linter': 'ruff', 'rule_name': 'F401',
+                'paths': [str(tmp_path / 'src')], 'violations': {},
+            }) + '\n',
+        )
+
+        ret = main(('ruff', 'F401', str(tmp_path), '--journal', str(journal)))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == f"""\
+ERROR: {journal} is a journal for other paths
+"""
+
+    def test_main_from_report(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import sys\nimport os\n')
+        report = tmp_path / 'report.json'
+        report.write_text(
+            json.dumps([
+                {
+                    'code': 'F401', 'filename': str(python_module),
+                    'location': {'row': 2, 'column': 8},
+                },
+            ]),
+        )
+
+        with FakeProcess():  # the linter must not be run
+            ret = main(('ruff', 'F401', '--from-report', str(report)))
+
+        assert ret == 1
+        assert python_module.read_text() == 'import sys\nimport os  # noqa: F401\n'
+
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert captured.err == f"""\
+-> reading errors from {report}
+found errors in 1 files
+-> adding comments to silence errors
+"""
+
+    def test_main_from_invalid_report(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        report = tmp_path / 'report.json'
+        report.write_text('[{"code": "F401"')
+
+        ret = main(('ruff', 'F401', '--from-report', str(report)))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err.startswith(f"""\
+-> reading errors from {report}
+ERROR: could not read {report}: invalid report (""")
+
+    def test_main_shards_and_merge(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        for i in range(10):
+            (tmp_path / f'mod_{i}.py').write_text('import sys\n')
+        outputs = [str(tmp_path / f'shard_{i}.json') for i in (1, 2)]
+
+        for i, output in enumerate(outputs, start=1):
+            ret = main(
+                (
+                    'ruff', 'F401', str(tmp_path),
+                    '--shard', f'{i}/2', '--output', output,
+                ),
+            )
+            assert ret == 0
+
+        # nothing is changed until the outputs are merged
+        assert {
+            module.read_text() for module in tmp_path.glob('*.py')
+        } == {'import sys\n'}
+        capsys.readouterr()
+
+        ret = main(('merge', *outputs))
+
+        assert ret == 1
+        assert {
+            module.read_text() for module in tmp_path.glob('*.py')
+        } == {'import sys  # noqa: F401\n'}
+
+        captured = capsys.readouterr()
+        assert sorted(captured.out.splitlines()) == sorted(
+            str(module) for module in tmp_path.glob('*.py')
+        )
+        assert captured.err == """\
+-> merged errors in 10 files from 2 outputs
+-> adding comments to silence errors
+"""
+
+    def test_main_shard_without_paths(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        for i in range(3):
+            (tmp_path / f'mod_{i}.py').write_text('import sys\n')
+        monkeypatch.chdir(tmp_path)
+
+        # like the linter, the current directory is checked
+        ret = main(('ruff', 'F401', '--shard', '1/3'))
+
+        assert ret == 1
+        assert [
+            (tmp_path / f'mod_{i}.py').read_text() for i in range(3)
+        ] == ['import sys  # noqa: F401\n', 'import sys\n', 'import sys  # noqa: F401\n']
+
+    def test_merge_different_rules(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        outputs = []
+        for rule_name in ('F401', 'E501'):
+            output = tmp_path / f'{rule_name}.json'
+            output.write_text(
+                json.dumps({
+                    'linter': 'ruff', 'rule_name': rule_name, 'paths': ['.'],
+                    'violations': {'t.py': {rule_name: [1]}},
+                }) + '\n',
+            )
+            outputs.append(str(output))
+
+        ret = main(('merge', *outputs))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == f"""\
+ERROR: {outputs[1]} has errors for 'E501' with ruff, not 'F401' with ruff
+"""
+
+    def test_ignores_modules_with_syntax_error(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+import sys
+""")
+        invalid_module = tmp_path / 'y.py'
+        invalid_module.write_text("""\
+import sys
+
+print(
+""")
+
+        ret = main(('ruff', 'F401', str(tmp_path)))
+
+        assert ret == 1
+        assert python_module.read_text() == """\
+import sys  # noqa: F401
+"""
+        assert invalid_module.read_text() == """\
+import sys
+
+print(
+"""
+
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert captured.err == """\
+-> finding errors with ruff
+found errors in 1 files
+-> adding comments to silence errors
+"""
+
+    def test_not_installed(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with FakeProcess() as process:
+            process.register(
+                ('ruff', process.any()),
+                returncode=1, stderr='/path/to/python3: No module named ruff\n',
+            )
+
+            ret = main(('ruff', 'F401', 'path/to/file.py', '--no-preflight'))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == """\
+-> finding errors with ruff
+ERROR: /path/to/python3: No module named ruff
+"""
+
+
+class TestSemgrep:
+    def test_main(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text(
+            """\
+import time
+
+time.sleep(5)
+
+# a different error (open-never-closed)
+fd = open('foo')
+""",
+        )
+
+        with mock.patch.dict(os.environ, {'SEMGREP_RULES': 'r/python'}):
+            ret = main(
+                (
+                    'semgrep',
+                    'python.lang.best-practice.sleep.arbitrary-sleep',
+                    str(python_module),
+                ),
+            )
+
+        assert ret == 1
+        assert python_module.read_text() == """\
+import time
+
+# nosemgrep: python.lang.best-practice.sleep.arbitrary-sleep
+time.sleep(5)
+
+# a different error (open-never-closed)
+fd = open('foo')
+"""
+
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert captured.err == """\
+-> finding errors with semgrep
+found errors in 1 files
+-> adding comments to silence errors
+"""
+
+    def test_main_no_violations(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        src = """\
+def foo():
+    print('hello there')
+"""
+
+        python_module = tmp_path / 't.py'
+        python_module.write_text(src)
+
+        with mock.patch.dict(os.environ, {'SEMGREP_RULES': 'r/python'}):
+            ret = main(
+                (
+                    'semgrep',
+                    'python.lang.best-practice.sleep.arbitrary-sleep',
+                    str(python_module),
+                ),
+            )
+
+        assert ret == 0
+        assert python_module.read_text() == src
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == """\
+-> finding errors with semgrep
+no errors found
+"""
+
+    def test_not_installed(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with FakeProcess() as process:
+            process.register(
+                ('semgrep', process.any()),
+                returncode=1, stderr='zsh: command not found: semgrep\n',
+            )
+
+            ret = main(('semgrep', 'semgrep.rule', 'path/to/file.py', '--no-preflight'))
+
+        assert ret == 1
+
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == """\
+-> finding errors with semgrep
+ERROR: zsh: command not found: semgrep
+"""
+
+    def test_prune(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+import time
+
+# nosemgrep: python.lang.best-practice.sleep.arbitrary-sleep
+time.sleep(5)
+
+# nosemgrep: python.lang.best-practice.sleep.arbitrary-sleep
+x = 1
+
+# nosemgrep: python.my-own-rule
+y = 2
+""")
+
+        with mock.patch.dict(os.environ, {'SEMGREP_RULES': 'r/python'}):
+            ret = main((
+                'prune', 'semgrep', '--prefix', 'python', str(python_module),
+            ))
+
+        assert ret == 1
+        # rules which were not run may be in another config, so are kept
+        assert python_module.read_text() == """\
+import time
+
+# nosemgrep: python.lang.best-practice.sleep.arbitrary-sleep
+time.sleep(5)
+
+x = 1
+
+# nosemgrep: python.my-own-rule
+y = 2
 """
 
 
 class TestMypy:
+    def test_survey_json(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        (tmp_path / 't.py').write_text("""\
+x: int = 'a'
+y: str = 1
+z = x.foo
+""")
+        monkeypatch.chdir(tmp_path)
+
+        ret = main(('survey', 'mypy', 't.py', '--format', 'json'))
+
+        assert ret == 0
+        captured = capsys.readouterr()
+        assert json.loads(captured.out) == {
+            'rules': {
+                'assignment': {'violations': 2, 'files': 1},
+                'attr-defined': {'violations': 1, 'files': 1},
+            },
+            'directories': {
+                '.': {'violations': 3, 'files': 1},
+            },
+        }
+
     def test_main(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
         (tmp_path / '__init__.py').touch()
         python_module = tmp_path / 't.py'
@@ -487,6 +1600,34 @@ found errors in 1 files
 -> adding comments to silence errors
 """
 
+    def test_main_stdin_filename(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        (tmp_path / 'y.py').write_text('def g() -> int:\n    return 1\n')
+        python_module = tmp_path / 't.py'
+        python_module.write_text('x = 1\n')
+        monkeypatch.chdir(tmp_path)
+        # the buffer is checked in place of the file, so imports still resolve
+        monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b"""\
+from y import g
+
+def f() -> str:
+    return g()
+""")))
+
+        ret = main(('mypy', 'return-value', '--stdin-filename', 't.py'))
+
+        assert ret == 0
+        assert python_module.read_text() == 'x = 1\n'
+        captured = capsys.readouterr()
+        assert captured.out == """\
+from y import g
+
+def f() -> str:
+    return g()  # type: ignore[return-value]
+"""
+
     def test_main_no_violations(
             self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
     ) -> None:
@@ -517,7 +1658,7 @@ no errors found
                 returncode=127, stderr='zsh: command not found: mypy\n',
             )
 
-            ret = main(('mypy', 'return-value', 'path/to/file.py'))
+            ret = main(('mypy', 'return-value', 'path/to/file.py', '--no-preflight'))
 
         assert ret == 127
 
@@ -526,4 +1667,54 @@ no errors found
         assert captured.err == """\
 -> finding errors with mypy
 ERROR: zsh: command not found: mypy
+"""
+
+    def test_prune(
+            self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+x: int = 'a'  # type: ignore[assignment, misc]
+y = 1  # type: ignore[attr-defined]  # a comment
+z = 2  # type: ignore
+""")
+
+        ret = main(('prune', 'mypy', str(python_module)))
+
+        assert ret == 1
+        # blanket comments are left alone
+        assert python_module.read_text() == """\
+x: int = 'a'  # type: ignore[assignment]
+y = 1  # a comment
+z = 2  # type: ignore
+"""
+
+        captured = capsys.readouterr()
+        assert captured.out == f"""\
+{python_module}
+"""
+        assert captured.err == """\
+-> finding unused comments with mypy
+-> removing unused codes from comments
+"""
+
+    def test_main_file_level_threshold(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text("""\
+#!/usr/bin/env python
+x: int = 'a'
+y: int = 'b'
+""")
+
+        ret = main((
+            'mypy', 'assignment', str(python_module),
+            '--file-level-threshold', '1',
+        ))
+
+        assert ret == 1
+        assert python_module.read_text() == """\
+#!/usr/bin/env python
+# mypy: disable-error-code="assignment"
+x: int = 'a'
+y: int = 'b'
 """
@@ -4,8 +4,12 @@ import pytest
 
 from silence_lint_error.comments import add_code_to_comment
 from silence_lint_error.comments import add_error_silencing_comments
+from silence_lint_error.comments import add_file_level_comment
 from silence_lint_error.comments import add_noqa_comments
+from silence_lint_error.comments import find_silencing_comments
 from silence_lint_error.comments import remove_code_from_comment
+from silence_lint_error.comments import remove_code_from_file_level_comments
+from silence_lint_error.comments import remove_codes_from_comments
 from silence_lint_error.comments import remove_error_silencing_comments
 
 
@@ -144,6 +148,9 @@ hello there
         ('something  # noqa: XYZ0', 'something  # noqa: ABC1,XYZ0'),
         ('noqa: XYZ0  # something', 'noqa: ABC1,XYZ0  # something'),
         ('noqa: XYZ0  # noqa: UVW3', 'noqa: ABC1,XYZ0  # noqa: UVW3'),
+        ('noqa: ABC1', 'noqa: ABC1'),
+        ('noqa: XYZ0,ABC1  # something', 'noqa: XYZ0,ABC1  # something'),
+        ('noqa: ABC12', 'noqa: ABC1,ABC12'),
     ),
 )
 def test_add_code_to_comment(original: str, expected: str) -> None:
@@ -163,7 +170,111 @@ def test_add_code_to_comment(original: str, expected: str) -> None:
         ('# noqa: XYZ0,ABC1  # something', '# noqa: XYZ0  # something'),
         ('# noqa: ABC1,XYZ0  # noqa: UVW3', '# noqa: XYZ0  # noqa: UVW3'),
         ('# noqa: XYZ0,ABC1  # noqa: UVW3', '# noqa: XYZ0  # noqa: UVW3'),
+        ('# noqa: ABC1, XYZ0', '# noqa: XYZ0'),
+        ('# noqa: XYZ0, ABC1', '# noqa: XYZ0'),
+        ('#noqa:ABC1', ''),
+        ('# noqa: ABC12,XYZ0', '# noqa: ABC12,XYZ0'),
+        ('# noqa: XYZ0,ABC12', '# noqa: XYZ0,ABC12'),
     ),
 )
 def test_remove_code_from_comment(original: str, expected: str) -> None:
     assert remove_code_from_comment(original, 'noqa', 'ABC1') == expected
+
+
+def test_find_silencing_comments() -> None:
+    src = """\
+foo = 'bar'  # silence-me: ABC123
+baz = 'qux'  # silence-me
+# silence-me: ABC123, DEF456
+s = '''
+hello there
+'''  # silence-me: DEF456
+"""
+
+    assert find_silencing_comments(src, 'silence-me') == [
+        (range(1, 2), ['ABC123']),
+        (range(3, 4), ['ABC123', 'DEF456']),
+        (range(4, 7), ['DEF456']),
+    ]
+
+
+def test_remove_codes_from_comments() -> None:
+    src = """\
+foo = 'bar'  # silence-me: ABC123
+def baz():
+    # silence-me: ABC123,DEF456
+    return 'qux'  # silence-me: DEF456, ABC123  # a comment
+
+foo = 'bar'  # silence-me: GHI789
+"""
+
+    assert remove_codes_from_comments(
+        src, 'silence-me', {1: ['ABC123'], 3: ['ABC123', 'DEF456'], 4: ['DEF456']},
+    ) == """\
+foo = 'bar'
+def baz():
+    return 'qux'  # silence-me: ABC123  # a comment
+
+foo = 'bar'  # silence-me: GHI789
+"""
+
+
+@pytest.mark.parametrize(
+    'original, expected', (
+        ('', '# silence-me: ABC1\n'),
+        ('x = 1\n', '# silence-me: ABC1\nx = 1\n'),
+        ('# a comment\nx = 1\n', '# silence-me: ABC1\n# a comment\nx = 1\n'),
+        (
+            '#!/usr/bin/env python\nx = 1\n',
+            '#!/usr/bin/env python\n# silence-me: ABC1\nx = 1\n',
+        ),
+        (
+            '#!/usr/bin/env python\n# -*- coding: latin-1 -*-\nx = 1\n',
+            '#!/usr/bin/env python\n# -*- coding: latin-1 -*-\n'
+            '# silence-me: ABC1\nx = 1\n',
+        ),
+        ('#!/usr/bin/env python', '#!/usr/bin/env python\n# silence-me: ABC1\n'),
+        ('x = 1\r\n', '# silence-me: ABC1\r\nx = 1\r\n'),
+        # already silenced
+        ('# silence-me: ABC1\nx = 1\n', '# silence-me: ABC1\nx = 1\n'),
+        (
+            '# silence-me: XYZ0\nx = 1\n',
+            '# silence-me: ABC1\n# silence-me: XYZ0\nx = 1\n',
+        ),
+    ),
+)
+def test_add_file_level_comment(original: str, expected: str) -> None:
+    assert add_file_level_comment(original, '# silence-me: ABC1') == expected
+
+
+@pytest.mark.parametrize(
+    'original, expected', (
+        ('# tool: silence-me: ABC1\nx = 1\n', 'x = 1\n'),
+        ('# tool: silence-me: ABC1\r\nx = 1\r\n', 'x = 1\r\n'),
+        ('# tool: silence-me: ABC1', ''),
+        (
+            '#!/usr/bin/env python\n# tool: silence-me: ABC1\nx = 1\n',
+            '#!/usr/bin/env python\nx = 1\n',
+        ),
+        (
+            '# tool: silence-me: ABC1, XYZ0\nx = 1\n',
+            '# tool: silence-me: XYZ0\nx = 1\n',
+        ),
+        (
+            '# tool: silence-me: XYZ0\n# tool: silence-me: ABC1\nx = 1\n',
+            '# tool: silence-me: XYZ0\nx = 1\n',
+        ),
+        # not in the header of the module
+        (
+            'x = 1\n# tool: silence-me: ABC1\n',
+            'x = 1\n# tool: silence-me: ABC1\n',
+        ),
+        ('# tool: silence-me: ABC12\n', '# tool: silence-me: ABC12\n'),
+    ),
+)
+def test_remove_code_from_file_level_comments(
+        original: str, expected: str,
+) -> None:
+    assert remove_code_from_file_level_comments(
+        original, 'tool: silence-me', 'ABC1',
+    ) == expected
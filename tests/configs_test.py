@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error.configs import find_config
+from silence_lint_error.configs import find_section
+from silence_lint_error.configs import group_paths
+from silence_lint_error.configs import ini_add_to_list
+from silence_lint_error.configs import toml_add_to_array
+
+
+def _touch(root: Path, *paths: str) -> None:
+    for path in paths:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).touch()
+
+
+def test_group_paths(tmp_path: Path) -> None:
+    _touch(
+        tmp_path,
+        'a.py', 'b.py',
+        'full/a.py', 'full/sub/b.py',
+        'partial/a.py', 'partial/b.py', 'partial/full/c.py',
+    )
+
+    assert group_paths(
+        [
+            str(tmp_path / path) for path in (
+                'a.py',
+                'full/a.py', 'full/sub/b.py',
+                'partial/a.py', 'partial/full/c.py',
+            )
+        ],
+        str(tmp_path),
+    ) == ['a.py', 'full/', 'partial/a.py', 'partial/full/']
+
+
+def test_group_paths_only_groups_some_directories(tmp_path: Path) -> None:
+    _touch(tmp_path, 'full/a.py', 'full/sub/b.py')
+
+    assert group_paths(
+        [str(tmp_path / 'full/a.py'), str(tmp_path / 'full/sub/b.py')],
+        str(tmp_path),
+        can_group=lambda directory: directory == 'full/sub',
+    ) == ['full/a.py', 'full/sub/']
+
+
+def test_group_paths_outside_root(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        group_paths([str(tmp_path / 'a.py')], str(tmp_path / 'sub'))
+
+
+def test_find_config(tmp_path: Path) -> None:
+    (tmp_path / 'setup.cfg').write_text('[metadata]\nname = x\n')
+    (tmp_path / 'pyproject.toml').write_text('[tool.ruff.lint]\nselect = ["F"]\n')
+    (tmp_path / 'tox.ini').write_text('[flake8]\n')
+
+    candidates = (
+        ('ruff.toml', None),
+        ('setup.cfg', 'tool.ruff'),
+        ('pyproject.toml', 'tool.ruff'),
+    )
+    assert find_config(str(tmp_path), candidates) == str(tmp_path / 'pyproject.toml')
+    assert find_config(str(tmp_path), (('setup.cfg', 'flake8'),)) is None
+
+
+@pytest.mark.parametrize(
+    'original, expected', (
+        pytest.param(
+            '[t]\nk = ["a"]\n', '[t]\nk = ["a", "b"]\n',
+            id='extend',
+        ),
+        pytest.param(
+            '[t]\nk = [\n  "a",\n]\n\n[u]\nk = []\n',
+            '[t]\nk = ["a", "b"]\n\n[u]\nk = []\n',
+            id='extend-multi-line',
+        ),
+        pytest.param(
+            '[t]\nk = ["b"]\n', '[t]\nk = ["b"]\n',
+            id='already-included',
+        ),
+        pytest.param(
+            '[t]\nx = 1\n\n[u]\n', '[t]\nx = 1\nk = ["b"]\n\n[u]\n',
+            id='add',
+        ),
+        pytest.param(
+            '[t]\n[u]\n', '[t]\nk = ["b"]\n[u]\n',
+            id='add-to-empty-table',
+        ),
+        pytest.param(
+            '[t]\r\nk = "a"\r\n', '[t]\r\nk = ["a", "b"]\r\n',
+            id='string',
+        ),
+    ),
+)
+def test_toml_add_to_array(original: str, expected: str) -> None:
+    section = find_section(original, ('t',))
+    assert section is not None
+
+    assert toml_add_to_array(original, section, 'k', ['b']) == expected
+
+
+@pytest.mark.parametrize(
+    'original, expected', (
+        pytest.param(
+            '[s]\nk_ey = a\n', '[s]\nk_ey = a, b\n',
+            id='extend',
+        ),
+        pytest.param(
+            '[s]\nk-ey = a,b\n', '[s]\nk-ey = a, b\n',
+            id='already-included',
+        ),
+        pytest.param(
+            '[s]\nx = 1\n\n[t]\n', '[s]\nx = 1\nk_ey = b\n\n[t]\n',
+            id='add',
+        ),
+    ),
+)
+def test_ini_add_to_list(original: str, expected: str) -> None:
+    section = find_section(original, ('s',))
+    assert section is not None
+
+    assert ini_add_to_list(original, section, 'k_ey', ['b']) == expected
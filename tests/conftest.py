@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _cache_home(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    # keep the pre-flight cache out of the user's cache directory
+    cache_home = tmp_path_factory.mktemp('cache')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('XDG_CACHE_HOME', str(cache_home))
+        yield cache_home
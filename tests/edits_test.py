@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+from silence_lint_error.edits import EditPlan
+
+
+class TestEditPlan:
+    def test_no_edits(self) -> None:
+        src = 'a\nb\n'
+
+        assert EditPlan(src).apply() is src
+
+    def test_lines(self) -> None:
+        plan = EditPlan('a\r\nb\rc\nd')
+
+        assert len(plan) == 4
+        assert [plan.line(lineno) for lineno in range(1, 5)] == [
+            'a\r\n', 'b\r', 'c\n', 'd',
+        ]
+
+    @pytest.mark.parametrize('lineno', (0, 3))
+    def test_line_out_of_range(self, lineno: int) -> None:
+        with pytest.raises(IndexError):
+            EditPlan('a\nb\n').line(lineno)
+
+    def test_lineno_at(self) -> None:
+        plan = EditPlan('ab\ncd\n')
+
+        assert [plan.lineno_at(offset) for offset in range(6)] == [
+            1, 1, 1, 2, 2, 2,
+        ]
+
+    def test_apply(self) -> None:
+        plan = EditPlan('a\nb\nc\nd\n')
+        plan.replace(4, 'D\n')
+        plan.insert(2, '# one\n')
+        plan.insert(2, '# two\n')
+        plan.replace(3, '')
+        plan.insert(1, '# first\n')
+
+        assert plan.apply() == '# first\na\n# one\n# two\nb\nD\n'
+
+    def test_form_feed_is_not_a_newline(self) -> None:
+        plan = EditPlan('a\x0cb\nc\n')
+        plan.insert(2, '# here\n')
+
+        assert plan.apply() == 'a\x0cb\n# here\nc\n'
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error import files
+from silence_lint_error.files import chunk_args
+from silence_lint_error.files import discover
+from silence_lint_error.files import group_by_config_root
+from silence_lint_error.files import read_file_list
+from silence_lint_error.files import Shard
+
+
+def test_discover(tmp_path: Path) -> None:
+    for path in (
+            'b.py', 'a.py', 'c.pyi', 'README.md',
+            'pkg/__init__.py', 'pkg/sub/mod.py',
+            '.venv/lib/site.py', 'pkg/__pycache__/mod.py', 'build/lib/mod.py',
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    explicit = tmp_path / 'script'  # given explicitly, so included
+    explicit.touch()
+
+    assert [
+        Path(path).relative_to(tmp_path).as_posix()
+        for path in discover([str(tmp_path), str(explicit)])
+    ] == [
+        'a.py', 'b.py', 'c.pyi', 'pkg/__init__.py', 'pkg/sub/mod.py', 'script',
+    ]
+
+
+def test_group_by_config_root(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for path in (
+            'pyproject.toml',
+            'pkg_a/pyproject.toml', 'pkg_a/src/a.py', 'pkg_a/src/sub/a.py',
+            'pkg_b/tox.ini', 'pkg_b/b.py',
+            'tools/tool.py',
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    monkeypatch.chdir(tmp_path / 'pkg_a')
+
+    groups = group_by_config_root(
+        [
+            'src/a.py', '../pkg_b/b.py', 'src/sub/a.py',
+            str(tmp_path / 'tools/tool.py'),
+        ],
+        lambda directory: any(
+            os.path.isfile(os.path.join(directory, name))
+            for name in ('pyproject.toml', 'tox.ini')
+        ),
+    )
+
+    assert groups == {
+        str(tmp_path / 'pkg_a'): [
+            str(tmp_path / 'pkg_a/src/a.py'),
+            str(tmp_path / 'pkg_a/src/sub/a.py'),
+        ],
+        str(tmp_path / 'pkg_b'): [str(tmp_path / 'pkg_b/b.py')],
+        str(tmp_path): [str(tmp_path / 'tools/tool.py')],
+    }
+
+
+@pytest.mark.parametrize(
+    'content, null_separated', (
+        pytest.param(b'a.py\npkg/b.py\r\n\nc d.py', False, id='lines'),
+        pytest.param(b'a.py\0pkg/b.py\r\n\0\0c d.py\0', True, id='null-separated'),
+    ),
+)
+def test_read_file_list(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+        content: bytes, null_separated: bool,
+) -> None:
+    # names are split across reads
+    monkeypatch.setattr(files, '_READ_SIZE', 3)
+    (tmp_path / 'files').write_bytes(content)
+
+    assert list(
+        read_file_list(str(tmp_path / 'files'), null_separated=null_separated),
+    ) == ['a.py', 'pkg/b.py\r\n' if null_separated else 'pkg/b.py', 'c d.py']
+
+
+def test_chunk_args(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(files, 'MAX_ARGS_LENGTH', 10)
+
+    assert list(chunk_args(['a.py', 'b.py', 'long_name.py', 'c.py'])) == [
+        ['a.py', 'b.py'], ['long_name.py'], ['c.py'],
+    ]
+    assert list(chunk_args([])) == []
+
+
+@pytest.mark.parametrize('s', ('1/4', '4/4', '1/1'))
+def test_parse_shard(s: str) -> None:
+    index, count = map(int, s.split('/'))
+
+    assert Shard.parse(s) == Shard(index, count)
+
+
+@pytest.mark.parametrize('s', ('0/4', '5/4', '1', '1/', 'a/b', '-1/4', '1/0'))
+def test_parse_invalid_shard(s: str) -> None:
+    with pytest.raises(ValueError):
+        Shard.parse(s)
+
+
+def test_shards_partition_files() -> None:
+    filenames = [f'pkg/mod_{i}.py' for i in range(1000)]
+    shards = [Shard(index, 4) for index in range(1, 5)]
+
+    selected = [list(shard.select(filenames)) for shard in shards]
+
+    assert sorted(sum(selected, [])) == sorted(filenames)
+    # each shard gets a reasonable share of the files
+    assert all(200 < len(shard_files) < 300 for shard_files in selected)
+
+
+def test_shard_is_stable() -> None:
+    shard = Shard(1, 3)
+
+    assert [shard.includes(f'mod_{i}.py') for i in range(6)] == [
+        shard.includes(f'./mod_{i}.py') for i in range(6)
+    ]
+    # this must not change between versions, or releases would reshuffle shards
+    assert [i for i in range(10) if shard.includes(f'mod_{i}.py')] == [0, 2]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error.journal import Journal
+from silence_lint_error.silencing import ViolationSet
+
+PATHS = ['src/', 'tests/']
+
+
+@pytest.fixture
+def violations() -> ViolationSet:
+    violations = ViolationSet()
+    violations.add('a.py', 'ABC123', 1)
+    violations.add('a.py', 'ABC123', 4)
+    violations.add('b.py', 'ABC123', 2)
+    return violations
+
+
+def test_load_missing_journal(tmp_path: Path) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+
+    assert journal.load(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+    ) is None
+
+
+def test_round_trip(tmp_path: Path, violations: ViolationSet) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.start(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+        violations=violations,
+    )
+    journal.record('a.py', changed=True)
+    journal.close()
+
+    progress = Journal(journal.path).load(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+    )
+
+    assert progress is not None
+    assert progress.paths == PATHS
+    assert progress.violations == violations
+    assert progress.done == {'a.py': True}
+    assert not progress.complete
+
+
+def test_resume_after_interrupted_write(
+        tmp_path: Path, violations: ViolationSet,
+) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.start(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+        violations=violations,
+    )
+    journal.record('a.py', changed=True)
+    journal.close()
+    with open(journal.path, 'a') as f:
+        f.write('{"done":"b.p')  # killed part-way through a write
+
+    journal.resume()
+    journal.record('b.py', changed=False)
+    journal.close()
+
+    progress = journal.load(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+    )
+
+    assert progress is not None
+    assert progress.done == {'a.py': True, 'b.py': False}
+
+
+def test_mismatch(tmp_path: Path, violations: ViolationSet) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.start(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+        violations=violations,
+    )
+    journal.close()
+
+    with pytest.raises(Journal.Mismatch) as excinfo:
+        journal.load(linter_name='linter', rule_name='DEF456', paths=PATHS)
+
+    assert excinfo.value.linter_name == 'linter'
+    assert excinfo.value.rule_name == 'ABC123'
+
+
+def test_mismatched_paths(tmp_path: Path, violations: ViolationSet) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.start(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+        violations=violations,
+    )
+    journal.close()
+
+    with pytest.raises(Journal.Mismatch) as excinfo:
+        journal.load(linter_name='linter', rule_name='ABC123', paths=['src/'])
+
+    assert excinfo.value.paths == PATHS
+
+
+def test_finished_journal_is_not_resumed(
+        tmp_path: Path, violations: ViolationSet,
+) -> None:
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.start(
+        linter_name='linter', rule_name='ABC123', paths=PATHS,
+        violations=violations,
+    )
+    journal.record('a.py', changed=True)
+    journal.record('b.py', changed=False)
+    journal.finish()
+
+    progress = journal.read()
+
+    assert progress is not None
+    assert progress.complete
+    assert journal.load(linter_name='linter', rule_name='ABC123', paths=PATHS) is None
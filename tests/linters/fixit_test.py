@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 from pathlib import Path
 
 import pytest
@@ -96,3 +97,46 @@ isinstance(x, str) or isinstance(x, int)
                 Violation('CollapseIsinstanceChecks', 2),
             ],
         }
+
+    @pytest.mark.parametrize(
+        'rule_name, expected_violations', (
+            pytest.param(
+                'fixit.rules:CollapseIsinstanceChecks',
+                {'t.py': [Violation('CollapseIsinstanceChecks', 2)]},
+                id='rule',
+            ),
+            pytest.param(
+                'fixit.rules',
+                {
+                    't.py': [
+                        Violation('CollapseIsinstanceChecks', 2),
+                        Violation('NoStaticIfCondition', 4),
+                    ],
+                },
+                id='module',
+            ),
+        ),
+    )
+    def test_read_report(
+            self, rule_name: str, expected_violations: dict[str, list[Violation]],
+    ) -> None:
+        report = io.StringIO(
+            """\
+t.py@2:0 CollapseIsinstanceChecks: Multiple isinstance calls with the same target but different types can be collapsed into a single call with a tuple of types. (has autofix)
+t.py@4:0 NoStaticIfCondition: Your if condition appears to evaluate to a static value (e.g. `or True`, `and False`). Please double check this logic and if it is actually temporary debug code.
+🛠️  1 file checked, 1 file with errors, 1 auto-fix available 🛠️
+""",  # noqa: B950
+        )
+
+        violations = Fixit().read_report(rule_name, report)
+
+        assert violations == expected_violations
+
+    def test_silence_violations_skips_lines_past_end_of_file(self) -> None:
+        src = 'x = 1\n'
+
+        modified_src = Fixit().silence_violations(
+            src, (Violation('MyRule', 1), Violation('MyRule', 3)),
+        )
+
+        assert modified_src == '# lint-fixme: MyRule\nx = 1\n'
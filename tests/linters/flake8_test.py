@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from silence_lint_error.linters.flake8 import Flake8
+from silence_lint_error.silencing import Violation
+
+
+class TestReadReport:
+    def test_read_report(self) -> None:
+        report = io.StringIO(
+            """\
+t.py:1:1: F401 'os' imported but unused
+t.py:2:80: E501 line too long (88 > 79 characters)
+path/to/y.py:12:1: F403 'from os import *' used; unable to detect undefined names
+""",
+        )
+
+        violations = Flake8().read_report('F4', report)
+
+        assert violations == {
+            't.py': [Violation('F4', 1)],
+            'path/to/y.py': [Violation('F4', 12)],
+        }
+
+
+class TestSilenceInConfig:
+    def test_silence_in_config(self, tmp_path: Path) -> None:
+        for path in ('a.py', 'b.py', 'pkg/a.py', 'pkg/sub/b.py'):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        (tmp_path / 'setup.cfg').write_text("""\
+[flake8]
+max-line-length = 100
+per-file-ignores =
+    a.py:E501
+    pkg/sub/b.py: E303
+
+[other]
+""")
+
+        config_path = Flake8().silence_in_config(
+            'F401',
+            [str(tmp_path / path) for path in ('a.py', 'pkg/a.py', 'pkg/sub/b.py')],
+            str(tmp_path),
+        )
+
+        # flake8 only uses the longest matching pattern, so the rule is also
+        # silenced for pkg/sub/b.py
+        assert config_path == str(tmp_path / 'setup.cfg')
+        assert (tmp_path / 'setup.cfg').read_text() == """\
+[flake8]
+max-line-length = 100
+per-file-ignores =
+    a.py:E501,F401
+    pkg/sub/b.py: E303,F401
+    pkg/*:F401
+
+[other]
+"""
+
+    def test_silence_in_config_creates_config(self, tmp_path: Path) -> None:
+        (tmp_path / 'a.py').touch()
+        (tmp_path / 'b.py').touch()
+        (tmp_path / 'setup.cfg').write_text('[metadata]\nname = x\n')
+
+        config_path = Flake8().silence_in_config(
+            'F401', [str(tmp_path / 'a.py')], str(tmp_path),
+        )
+
+        assert config_path == str(tmp_path / '.flake8')
+        assert (tmp_path / '.flake8').read_text() == """\
+[flake8]
+per-file-ignores =
+    a.py:F401
+"""
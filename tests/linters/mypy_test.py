@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error.linters.mypy import Mypy
+from silence_lint_error.preflight import UnknownRule
+from silence_lint_error.silencing import Violation
+
+
+class TestReadReport:
+    def test_read_report(self) -> None:
+        report = io.StringIO(
+            """\
+t.py:4: error: Incompatible return value type (got "int", expected "str")  [return-value]
+t.py:7:5: error: Name "y" is not defined  [name-defined]
+pkg/y.py:2:12: error: Incompatible return value type (got "int", expected "str")  [return-value]
+Found 3 errors in 2 files (checked 2 source files)
+""",  # noqa: B950
+        )
+
+        violations = Mypy().read_report('return-value', report)
+
+        assert violations == {
+            't.py': [Violation('return-value', 4)],
+            'pkg/y.py': [Violation('return-value', 2)],
+        }
+
+
+class TestCheckRule:
+    def test_check_rule(self) -> None:
+        Mypy().check_rule('truthy-bool')
+
+    def test_check_unknown_rule(self) -> None:
+        with pytest.raises(UnknownRule) as excinfo:
+            Mypy().check_rule('truthy-boool')
+
+        assert excinfo.value.reason == 'Invalid error code(s): truthy-boool'
+
+
+class TestRemoveUnusedSilences:
+    def test_remove_unused_silences(self) -> None:
+        src = """\
+x = 1  # type: ignore[misc, assignment]
+y = 2  # noqa: E501  # type: ignore[misc]
+z = 3  # type: ignore[misc]
+"""
+
+        pruned = Mypy().remove_unused_silences(
+            src, [Violation('misc', 1), Violation('misc', 2)],
+        )
+
+        assert pruned == """\
+x = 1  # type: ignore[assignment]
+y = 2  # noqa: E501
+z = 3  # type: ignore[misc]
+"""
+
+
+class TestSilenceInConfig:
+    def test_silence_in_config_toml(self, tmp_path: Path) -> None:
+        for path in (
+                'pkg/__init__.py', 'pkg/a.py', 'pkg/b.py',
+                'pkg/sub/__init__.py', 'pkg/sub/c.py', 'scripts/d.py',
+        ):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        (tmp_path / 'pyproject.toml').write_text("""\
+[tool.mypy]
+strict = true
+
+[[tool.mypy.overrides]]
+module = [
+  "pkg.a",
+  "pkg.b",
+]
+ignore_missing_imports = true
+""")
+
+        config_path = Mypy().silence_in_config(
+            'assignment',
+            [
+                str(tmp_path / path) for path in (
+                    'pkg/a.py', 'pkg/sub/__init__.py', 'pkg/sub/c.py',
+                    'scripts/d.py',
+                )
+            ],
+            str(tmp_path),
+        )
+
+        assert config_path == str(tmp_path / 'pyproject.toml')
+        assert (tmp_path / 'pyproject.toml').read_text() == """\
+[tool.mypy]
+strict = true
+
+[[tool.mypy.overrides]]
+module = ["pkg.b"]
+ignore_missing_imports = true
+
+[[tool.mypy.overrides]]
+module = ["pkg.a"]
+ignore_missing_imports = true
+disable_error_code = ["assignment"]
+
+[[tool.mypy.overrides]]
+module = ["pkg.sub.*", "d"]
+disable_error_code = ["assignment"]
+"""
+
+    def test_silence_in_config_ini(self, tmp_path: Path) -> None:
+        for path in ('pkg/__init__.py', 'pkg/a.py', 'pkg/b.py'):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        (tmp_path / 'mypy.ini').write_text("""\
+[mypy]
+strict = True
+
+[mypy-pkg.a]
+disable_error_code = misc
+""")
+
+        config_path = Mypy().silence_in_config(
+            'assignment',
+            [str(tmp_path / 'pkg/a.py'), str(tmp_path / 'pkg/b.py')],
+            str(tmp_path),
+        )
+
+        assert config_path == str(tmp_path / 'mypy.ini')
+        assert (tmp_path / 'mypy.ini').read_text() == """\
+[mypy]
+strict = True
+
+[mypy-pkg.a]
+disable_error_code = misc, assignment
+
+[mypy-pkg.b]
+disable_error_code = assignment
+"""
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from silence_lint_error.configs import CannotEditConfig
+from silence_lint_error.linters.ruff import Ruff
+from silence_lint_error.silencing import Violation
+
+
+def _violation(code: str | None, filename: str, row: int) -> dict[str, Any]:
+    return {
+        'code': code,
+        'filename': filename,
+        'location': {'column': 1, 'row': row},
+        'message': 'the error message',
+    }
+
+
+VIOLATIONS = [
+    _violation('F401', '/src/t.py', 1),
+    _violation('E501', '/src/t.py', 2),
+    _violation(None, '/src/y.py', 3),  # syntax error
+    _violation('F401', '/src/y.py', 4),
+]
+
+
+class TestReadReport:
+    @pytest.mark.parametrize(
+        'report', (
+            pytest.param(json.dumps(VIOLATIONS, indent=2), id='json'),
+            pytest.param(
+                ''.join(json.dumps(v) + '\n' for v in VIOLATIONS),
+                id='json-lines',
+            ),
+        ),
+    )
+    def test_read_report(self, report: str) -> None:
+        violations = Ruff().read_report('F401', io.StringIO(report))
+
+        assert violations == {
+            '/src/t.py': [Violation('F401', 1)],
+            '/src/y.py': [Violation('F401', 4)],
+        }
+
+    def test_empty_report(self) -> None:
+        assert Ruff().read_report('F401', io.StringIO('[]')) == {}
+
+
+class TestSilenceInConfig:
+    def test_silence_in_config(self, tmp_path: Path) -> None:
+        for path in ('a.py', 'b.py', 'pkg/a.py', 'pkg/sub/b.py'):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        (tmp_path / 'pyproject.toml').write_text("""\
+[tool.ruff]
+line-length = 100
+
+[tool.ruff.lint.per-file-ignores]
+"a.py" = ["E501"]
+
+[tool.other]
+""")
+
+        config_path = Ruff().silence_in_config(
+            'F401',
+            [str(tmp_path / path) for path in ('a.py', 'pkg/a.py', 'pkg/sub/b.py')],
+            str(tmp_path),
+        )
+
+        assert config_path == str(tmp_path / 'pyproject.toml')
+        assert (tmp_path / 'pyproject.toml').read_text() == """\
+[tool.ruff]
+line-length = 100
+
+[tool.ruff.lint.per-file-ignores]
+"a.py" = ["E501", "F401"]
+"pkg/**" = ["F401"]
+
+[tool.other]
+"""
+
+    def test_silence_in_config_creates_config(self, tmp_path: Path) -> None:
+        (tmp_path / 'a.py').touch()
+        (tmp_path / 'b.py').touch()
+
+        config_path = Ruff().silence_in_config(
+            'F401', [str(tmp_path / 'a.py')], str(tmp_path),
+        )
+
+        assert config_path == str(tmp_path / 'ruff.toml')
+        assert (tmp_path / 'ruff.toml').read_text() == """\
+[lint.per-file-ignores]
+"a.py" = ["F401"]
+"""
+
+    def test_silence_in_config_already_silenced(self, tmp_path: Path) -> None:
+        (tmp_path / 'a.py').touch()
+        (tmp_path / 'b.py').touch()
+        (tmp_path / 'ruff.toml').write_text("""\
+[lint.per-file-ignores]
+"a.py" = ["F401"]
+""")
+
+        config_path = Ruff().silence_in_config(
+            'F401', [str(tmp_path / 'a.py')], str(tmp_path),
+        )
+
+        assert config_path is None
+
+    def test_silence_in_config_inline_table(self, tmp_path: Path) -> None:
+        (tmp_path / 'a.py').touch()
+        (tmp_path / 'b.py').touch()
+        (tmp_path / 'ruff.toml').write_text("""\
+[lint]
+per-file-ignores = {"b.py" = ["E501"]}
+""")
+
+        with pytest.raises(CannotEditConfig):
+            Ruff().silence_in_config(
+                'F401', [str(tmp_path / 'a.py')], str(tmp_path),
+            )
+
+
+class TestRemoveSilenceComments:
+    @pytest.mark.parametrize(
+        'src', (
+            pytest.param('import os\nimport sys\n', id='module'),
+            pytest.param(
+                '#!/usr/bin/env python\nimport os  # noqa: E501\n',
+                id='header',
+            ),
+        ),
+    )
+    def test_removes_file_level_comment(self, src: str) -> None:
+        ruff = Ruff()
+        silenced_src = ruff.silence_file(src, 'F401')
+        assert silenced_src != src
+
+        assert ruff.remove_silence_comments(silenced_src, 'F401') == src
+
+    def test_removes_code_from_file_level_comment(self) -> None:
+        src = '# ruff: noqa: E501, F401\nimport os  # noqa: F401\n'
+
+        assert Ruff().remove_silence_comments(src, 'F401') == (
+            '# ruff: noqa: E501\nimport os\n'
+        )
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import io
+import json
+
 from silence_lint_error.linters import semgrep
 from silence_lint_error.silencing import Violation
 
@@ -23,3 +26,46 @@ violation_here()
 # nosemgrep: another-error-code, some-error-code
 violation_here()
 """
+
+    def test_lines_past_end_of_file_are_skipped(self) -> None:
+        src = 'violation_here()\n'
+
+        modified_src = semgrep.Semgrep().silence_violations(
+            src, (Violation('some-error-code', 1), Violation('some-error-code', 3)),
+        )
+
+        assert modified_src == """\
+# nosemgrep: some-error-code
+violation_here()
+"""
+
+
+class TestReadReport:
+    def test_read_report(self) -> None:
+        report = io.StringIO(
+            json.dumps({
+                'errors': [],
+                'results': [
+                    {
+                        'check_id': 'python.lang.best-practice.sleep.arbitrary-sleep',
+                        'path': 't.py',
+                        'start': {'line': 3, 'col': 1},
+                    },
+                    {
+                        'check_id': 'python.lang.best-practice.open-never-closed',
+                        'path': 't.py',
+                        'start': {'line': 6, 'col': 1},
+                    },
+                ],
+            }),
+        )
+
+        violations = semgrep.Semgrep().read_report(
+            'python.lang.best-practice.sleep.arbitrary-sleep', report,
+        )
+
+        assert violations == {
+            't.py': [
+                Violation('python.lang.best-practice.sleep.arbitrary-sleep', 3),
+            ],
+        }
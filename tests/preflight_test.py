@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error import preflight
+
+
+class FakeLinter:
+    name = 'fake'
+
+    def __init__(self, rules: set[str], version: str = '1.0') -> None:
+        self.rules = rules
+        self._version = version
+        self.checked: list[str] = []
+
+    def version(self) -> str:
+        return self._version
+
+    def check_rule(self, rule_name: str) -> None:
+        self.checked.append(rule_name)
+        if rule_name not in self.rules:
+            raise preflight.UnknownRule(rule_name, 'no such rule')
+
+
+def test_check_caches_rules_per_version(tmp_path: Path) -> None:
+    cache_path = str(tmp_path / 'cache/preflight.json')
+    linter = FakeLinter({'R1'})
+
+    preflight.check(linter, 'R1', cache_path=cache_path)
+    preflight.check(linter, 'R1', cache_path=cache_path)
+
+    assert linter.checked == ['R1']
+
+    linter = FakeLinter({'R1'}, version='2.0')
+    preflight.check(linter, 'R1', cache_path=cache_path)
+
+    assert linter.checked == ['R1']
+
+
+def test_check_unknown_rule_is_not_cached(tmp_path: Path) -> None:
+    cache_path = str(tmp_path / 'preflight.json')
+    linter = FakeLinter(set())
+
+    for __ in range(2):
+        with pytest.raises(preflight.UnknownRule):
+            preflight.check(linter, 'R1', cache_path=cache_path)
+
+    assert linter.checked == ['R1', 'R1']
+
+
+def test_check_ignores_invalid_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path / 'preflight.json'
+    cache_path.write_text('not json')
+    linter = FakeLinter({'R1'})
+
+    preflight.check(linter, 'R1', cache_path=str(cache_path))
+
+    assert linter.checked == ['R1']
+
+
+def test_tool_version_not_installed() -> None:
+    with pytest.raises(preflight.LinterNotInstalled) as excinfo:
+        preflight.tool_version('silence-lint-error-not-a-linter')
+
+    assert excinfo.value.executable == 'silence-lint-error-not-a-linter'
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import io
+
+from silence_lint_error.progress import ProgressMeter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_plain() -> None:
+    stream = io.StringIO()
+    clock = FakeClock()
+    meter = ProgressMeter(
+        'adding comments', 4, stream=stream, interactive=False, clock=clock,
+    )
+
+    clock.now = 1
+    meter.advance(1024)  # not shown: too soon since the start
+    clock.now = 10
+    meter.advance(1024)
+    clock.now = 15
+    meter.advance(1024)  # not shown: too soon since the last update
+    meter.clear()  # only affects terminals
+    clock.now = 20
+    meter.advance(1024)
+    meter.finish()
+
+    assert stream.getvalue() == """\
+adding comments: 2/4 files (50%), 0 files/s, 204.8 B/s, ETA 0:10
+adding comments: 4/4 files (100%), 0 files/s, 204.8 B/s
+adding comments: 4/4 files in 0:20, 0 files/s, 204.8 B/s
+"""
+
+
+def test_interactive() -> None:
+    stream = io.StringIO()
+    clock = FakeClock()
+    meter = ProgressMeter(
+        'removing comments', 3000, stream=stream, interactive=True, clock=clock,
+    )
+
+    clock.now = 1
+    meter.advance(2 * 1024**2)
+    clock.now = 1.05
+    meter.advance(2 * 1024**2)  # not shown: too soon since the last update
+    meter.clear()
+    meter.advance(2 * 1024**2)  # shown again after being cleared
+    meter.finish()
+
+    assert stream.getvalue().split('\r') == [
+        '',
+        '\033[Kremoving comments: 1/3000 files (0%), 1 files/s, 2.0 MiB/s, '
+        'ETA 49:59',
+        '\033[K',
+        '\033[Kremoving comments: 3/3000 files (0%), 3 files/s, 5.7 MiB/s, '
+        'ETA 17:29',
+        '\033[Kremoving comments: 3/3000 files in 0:01, 3 files/s, 5.7 MiB/s\n',
+    ]
+
+
+def test_no_files() -> None:
+    stream = io.StringIO()
+    meter = ProgressMeter(
+        'adding comments', 0, stream=stream, interactive=False, clock=FakeClock(),
+    )
+
+    meter.finish()
+
+    assert stream.getvalue() == 'adding comments: 0/0 files in 0:00\n'
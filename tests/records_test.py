@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import io
+
+from silence_lint_error.records import RecordingFiles
+from silence_lint_error.records import RecordWriter
+from silence_lint_error.sources import MemoryFiles
+
+
+def test_recording_files() -> None:
+    files = RecordingFiles(
+        MemoryFiles({
+            'a.py': 'x = 1\n# fixme\ny = 2  # fixme\nz = 3\n',
+            'b.py': '# -*- coding: utf-8 -*-\nx = 1\n',
+        }),
+    )
+
+    src, encoding = files.read('a.py')
+    files.write('a.py', 'x = 1\ny = 2\nz = 3\n', encoding)
+
+    assert files.bytes_changed() == -17
+    assert files.changed_lines() == [2, 3]
+
+    files.read('b.py')  # not changed
+
+    assert files.bytes_changed() == 0
+    assert files.changed_lines() == []
+
+
+def test_recording_files_changed_lines_among_repeated_lines() -> None:
+    src = 'x = 1\n' * 500 + 'y = 2  # fixme\n' + 'x = 1\n' * 500 + 'z = 3  # fixme\n'
+    files = RecordingFiles(MemoryFiles({'a.py': src}))
+
+    __, encoding = files.read('a.py')
+    files.write('a.py', src.replace('  # fixme', ''), encoding)
+
+    assert files.changed_lines() == [501, 1002]
+
+
+def test_record_writer() -> None:
+    stream = io.StringIO()
+    records = RecordWriter(stream)
+
+    records.write({'path': 'a.py', 'lines': [1, 2]})
+    records.write({'path': 'b.py', 'lines': []})
+
+    assert stream.getvalue() == (
+        '{"path": "a.py", "lines": [1, 2]}\n'
+        '{"path": "b.py", "lines": []}\n'
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from importlib.metadata import EntryPoint
+from unittest import mock
+
+import pytest
+
+from silence_lint_error.registry import Registry
+
+
+class Adapter:
+    pass
+
+
+class OtherAdapter:
+    pass
+
+
+def _entry_points(group: str) -> list[EntryPoint]:
+    assert group == 'test.group'
+    return [
+        EntryPoint(name='plugin', value=f'{__name__}:OtherAdapter', group=group),
+        EntryPoint(name='builtin', value=f'{__name__}:OtherAdapter', group=group),
+    ]
+
+
+@pytest.fixture
+def registry() -> Registry[type[object]]:
+    return Registry({'builtin': f'{__name__}:Adapter'}, group='test.group')
+
+
+def test_builtins_do_not_read_entry_points(
+        registry: Registry[type[object]],
+) -> None:
+    with mock.patch('importlib.metadata.entry_points') as entry_points:
+        assert 'builtin' in registry
+        assert registry['builtin'] is Adapter
+
+    entry_points.assert_not_called()
+
+
+def test_plugins(registry: Registry[type[object]]) -> None:
+    with mock.patch('importlib.metadata.entry_points', _entry_points):
+        assert list(registry) == ['builtin', 'plugin']
+        assert len(registry) == 2
+        assert 'plugin' in registry
+        assert 'missing' not in registry
+        assert registry['plugin'] is OtherAdapter
+        # plugins cannot replace built-in adapters
+        assert registry['builtin'] is Adapter
+
+
+def test_missing(registry: Registry[type[object]]) -> None:
+    with mock.patch('importlib.metadata.entry_points', _entry_points):
+        with pytest.raises(KeyError):
+            registry['missing']
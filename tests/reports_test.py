@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import Any
+
+import pytest
+
+from silence_lint_error.reports import is_sarif
+from silence_lint_error.reports import iter_json
+from silence_lint_error.reports import read_sarif
+from silence_lint_error.silencing import Violation
+
+
+def _chunked(document: str, size: int) -> list[str]:
+    return [document[i:i+size] for i in range(0, len(document), size)]
+
+
+DOCUMENT = json.dumps(
+    {
+        'errors': [{'results': ['not these']}],
+        'results': [{'a': 1}, {'b': [2, 3]}, 12345, 'four'],
+        'paths': {'scanned': []},
+    },
+    indent=2,
+)
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 7, len(DOCUMENT)))
+def test_iter_json(chunk_size: int) -> None:
+    chunks = _chunked(DOCUMENT, chunk_size)
+
+    assert list(iter_json(chunks, ('results', '*'))) == [
+        {'a': 1}, {'b': [2, 3]}, 12345, 'four',
+    ]
+
+
+@pytest.mark.parametrize(
+    'document, path, expected', (
+        pytest.param('[]', ('*',), [], id='empty-array'),
+        pytest.param('{}', ('results', '*'), [], id='missing-key'),
+        pytest.param(' [ 1 , 2 ] ', ('*',), [1, 2], id='whitespace'),
+        pytest.param(
+            '{"runs": [{"results": [1]}, {"results": [2, 3]}]}',
+            ('runs', '*', 'results', '*'),
+            [1, 2, 3],
+            id='nested',
+        ),
+    ),
+)
+def test_iter_json_paths(
+        document: str, path: tuple[str, ...], expected: list[Any],
+) -> None:
+    assert list(iter_json([document], path)) == expected
+
+
+@pytest.mark.parametrize(
+    'document', (
+        pytest.param('', id='empty'),
+        pytest.param('{"results": [1, 2', id='truncated'),
+        pytest.param('{"results": {}}', id='wrong-type'),
+        pytest.param('[1] [2]', id='trailing-data'),
+    ),
+)
+def test_iter_json_invalid(document: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json([document], ('results', '*')))
+
+
+@pytest.mark.parametrize(
+    'path, expected', (
+        ('report.sarif', True),
+        ('report.sarif.json', True),
+        ('report.json', False),
+    ),
+)
+def test_is_sarif(path: str, expected: bool) -> None:
+    assert is_sarif(path) is expected
+
+
+def test_read_sarif() -> None:
+    def _result(rule_id: str, uri: str, line: int) -> dict[str, Any]:
+        return {
+            'ruleId': rule_id,
+            'locations': [
+                {
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': uri},
+                        'region': {'startLine': line, 'startColumn': 1},
+                    },
+                },
+            ],
+        }
+
+    report = io.StringIO(
+        json.dumps({
+            'version': '2.1.0',
+            'runs': [
+                {
+                    'tool': {'driver': {'name': 'ruff'}},
+                    'results': [
+                        _result('F401', 'file:///src/t.py', 1),
+                        _result('E501', 'file:///src/t.py', 2),
+                        _result('F401', 'src/my%20file.py', 3),
+                    ],
+                },
+            ],
+        }),
+    )
+
+    assert read_sarif(report, 'F4') == {
+        '/src/t.py': [Violation('F401', 1)],
+        'src/my file.py': [Violation('F401', 3)],
+    }
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error import files
+from silence_lint_error.linters.ruff import Ruff
+from silence_lint_error.silencing import Silencer
+from silence_lint_error.silencing import Violation
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.sources import Fingerprint
+
+
+class TestViolationSet:
+    def test_groups_violations_by_file(self) -> None:
+        violations = ViolationSet()
+        violations.add('a.py', 'ABC123', 3)
+        violations.add('b.py', 'ABC123', 1)
+        violations.add('a.py', 'DEF456', 3)
+        violations.add('a.py', 'ABC123', 7)
+
+        assert violations == {
+            'a.py': [
+                Violation('ABC123', 3),
+                Violation('DEF456', 3),
+                Violation('ABC123', 7),
+            ],
+            'b.py': [Violation('ABC123', 1)],
+        }
+        assert list(violations) == ['a.py', 'b.py']
+        assert len(violations) == 2
+        assert 'a.py' in violations
+        assert 'c.py' not in violations
+
+    def test_rule_names(self) -> None:
+        violations = ViolationSet()
+        violations.add('a.py', 'ABC123', 3)
+        violations.add('b.py', 'DEF456', 1)
+        violations.add('b.py', 'ABC123', 2)
+
+        assert violations.rule_names == {'ABC123', 'DEF456'}
+
+    def test_linenos_are_deduplicated(self) -> None:
+        violations = ViolationSet()
+        violations.add('a.py', 'ABC123', 3)
+        violations.add('a.py', 'DEF456', 3)
+        violations.add('a.py', 'ABC123', 1)
+
+        assert violations.linenos('a.py') == {1, 3}
+
+    def test_empty(self) -> None:
+        assert not ViolationSet()
+        assert ViolationSet() == {}
+
+
+class SlowLinter:
+    """A linter which times out when checking some files."""
+
+    name = 'slow'
+    config_files = (('slow.toml', None), ('setup.cfg', 'slow'))
+
+    def __init__(self, slow_files: set[str]) -> None:
+        self.slow_files = slow_files
+        self.calls: list[list[str]] = []
+        self.cwds: list[str | None] = []
+
+    def find_violations(
+        self, rule_name: str, filenames: Sequence[str],
+        *, timeout: float | None = None, cwd: str | None = None,
+    ) -> ViolationSet:
+        self.calls.append(list(filenames))
+        self.cwds.append(cwd)
+        if self.slow_files.intersection(filenames):
+            assert timeout is not None
+            raise subprocess.TimeoutExpired(['slow', *filenames], timeout)
+
+        violations = ViolationSet()
+        for filename in filenames:
+            violations.add(filename, rule_name, 1)
+        return violations
+
+    def read_report(self, rule_name: str, report: object) -> ViolationSet:
+        raise NotImplementedError
+
+    def silence_violations(
+        self, src: str, violations: Sequence[Violation],
+    ) -> str:
+        raise NotImplementedError
+
+
+class TestSilencer:
+    def test_find_violations_without_timeout(self) -> None:
+        linter = SlowLinter(set())
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=['a.py', 'b.py'],
+        )
+
+        assert sorted(findings.violations) == ['a.py', 'b.py']
+        assert findings.skipped == []
+        assert linter.calls == [['a.py', 'b.py']]
+
+    def test_find_violations_in_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(files, 'MAX_ARGS_LENGTH', 10)
+        linter = SlowLinter(set())
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=['a.py', 'b.py', 'c.py'],
+        )
+
+        assert sorted(findings.violations) == ['a.py', 'b.py', 'c.py']
+        assert linter.calls == [['a.py', 'b.py'], ['c.py']]
+
+    def test_find_violations_skips_slow_files(self) -> None:
+        file_names = [f'mod_{i}.py' for i in range(8)]
+        linter = SlowLinter({'mod_5.py'})
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=file_names, timeout=10,
+        )
+
+        assert sorted(findings.violations) == [
+            name for name in file_names if name != 'mod_5.py'
+        ]
+        assert findings.skipped == ['mod_5.py']
+        # the files are split in half until the slow file is isolated
+        assert linter.calls == [
+            file_names,
+            file_names[:4],
+            file_names[4:],
+            file_names[4:6],
+            ['mod_4.py'],
+            ['mod_5.py'],
+            file_names[6:],
+        ]
+
+    def test_find_violations_searches_slow_directories(
+            self, tmp_path: Path,
+    ) -> None:
+        for name in ('a.py', 'b.py', 'README.md'):
+            (tmp_path / name).touch()
+        slow_file = str(tmp_path / 'b.py')
+        linter = SlowLinter({str(tmp_path), slow_file})
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=[str(tmp_path)], timeout=10,
+        )
+
+        assert list(findings.violations) == [str(tmp_path / 'a.py')]
+        assert findings.skipped == [slow_file]
+
+    def test_find_violations_all_files_skipped(self) -> None:
+        linter = SlowLinter({'a.py'})
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=['a.py'], timeout=10,
+        )
+
+        assert not findings.violations
+        assert findings.skipped == ['a.py']
+
+    def test_find_violations_none_found(self) -> None:
+        linter = SlowLinter(set())
+
+        with pytest.raises(Silencer.NoViolationsFound):
+            Silencer(linter).find_violations(
+                rule_name='R1', file_names=[], timeout=10,
+            )
+
+    @pytest.mark.parametrize(
+        'file_names', (pytest.param(['.'], id='paths'), pytest.param([], id='no-paths')),
+    )
+    def test_find_violations_by_config_root(
+            self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+            file_names: list[str],
+    ) -> None:
+        for path in (
+                'pkg_a/slow.toml', 'pkg_a/src/a.py', 'pkg_a/tests/a_test.py',
+                'pkg_b/b.py',
+                # configures other linters, but not this one
+                'pkg_c/tox.ini', 'pkg_c/setup.cfg', 'pkg_c/c.py',
+                'script.py',
+        ):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        (tmp_path / 'pkg_b/setup.cfg').write_text('[slow]\nrules = R1\n')
+        (tmp_path / 'pkg_c/setup.cfg').write_text('[flake8]\nselect = F\n')
+        monkeypatch.chdir(tmp_path)
+        linter = SlowLinter(set())
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=file_names, by_config_root=True,
+        )
+
+        assert sorted(findings.violations) == [
+            str(tmp_path / 'pkg_a/src/a.py'),
+            str(tmp_path / 'pkg_a/tests/a_test.py'),
+            str(tmp_path / 'pkg_b/b.py'),
+            str(tmp_path / 'pkg_c/c.py'),
+            str(tmp_path / 'script.py'),
+        ]
+        assert findings.skipped == []
+        assert sorted(zip(linter.cwds, linter.calls)) == [
+            (
+                str(tmp_path),
+                [str(tmp_path / 'script.py'), str(tmp_path / 'pkg_c/c.py')],
+            ),
+            (
+                str(tmp_path / 'pkg_a'),
+                [
+                    str(tmp_path / 'pkg_a/src/a.py'),
+                    str(tmp_path / 'pkg_a/tests/a_test.py'),
+                ],
+            ),
+            (
+                str(tmp_path / 'pkg_b'),
+                [str(tmp_path / 'pkg_b/b.py')],
+            ),
+        ]
+
+    def test_find_violations_fingerprints_files(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        linter = SlowLinter(set())
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=[str(python_module), 'missing.py'],
+        )
+
+        assert findings.fingerprints == {
+            str(python_module): Fingerprint.of(b'import os\n'),
+        }
+
+    def test_find_violations_fingerprints_files_before_running_linter(
+            self, tmp_path: Path,
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+
+        class EditingLinter(SlowLinter):
+            """A linter during whose run the files are changed."""
+
+            def find_violations(
+                self, rule_name: str, filenames: Sequence[str],
+                *, timeout: float | None = None, cwd: str | None = None,
+            ) -> ViolationSet:
+                violations = super().find_violations(rule_name, filenames)
+                python_module.write_text('import sys\nimport os\n')
+                return violations
+
+        silencer = Silencer(EditingLinter(set()))
+
+        findings = silencer.find_violations(
+            rule_name='R1', file_names=[str(python_module)],
+        )
+
+        assert findings.fingerprints == {str(python_module): Fingerprint.stale()}
+        with pytest.raises(Silencer.FileChanged):
+            silencer.silence_violations(
+                filename=str(python_module),
+                violations=findings.violations[str(python_module)],
+                fingerprint=findings.fingerprints[str(python_module)],
+            )
+        assert python_module.read_text() == 'import sys\nimport os\n'
+
+    def test_find_violations_without_fingerprints(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        linter = SlowLinter(set())
+
+        findings = Silencer(linter).find_violations(
+            rule_name='R1', file_names=[str(python_module)], fingerprint=False,
+        )
+
+        assert list(findings.violations) == [str(python_module)]
+        assert findings.fingerprints == {}
+
+    def test_silence_violations_if_file_unchanged(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+
+        changed = Silencer(Ruff()).silence_violations(
+            filename=str(python_module), violations=[Violation('F401', 1)],
+            fingerprint=Fingerprint.of(b'import os\n'),
+        )
+
+        assert changed
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+    def test_silence_violations_above_file_level_threshold(
+            self, tmp_path: Path,
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\nimport sys\n')
+        silencer = Silencer(Ruff(), file_level_threshold=1)
+
+        changed = silencer.silence_violations(
+            filename=str(python_module),
+            violations=[Violation('F401', 1), Violation('F401', 2)],
+        )
+
+        assert changed
+        assert python_module.read_text() == '# ruff: noqa: F401\nimport os\nimport sys\n'
+
+    def test_silence_violations_at_file_level_threshold(
+            self, tmp_path: Path,
+    ) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import os\n')
+        silencer = Silencer(Ruff(), file_level_threshold=1)
+
+        changed = silencer.silence_violations(
+            filename=str(python_module), violations=[Violation('F401', 1)],
+        )
+
+        assert changed
+        assert python_module.read_text() == 'import os  # noqa: F401\n'
+
+    def test_silence_violations_if_file_changed(self, tmp_path: Path) -> None:
+        python_module = tmp_path / 't.py'
+        python_module.write_text('import sys\nimport os\n')
+
+        with pytest.raises(Silencer.FileChanged):
+            Silencer(Ruff()).silence_violations(
+                filename=str(python_module), violations=[Violation('F401', 1)],
+                fingerprint=Fingerprint.of(b'import os\n'),
+            )
+
+        assert python_module.read_text() == 'import sys\nimport os\n'
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from silence_lint_error.sources import decode_source
+from silence_lint_error.sources import FileStat
+from silence_lint_error.sources import Fingerprint
+from silence_lint_error.sources import fingerprint_files
+from silence_lint_error.sources import line_ending
+from silence_lint_error.sources import MemoryFiles
+from silence_lint_error.sources import PipelinedFiles
+from silence_lint_error.sources import read_source
+from silence_lint_error.sources import stat_files
+from silence_lint_error.sources import write_source
+
+
+@pytest.mark.parametrize(
+    'data, expected', (
+        pytest.param(b'x = 1\n', ('x = 1\n', 'utf-8'), id='default'),
+        pytest.param(
+            b'\xef\xbb\xbfx = 1\n', ('x = 1\n', 'utf-8-sig'),
+            id='bom',
+        ),
+        pytest.param(
+            b'# -*- coding: latin-1 -*-\nx = "\xe9"\n',
+            ('# -*- coding: latin-1 -*-\nx = "\xe9"\n', 'iso-8859-1'),
+            id='cookie',
+        ),
+        pytest.param(
+            b'x = 1\r\ny = 2\r\n', ('x = 1\r\ny = 2\r\n', 'utf-8'),
+            id='crlf',
+        ),
+    ),
+)
+def test_decode_source(data: bytes, expected: tuple[str, str]) -> None:
+    assert decode_source(data) == expected
+
+
+@pytest.mark.parametrize(
+    'data', (
+        pytest.param(b'\xef\xbb\xbfx = 1\n', id='bom'),
+        pytest.param(b'# coding: latin-1\nx = "\xe9"\n', id='cookie'),
+        pytest.param(b'x = 1\r\ny = 2\r\n', id='crlf'),
+        pytest.param(b'x = 1\ry = 2', id='cr-no-trailing-newline'),
+    ),
+)
+def test_round_trip(tmp_path: Path, data: bytes) -> None:
+    python_module = tmp_path / 't.py'
+    python_module.write_bytes(data)
+
+    src, encoding = read_source(str(python_module))
+    write_source(str(python_module), src, encoding)
+
+    assert python_module.read_bytes() == data
+
+
+@pytest.mark.parametrize(
+    'line, expected', (
+        ('x = 1\n', '\n'),
+        ('x = 1\r\n', '\r\n'),
+        ('x = 1\r', '\r'),
+        ('x = 1', '\n'),
+    ),
+)
+def test_line_ending(line: str, expected: str) -> None:
+    assert line_ending(line) == expected
+
+
+class TestPipelinedFiles:
+    def test_read_and_write(self, tmp_path: Path) -> None:
+        modules = [tmp_path / f'mod_{i}.py' for i in range(10)]
+        for i, module in enumerate(modules):
+            module.write_bytes(f'x = {i}\r\n'.encode())
+        filenames = [str(module) for module in modules]
+
+        with PipelinedFiles(filenames, workers=2, window=3) as files:
+            for i, filename in enumerate(filenames):
+                src, encoding = files.read(filename)
+                assert (src, encoding) == (f'x = {i}\r\n', 'utf-8')
+                files.write(filename, src.replace('x', 'y'), encoding)
+
+        assert files.bytes_read == 70
+        assert [module.read_bytes() for module in modules] == [
+            f'y = {i}\r\n'.encode() for i in range(10)
+        ]
+
+    def test_repeated_file_is_read_after_it_is_written(self, tmp_path: Path) -> None:
+        module = tmp_path / 't.py'
+        module.write_text('x = 1\n')
+        filenames = [str(module), str(tmp_path / 'other.py'), str(module)]
+        (tmp_path / 'other.py').write_text('')
+
+        with PipelinedFiles(filenames) as files:
+            src, encoding = files.read(str(module))
+            files.write(str(module), 'x = 2\n', encoding)
+            files.read(str(tmp_path / 'other.py'))
+
+            assert files.read(str(module)) == ('x = 2\n', 'utf-8')
+
+    def test_write_without_write_behind(self, tmp_path: Path) -> None:
+        module = tmp_path / 't.py'
+        module.write_text('x = 1\n')
+
+        with PipelinedFiles([str(module)], write_behind=False) as files:
+            src, encoding = files.read(str(module))
+            files.write(str(module), 'x = 2\n', encoding)
+
+            assert module.read_text() == 'x = 2\n'
+
+    def test_read_error(self, tmp_path: Path) -> None:
+        missing = str(tmp_path / 'missing.py')
+
+        with PipelinedFiles([missing]) as files:
+            with pytest.raises(FileNotFoundError):
+                files.read(missing)
+
+    def test_write_error(self, tmp_path: Path) -> None:
+        missing = str(tmp_path / 'missing' / 't.py')
+
+        with pytest.raises(FileNotFoundError):
+            with PipelinedFiles([]) as files:
+                files.write(missing, 'x = 1\n', 'utf-8')
+
+
+def test_memory_files() -> None:
+    contents = {'a.py': 'x = 1\n'}
+    files = MemoryFiles(contents)
+
+    files.write('a.py', 'x = 2\n', 'utf-8')
+
+    assert files.read('a.py') == ('x = 2\n', 'utf-8')
+    assert files.changed == {'a.py': 'x = 2\n'}
+    assert contents == {'a.py': 'x = 1\n'}
+    with pytest.raises(FileNotFoundError):
+        files.read('b.py')
+
+
+def test_fingerprint_files(tmp_path: Path) -> None:
+    unchanged = tmp_path / 'a.py'
+    unchanged.write_bytes(b'x = 1\n')
+    changed = tmp_path / 'b.py'
+    changed.write_bytes(b'x = 1\n')
+    missing = str(tmp_path / 'c.py')
+    stats = stat_files([str(unchanged), str(changed), missing])
+    assert stats == {
+        str(unchanged): FileStat(6, os.stat(unchanged).st_mtime_ns),
+        str(changed): FileStat(6, os.stat(changed).st_mtime_ns),
+    }
+    changed.write_bytes(b'x = 12\n')
+
+    fingerprints = fingerprint_files(
+        [str(unchanged), str(changed), missing], stats=stats,
+    )
+
+    assert fingerprints == {
+        str(unchanged): Fingerprint.of(b'x = 1\n'),
+        str(changed): Fingerprint.stale(),
+    }
+    assert Fingerprint.stale() != Fingerprint.of(b'')
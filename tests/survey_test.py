@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+
+from silence_lint_error.silencing import ViolationSet
+from silence_lint_error.survey import format_table
+from silence_lint_error.survey import StreamedProcess
+from silence_lint_error.survey import summarise
+
+
+def test_streamed_process() -> None:
+    run = StreamedProcess((
+        sys.executable, '-c',
+        'import sys; print("a"); print("b"); print("oops", file=sys.stderr); '
+        'raise SystemExit(3)',
+    ))
+
+    with run as output:
+        lines = list(output)
+
+    assert lines == ['a\n', 'b\n']
+    assert run.proc.returncode == 3
+    assert run.proc.stderr == 'oops\n'
+
+
+def test_streamed_process_not_fully_read() -> None:
+    run = StreamedProcess((sys.executable, '-c', 'print("a\\n" * 100_000)'))
+
+    with run as output:
+        first_line = output.readline()
+
+    assert first_line == 'a\n'
+    assert run.proc.returncode == 0
+
+
+def test_summarise() -> None:
+    violations = ViolationSet()
+    violations.add('src/a.py', 'F401', 1)
+    violations.add('src/a.py', 'F401', 2)
+    violations.add('src/a.py', 'E501', 3)
+    violations.add('src/pkg/b.py', 'F401', 1)
+    violations.add('tests/a_test.py', 'E501', 1)
+    violations.add('setup.py', 'E501', 1)
+
+    assert summarise(violations) == {
+        'rules': {
+            'F401': {'violations': 3, 'files': 2},
+            'E501': {'violations': 3, 'files': 3},
+        },
+        'directories': {
+            'src': {'violations': 4, 'files': 2},
+            'tests': {'violations': 1, 'files': 1},
+            '.': {'violations': 1, 'files': 1},
+        },
+    }
+
+
+def test_format_table() -> None:
+    counts = {
+        'F401': {'violations': 3, 'files': 2},
+        'E501': {'violations': 3, 'files': 3},
+        'reportAttributeAccessIssue': {'violations': 10, 'files': 1},
+    }
+
+    assert format_table('rule', counts) == """\
+rule                        violations   files
+reportAttributeAccessIssue          10       1
+E501                                 3       3
+F401                                 3       2"""